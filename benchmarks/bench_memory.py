@@ -0,0 +1,153 @@
+"""Benchmark the memory used by the element tree of a huge generated module.
+
+Generates a single module with many classes (10k by default, like generated
+protobuf/gRPC modules), then builds its element tree under tracemalloc and reports
+the peak memory allocated while building it, and the memory retained by the tree
+once built, as JSON. With `--stream`, the module is instead rendered class by class
+with `ModuleElement.stream_to`, whose peak memory should grow with the largest class
+rather than with the whole module.
+
+To compare two versions of npdoc2md, write the report of the first one to a file,
+then pass it to `--compare` when running the second one (ex: with `PYTHONPATH`
+pointing at another checkout):
+
+    python benchmarks/bench_memory.py --output before.json
+    python benchmarks/bench_memory.py --compare before.json
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from synthetic import generate_module_source
+
+from npdoc2md._version import __version__
+from npdoc2md.ast_engine import module_element_from_source
+from npdoc2md.npdoc2md import ModuleElement
+
+
+def measure_element_tree(
+    src_file: Path, module_name: str, engine: str, stream: bool = False
+) -> dict[str, int | float]:
+    """Build the element tree of a module, or stream its markdown, under tracemalloc.
+
+    Parameters
+    ----------
+    src_file : Path
+        Path to the module source file.
+    module_name : str
+        Name of the module, importable from sys.path.
+    engine : str
+        Engine used to extract docstrings, 'import' or 'ast'.
+    stream : bool, default=False
+        Whether to stream the markdown of the module class by class to a null
+        device, instead of building its whole element tree. Import engine only.
+
+    Returns
+    -------
+    dict[str, int | float]
+        Peak and retained memory in bytes, and the time taken.
+    """
+
+    # Importing is not part of the measurement, only building the element tree.
+    module = importlib.import_module(module_name) if engine == "import" else None
+    gc.collect()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        tracemalloc.start()
+        start = time.perf_counter()
+        element = None
+        if stream:
+            ModuleElement.stream_to(module, devnull)
+        elif module is not None:
+            element = ModuleElement(module)
+        else:
+            element = module_element_from_source(src_file, module_name, "")
+        seconds = time.perf_counter() - start
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    # Only dropped now, so that the element tree counts as retained memory.
+    del element
+    return {"peak_bytes": peak, "retained_bytes": retained, "seconds": seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, default=10000, help="Number of classes")
+    parser.add_argument("--methods", type=int, default=2, help="Methods per class")
+    parser.add_argument(
+        "--engine", choices=["import", "ast"], default="import", help="Engine to use"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the markdown class by class instead of building the tree",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        metavar="REPORT",
+        help="Report of a previous run to compare against",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write the JSON report to this file"
+    )
+    args = parser.parse_args()
+    if args.stream and args.engine != "import":
+        parser.error("--stream is only supported with the import engine")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Unique module name so that repeated runs never hit sys.modules.
+        module_name = f"npdoc2md_bench_memory_{time.monotonic_ns()}"
+        src_file = Path(tmp_dir) / f"{module_name}.py"
+        src_file.write_text(generate_module_source(0, args.classes, args.methods, 0))
+        sys.path.insert(0, tmp_dir)
+        results = measure_element_tree(src_file, module_name, args.engine, args.stream)
+
+    # Each class has an __init__ method in addition to the other methods.
+    members = args.classes * (args.methods + 2)
+
+    report = {
+        "npdoc2md_version": __version__,
+        "python_version": platform.python_version(),
+        "config": {
+            "classes": args.classes,
+            "methods_per_class": args.methods,
+            "engine": args.engine,
+            "stream": args.stream,
+        },
+        "members": members,
+        **results,
+        "retained_bytes_per_member": results["retained_bytes"] / members,
+    }
+    if args.compare is not None:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        report["compared_to"] = {
+            "npdoc2md_version": baseline["npdoc2md_version"],
+            "peak_bytes": baseline["peak_bytes"],
+            "retained_bytes": baseline["retained_bytes"],
+            # Below 1.0 when this run uses less memory than the baseline.
+            "peak_ratio": results["peak_bytes"] / baseline["peak_bytes"],
+            "retained_ratio": results["retained_bytes"] / baseline["retained_bytes"],
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Benchmark the phases of npdoc2md on a synthetic package.
+
+Generates a package of configurable size, then times each phase of the conversion
+separately (discovery, import, parse, render, write) and reports the results along
+with files/sec and peak RSS as JSON, so that runs can be compared by scripts.
+
+Usage:
+
+    python benchmarks/bench_npdoc2md.py --modules 200 --classes 5 --methods 10
+"""
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from synthetic import generate_package
+
+from npdoc2md._version import __version__
+from npdoc2md.ast_engine import module_element_from_source
+from npdoc2md.npdoc2md import (
+    ModuleElement,
+    get_module_and_package_names,
+    get_target_python_files,
+)
+from npdoc2md.utils import get_target_output_file_path
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def get_peak_rss_bytes() -> int | None:
+    """Get the peak resident set size of the current process.
+
+    Returns
+    -------
+    int | None
+        Peak RSS in bytes, or None if it cannot be determined on this platform.
+    """
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS, and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_benchmark(
+    package_dir: Path, output_dir: Path, engine: str
+) -> dict[str, float | int]:
+    """Run the conversion phase by phase, timing each of them.
+
+    Parameters
+    ----------
+    package_dir : Path
+        Path to the package to document.
+    output_dir : Path
+        Directory to write the markdown files to.
+    engine : str
+        Engine used to extract docstrings, 'import' or 'ast'.
+
+    Returns
+    -------
+    dict[str, float | int]
+        Wall time of each phase in seconds, and the number of files converted.
+    """
+
+    timings = dict.fromkeys(["discovery", "import", "parse", "render", "write"], 0.0)
+
+    start = time.perf_counter()
+    src_files = get_target_python_files(package_dir, False, ["__init__"])
+    timings["discovery"] = time.perf_counter() - start
+
+    for src_file in src_files:
+        module_name, package = get_module_and_package_names(src_file, package_dir)
+
+        if engine == "ast":
+            start = time.perf_counter()
+            element = module_element_from_source(
+                src_file, f"{package}.{module_name}", package
+            )
+            timings["parse"] += time.perf_counter() - start
+        else:
+            start = time.perf_counter()
+            module = importlib.import_module(f".{module_name}", package=package)
+            timings["import"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            element = ModuleElement(module)
+            timings["parse"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        stream = StringIO()
+        element.render_to(stream)
+        timings["render"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        output_file = get_target_output_file_path(src_file, package_dir, output_dir)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        output_file.write_text(stream.getvalue(), encoding="utf-8")
+        timings["write"] += time.perf_counter() - start
+
+    return {**timings, "files": len(src_files)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=100, help="Number of modules")
+    parser.add_argument("--classes", type=int, default=5, help="Classes per module")
+    parser.add_argument("--methods", type=int, default=10, help="Methods per class")
+    parser.add_argument("--functions", type=int, default=5, help="Functions per module")
+    parser.add_argument(
+        "--engine", choices=["import", "ast"], default="import", help="Engine to use"
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write the JSON report to this file"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Unique package name so that repeated runs never hit sys.modules.
+        package_name = f"npdoc2md_bench_{time.monotonic_ns()}"
+        package_dir = generate_package(
+            Path(tmp_dir) / "src",
+            package_name,
+            num_modules=args.modules,
+            classes_per_module=args.classes,
+            methods_per_class=args.methods,
+            functions_per_module=args.functions,
+        )
+        sys.path.insert(0, str(package_dir.parent))
+        importlib.import_module(package_name)
+
+        phases = run_benchmark(package_dir, Path(tmp_dir) / "docs", args.engine)
+        files = phases.pop("files")
+
+    total = sum(phases.values())
+    report = {
+        "npdoc2md_version": __version__,
+        "python_version": platform.python_version(),
+        "config": {
+            "modules": args.modules,
+            "classes_per_module": args.classes,
+            "methods_per_class": args.methods,
+            "functions_per_module": args.functions,
+            "engine": args.engine,
+        },
+        "files": files,
+        "phases": phases,
+        "total_seconds": total,
+        "files_per_second": files / total if total > 0 else None,
+        "peak_rss_bytes": get_peak_rss_bytes(),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark showing that markdown rendering time grows linearly with member count.
+
+Builds synthetic module element trees of increasing size and times rendering them
+with `render_to`. If rendering is linear, the time per member stays roughly
+constant as the number of members grows.
+
+Usage:
+
+    python benchmarks/bench_render.py --sizes 250 500 1000 2000 4000
+"""
+
+import argparse
+import json
+import time
+from io import StringIO
+
+from docstring_parser import Style, parse
+
+from npdoc2md.npdoc2md import ClassElement, FunctionElement, ModuleElement
+
+METHOD_DOCSTRING = """Do something useful with the inputs.
+
+Parameters
+----------
+x : int
+    The first input.
+y : str, optional
+    The second input, by default "y".
+
+Returns
+-------
+bool
+    Whether something useful was done.
+
+Raises
+------
+ValueError
+    If x is negative.
+"""
+
+
+def build_module(num_classes: int, methods_per_class: int) -> ModuleElement:
+    """Build a synthetic module element tree.
+
+    Parameters
+    ----------
+    num_classes : int
+        Number of classes in the module.
+    methods_per_class : int
+        Number of methods in each class.
+
+    Returns
+    -------
+    ModuleElement
+        The synthetic module element.
+    """
+
+    method_docstring = parse(METHOD_DOCSTRING, style=Style.NUMPYDOC)
+    classes = [
+        ClassElement.from_parts(
+            name=f"Class{i}",
+            signature=f"class Class{i}(object)",
+            docstring=parse(f"Synthetic class {i}.", style=Style.NUMPYDOC),
+            methods=[
+                FunctionElement(
+                    name=f"method{j}",
+                    signature=f"def method{j}(self, x: int, y: str = 'y') -> bool",
+                    docstring=method_docstring,
+                    level=3,
+                )
+                for j in range(methods_per_class)
+            ],
+        )
+        for i in range(num_classes)
+    ]
+    return ModuleElement.from_parts(
+        name="synthetic",
+        docstring=parse("Synthetic module.", style=Style.NUMPYDOC),
+        classes=classes,
+        functions=[],
+    )
+
+
+def time_render(element: ModuleElement, repeat: int) -> float:
+    """Time rendering an element tree to an in-memory stream, best of N runs.
+
+    Parameters
+    ----------
+    element : ModuleElement
+        The element tree to render.
+    repeat : int
+        Number of runs.
+
+    Returns
+    -------
+    float
+        Best wall time of the runs, in seconds.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        stream = StringIO()
+        start = time.perf_counter()
+        element.render_to(stream)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[250, 500, 1000, 2000, 4000],
+        help="Total number of methods to render at each step",
+    )
+    parser.add_argument(
+        "--methods-per-class", type=int, default=10, help="Methods in each class"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        element = build_module(size // args.methods_per_class, args.methods_per_class)
+        seconds = time_render(element, args.repeat)
+        results.append(
+            {"members": size, "seconds": seconds, "us_per_member": seconds / size * 1e6}
+        )
+
+    per_member = [result["us_per_member"] for result in results]
+    print(
+        json.dumps(
+            {
+                "results": results,
+                # Close to 1.0 when rendering time is linear in the member count.
+                "per_member_ratio": max(per_member) / min(per_member),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark the startup time of the npdoc2md command line interface.
+
+Runs `npdoc2md --version` (or any other arguments) under `python -X importtime`,
+and reports the import time of npdoc2md.__main__, the slowest modules it imports,
+and the wall time of the whole command, as JSON. Conversion modules should only be
+imported once a conversion runs, so `--version` and `--help` stay fast.
+
+Usage:
+
+    python benchmarks/bench_startup.py --repeat 10 --budget-ms 100 -- --help
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Runs the command line interface, as the npdoc2md script does.
+RUN_CLI = (
+    "import sys; from npdoc2md.__main__ import main; sys.argv[0] = 'npdoc2md'; main()"
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Parse the output of `python -X importtime`.
+
+    Parameters
+    ----------
+    stderr : str
+        The standard error of the process.
+
+    Returns
+    -------
+    dict[str, tuple[int, int]]
+        Self and cumulative import time of each imported module, in microseconds.
+    """
+
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_startup(cli_args: list[str]) -> tuple[dict[str, tuple[int, int]], float]:
+    """Run the command line interface once under `python -X importtime`.
+
+    Parameters
+    ----------
+    cli_args : list[str]
+        Arguments passed to npdoc2md, ex: ["--version"].
+
+    Returns
+    -------
+    tuple[dict[str, tuple[int, int]], float]
+        Import times of the imported modules, and wall time of the run in seconds.
+    """
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_CLI, *cli_args],
+        capture_output=True,
+        text=True,
+    )
+    return parse_importtime(result.stderr), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="Number of runs")
+    parser.add_argument(
+        "--top", type=int, default=10, help="Number of slowest modules reported"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Exit with an error if the median import time of npdoc2md.__main__ "
+        "exceeds this many milliseconds",
+    )
+    parser.add_argument(
+        "cli_args",
+        nargs="*",
+        default=["--version"],
+        help="Arguments passed to npdoc2md",
+    )
+    args = parser.parse_args()
+
+    runs = [run_startup(args.cli_args) for _ in range(args.repeat)]
+    import_ms = statistics.median(
+        modules["npdoc2md.__main__"][1] / 1000 for modules, _ in runs
+    )
+    modules = runs[-1][0]
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+    report = {
+        "python": sys.version.split()[0],
+        "cli_args": args.cli_args,
+        "import_ms": import_ms,
+        "wall_ms": statistics.median(seconds * 1000 for _, seconds in runs),
+        "modules_imported": len(modules),
+        "npdoc2md_modules": sorted(
+            name for name in modules if name.startswith("npdoc2md")
+        ),
+        "slowest_modules_ms": {
+            name: us / 1000 for name, (us, _) in slowest[: args.top]
+        },
+        "budget_ms": args.budget_ms,
+    }
+    print(json.dumps(report, indent=2))
+    if args.budget_ms is not None and import_ms > args.budget_ms:
+        sys.exit(f"Startup import time {import_ms:.1f}ms exceeds {args.budget_ms}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Generator for synthetic python packages with numpy-style docstrings.
+
+Used by the benchmarks to create packages of a configurable size, with N modules,
+M classes per module and K methods per class.
+"""
+
+from pathlib import Path
+
+MODULE_TEMPLATE = '''"""Synthetic module {module_index}.
+
+This module was generated for benchmarking npdoc2md.
+"""
+
+from pathlib import Path
+
+{members}
+'''
+
+CLASS_TEMPLATE = '''
+class Class{class_index}(object):
+    """Synthetic class {class_index} of module {module_index}.
+
+    Attributes
+    ----------
+    name : str
+        Name of the instance.
+    size : int
+        Size of the instance.
+    """
+
+    def __init__(self, name: str, size: int = 0):
+        """Initialize the instance.
+
+        Parameters
+        ----------
+        name : str
+            Name of the instance.
+        size : int, optional
+            Size of the instance, by default 0.
+        """
+
+        self.name = name
+        self.size = size
+{methods}
+'''
+
+METHOD_TEMPLATE = '''
+    def method{method_index}(
+        self, path: Path, count: int = 1, *args: str, strict: bool = False
+    ) -> dict[str, int]:
+        """Process the given path a number of times.
+
+        Longer description of method {method_index}, spanning
+        more than a single line of text.
+
+        Parameters
+        ----------
+        path : Path
+            The path to process.
+        count : int, optional
+            Number of times to process the path, by default 1.
+        *args : str
+            Extra arguments.
+        strict : bool, optional
+            Whether to fail on the first error, by default False.
+
+        Returns
+        -------
+        dict[str, int]
+            Mapping of processed names to their counts.
+
+        Raises
+        ------
+        ValueError
+            If count is negative.
+        FileNotFoundError
+            If the path does not exist.
+        """
+
+        return {{}}
+'''
+
+FUNCTION_TEMPLATE = '''
+def function{function_index}(value: int, scale: float = 1.0) -> float:
+    """Scale a value.
+
+    Parameters
+    ----------
+    value : int
+        The value to scale.
+    scale : float, optional
+        The scale factor, by default 1.0.
+
+    Returns
+    -------
+    float
+        The scaled value.
+    """
+
+    return value * scale
+'''
+
+
+def generate_module_source(
+    module_index: int,
+    classes_per_module: int,
+    methods_per_class: int,
+    functions_per_module: int,
+) -> str:
+    """Generate the source of a single synthetic module.
+
+    Parameters
+    ----------
+    module_index : int
+        Index of the module, used in names and docstrings.
+    classes_per_module : int
+        Number of classes in the module.
+    methods_per_class : int
+        Number of methods in each class, in addition to __init__.
+    functions_per_module : int
+        Number of module level functions.
+
+    Returns
+    -------
+    str
+        The python source of the module.
+    """
+
+    members = [
+        CLASS_TEMPLATE.format(
+            class_index=class_index,
+            module_index=module_index,
+            methods="".join(
+                METHOD_TEMPLATE.format(method_index=method_index)
+                for method_index in range(methods_per_class)
+            ),
+        )
+        for class_index in range(classes_per_module)
+    ]
+    members.extend(
+        FUNCTION_TEMPLATE.format(function_index=function_index)
+        for function_index in range(functions_per_module)
+    )
+    return MODULE_TEMPLATE.format(module_index=module_index, members="".join(members))
+
+
+def generate_package(
+    root: Path,
+    package_name: str,
+    num_modules: int,
+    classes_per_module: int,
+    methods_per_class: int,
+    functions_per_module: int = 0,
+) -> Path:
+    """Write a synthetic package to disk.
+
+    Parameters
+    ----------
+    root : Path
+        Directory in which the package directory is created.
+    package_name : str
+        Name of the package (and of its directory).
+    num_modules : int
+        Number of modules in the package.
+    classes_per_module : int
+        Number of classes in each module.
+    methods_per_class : int
+        Number of methods in each class, in addition to __init__.
+    functions_per_module : int, default=0
+        Number of module level functions in each module.
+
+    Returns
+    -------
+    Path
+        Path to the generated package directory.
+    """
+
+    package_dir = root / package_name
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text('"""Synthetic package."""\n')
+    for module_index in range(num_modules):
+        (package_dir / f"module{module_index}.py").write_text(
+            generate_module_source(
+                module_index,
+                classes_per_module,
+                methods_per_class,
+                functions_per_module,
+            )
+        )
+    return package_dir
@@ -5,6 +5,6 @@ __author__ = "Jakub Wlodek"
 __url__ = "https://github.com/jwlodek/npdoc2md"
 
 from ._version import __version__
-from .npdoc2md import npdoc2md
+from .npdoc2md import iter_npdoc2md, npdoc2md
 
-__all__ = ["__version__", "npdoc2md"]
+__all__ = ["__version__", "iter_npdoc2md", "npdoc2md"]
@@ -1,20 +1,24 @@
 import argparse
 import logging
+import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from ._log import logger
+from ._log import LOG_FORMATS, logger, start_logging, stop_logging
 from ._version import __version__
-from .npdoc2md import npdoc2md
-from .utils import create_output_directory, validate_paths
+from .constants import ARCHIVE_FORMATS, ENGINES
+from .discovery import DEFAULT_EXCLUDES
 
+if TYPE_CHECKING:
+    from .writer import OutputWriter
 
-def main() -> None:
-    """Main entry point for the npdoc2md CLI utility."""
+# The conversion machinery (docstring_parser, inspect, ...) is imported once the
+# arguments are parsed, so that `npdoc2md --version` and `--help` start quickly.
+
+
+def _add_verbosity_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments controlling the log level and format to a parser."""
 
-    parser = argparse.ArgumentParser(
-        description="Utility for autogenerating markdown from numpy-style docstrings."
-    )
-    parser.add_argument("--version", action="version", version=__version__)
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
@@ -24,6 +28,18 @@ def main() -> None:
         action="store_true",
         help="Enable quiet mode (only errors will be logged)",
     )
+    parser.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default="text",
+        help="Format of the log messages written to stderr: text, or json for one "
+        "JSON object per line, for log shippers.",
+    )
+
+
+def _add_conversion_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments controlling how members are converted to a parser."""
+
     parser.add_argument(
         "--include-private",
         action="store_true",
@@ -37,27 +53,208 @@ def main() -> None:
         help="List of private member names to include even without --include-private.",
     )
     parser.add_argument(
-        "input_path",
+        "--engine",
+        choices=ENGINES,
+        default="import",
+        help="Engine used to extract docstrings: 'import' imports each module, "
+        "'ast' parses the source files without importing them.",
+    )
+    parser.add_argument(
+        "--mock-imports",
         type=str,
-        help="Path to the input file or directory containing files to parse",
+        nargs="+",
+        action="extend",
+        default=[],
+        metavar="PATTERN",
+        help="Import stub modules instead of the modules (and their submodules) "
+        "matching these glob patterns, ex: torch 'google.cloud.*'.",
+    )
+
+
+def _add_discovery_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments selecting which source files are documented to a parser."""
+
+    parser.add_argument(
+        "--exclude",
+        type=str,
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Skip files and directories matching this glob pattern, in addition to "
+        f"the defaults ({', '.join(DEFAULT_EXCLUDES)}). Can be given multiple times.",
+    )
+    parser.add_argument(
+        "--include",
+        type=str,
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="Only document files matching this glob pattern. Can be given multiple "
+        "times.",
+    )
+    parser.add_argument(
+        "--gitignore",
+        action="store_true",
+        help="Skip files and directories ignored by .gitignore files.",
+    )
+
+
+def _add_format_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the argument selecting the output formats to a parser."""
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        action="append",
+        default=None,
+        metavar="FORMATS",
+        help="Comma separated output formats among md, json and html. Can be given "
+        "multiple times. Defaults to md.",
+    )
+
+
+def _add_replace_type_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the argument replacing type names in signatures to a parser."""
+
+    parser.add_argument(
+        "--replace-type",
+        type=str,
+        action="append",
+        default=[],
+        metavar="INVALID=CORRECT",
+        help="Replace a fully qualified type name in rendered signatures, "
+        "ex: _mypkg_ext.Handle=mypkg.Handle. Can be given multiple times.",
+    )
+
+
+def _register_type_replacements(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> None:
+    """Register the type replacements given with --replace-type."""
+
+    type_replacements: dict[tuple[str, str], str] = {}
+    for replacement in args.replace_type:
+        invalid_type, _, correct_type = replacement.partition("=")
+        module_name, _, type_name = invalid_type.rpartition(".")
+        if not module_name or not type_name or not correct_type:
+            parser.error(
+                f"Invalid type replacement '{replacement}', expected the form "
+                "module.Type=replacement"
+            )
+        type_replacements[(module_name, type_name)] = correct_type
+
+    from .utils import register_type_replacements
+
+    register_type_replacements(type_replacements)
+
+
+def _parse_formats(
+    parser: argparse.ArgumentParser, values: list[str] | None
+) -> tuple[str, ...]:
+    """Parse the --format arguments into a tuple of unique output formats."""
+
+    if values is None:
+        return ("md",)
+    formats = tuple(
+        dict.fromkeys(
+            output_format.strip()
+            for value in values
+            for output_format in value.split(",")
+            if output_format.strip()
+        )
+    )
+    from .formats import validate_formats
+
+    try:
+        validate_formats(formats)
+    except ValueError as e:
+        parser.error(str(e))
+    return formats
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments selecting where output files are saved to a parser."""
+
+    parser.add_argument(
+        "--output-archive",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Stream the output files into a single archive at PATH, instead of "
+        "an output directory. Its format is given by its suffix, among "
+        f"{', '.join(ARCHIVE_FORMATS)}.",
     )
     parser.add_argument(
         "output_path",
         type=str,
-        help="Path to the output directory where markdown files will be saved",
+        nargs="?",
+        help="Path to the output directory where the files will be saved, unless "
+        "--output-archive is given",
     )
-    args = parser.parse_args()
 
-    input_path = Path(args.input_path)
-    output_path = Path(args.output_path)
 
-    if not output_path.exists():
+def _get_output_paths(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> tuple[Path, Path]:
+    """Get the paths output files are saved under, creating their directory.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        The parser, to report invalid arguments.
+    args : argparse.Namespace
+        The parsed arguments, see `_add_output_arguments`.
+
+    Returns
+    -------
+    tuple[Path, Path]
+        Path output files are generated under, and directory they are saved to,
+        which holds the archive with --output-archive. Files are stored relative to
+        the root of the archive.
+    """
+
+    from .utils import create_output_directory
+    from .writer import get_archive_format
+
+    if args.output_archive is None:
+        if args.output_path is None:
+            parser.error("the following arguments are required: output_path")
+        output_path = output_dir = Path(args.output_path)
+    else:
+        if args.output_path is not None:
+            parser.error("output_path cannot be combined with --output-archive")
+        archive_path = Path(args.output_archive)
+        try:
+            get_archive_format(archive_path)
+        except ValueError as e:
+            parser.error(str(e))
+        output_path = Path(".")
+        output_dir = archive_path.parent
+
+    if not output_dir.exists():
         logger.info(
-            f"Output path '{output_path}' does not exist. Attempting to create it."
+            "Output path '%s' does not exist. Attempting to create it.", output_dir
         )
-        create_output_directory(output_path)
+        create_output_directory(output_dir)
+    return output_path, output_dir
+
+
+def _create_output_writer(
+    args: argparse.Namespace, output_path: Path
+) -> "OutputWriter":
+    """Create the writer of the output files, to a directory or an archive."""
+
+    from .writer import ArchiveWriter, OutputWriter
+
+    if args.output_archive is None:
+        return OutputWriter(output_path)
+    return ArchiveWriter(Path(args.output_archive), output_path)
+
+
+def _set_up_logging(args: argparse.Namespace) -> None:
+    """Set the log level and format from the verbosity and --log-format flags."""
 
-    validate_paths(input_path, output_path)
+    start_logging(args.log_format)
 
     if args.verbose:
         if args.quiet:
@@ -70,17 +267,532 @@ def main() -> None:
     else:
         logger.setLevel(logging.INFO)
 
-    for output_file, text in npdoc2md(
-        input_path,
-        output_path,
-        include_private=args.include_private,
-        private_whitelist=args.private_whitelist,
-    ).items():
-        with open(output_file, "w", encoding="utf-8") as f:
-            logger.info(f"Writing {output_file}...")
-            f.write(text)
-
-    logger.info("Markdown generation completed successfully.")
+
+def serve_main(argv: list[str]) -> None:
+    """Entry point for the `npdoc2md serve` subcommand.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Command line arguments following the subcommand name.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="npdoc2md serve",
+        description="Resident documentation server answering JSON-RPC requests "
+        "(one per line) for the markdown of modules, on stdin or a Unix socket.",
+    )
+    _add_verbosity_arguments(parser)
+    _add_conversion_arguments(parser)
+    _add_discovery_arguments(parser)
+    _add_replace_type_argument(parser)
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Listen on a Unix socket at PATH instead of reading requests from stdin.",
+    )
+    parser.add_argument(
+        "input_path",
+        type=str,
+        help="Path to the input file or directory containing files to parse",
+    )
+    args = parser.parse_args(argv)
+
+    _register_type_replacements(parser, args)
+    _set_up_logging(args)
+
+    input_path = Path(args.input_path)
+    if not input_path.exists():
+        parser.error(f"Input path '{input_path}' does not exist.")
+
+    from .mock import mocked_imports
+    from .server import serve
+
+    try:
+        with mocked_imports(args.mock_imports):
+            serve(
+                input_path,
+                socket_path=None if args.socket is None else Path(args.socket),
+                include_private=args.include_private,
+                private_whitelist=args.private_whitelist,
+                engine=args.engine,
+                exclude=args.exclude,
+                include=args.include,
+                use_gitignore=args.gitignore,
+            )
+    except KeyboardInterrupt:
+        logger.info("Stopped serving.")
+
+
+def render_main(argv: list[str]) -> None:
+    """Entry point for the `npdoc2md render` subcommand.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Command line arguments following the subcommand name.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="npdoc2md render",
+        description="Render the output of a previous build from its IR file (see "
+        "--output-ir), without importing or parsing any source.",
+    )
+    _add_verbosity_arguments(parser)
+    parser.add_argument(
+        "--from-ir",
+        type=str,
+        required=True,
+        metavar="PATH",
+        help="IR file written by 'npdoc2md --output-ir'.",
+    )
+    _add_format_argument(parser)
+    parser.add_argument(
+        "--output-manifest",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Write a JSON manifest of the sha256 hash of every output file, and "
+        "whether this run changed it, to PATH.",
+    )
+    _add_output_arguments(parser)
+    args = parser.parse_args(argv)
+    formats = _parse_formats(parser, args.format)
+    _set_up_logging(args)
+
+    ir_path = Path(args.from_ir)
+    if not ir_path.is_file():
+        parser.error(f"IR file '{ir_path}' does not exist.")
+    output_path, _ = _get_output_paths(parser, args)
+
+    from .ir import render_ir
+
+    try:
+        with _create_output_writer(args, output_path) as writer:
+            for output_file, text in render_ir(ir_path, output_path, formats):
+                writer.write(output_file, text)
+    except ValueError as e:
+        parser.error(str(e))
+
+    logger.info(
+        "Rendering completed successfully: wrote %d files, skipped %d unchanged files.",
+        writer.written,
+        writer.skipped,
+    )
+    if args.output_manifest is not None:
+        writer.save_manifest(Path(args.output_manifest))
+
+
+def merge_main(argv: list[str]) -> None:
+    """Entry point for the `npdoc2md merge` subcommand.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Command line arguments following the subcommand name.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="npdoc2md merge",
+        description="Combine the output directories of the shards of a build (see "
+        "--shard) into one output directory.",
+    )
+    _add_verbosity_arguments(parser)
+    parser.add_argument(
+        "--ir",
+        type=str,
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="IR file written by a shard with --output-ir, combined into "
+        "--output-ir. Can be given multiple times.",
+    )
+    parser.add_argument(
+        "--output-ir",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Write the combined IR of the shards given with --ir to PATH.",
+    )
+    parser.add_argument(
+        "--output-manifest",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Write a JSON manifest of the sha256 hash of every merged output file, "
+        "and whether this run changed it, to PATH.",
+    )
+    parser.add_argument(
+        "output_path",
+        type=str,
+        help="Path to the output directory where the merged files will be saved",
+    )
+    parser.add_argument(
+        "shard_paths",
+        type=str,
+        nargs="+",
+        metavar="shard_path",
+        help="Output directory of a shard",
+    )
+    args = parser.parse_args(argv)
+    if bool(args.ir) != (args.output_ir is not None):
+        parser.error("--ir and --output-ir must be given together")
+    _set_up_logging(args)
+
+    shard_paths = [Path(shard_path) for shard_path in args.shard_paths]
+    for shard_path in shard_paths:
+        if not shard_path.is_dir():
+            parser.error(f"Shard output directory '{shard_path}' does not exist.")
+    output_path = Path(args.output_path)
+    if not output_path.exists():
+        from .utils import create_output_directory
+
+        create_output_directory(output_path)
+
+    from .ir import merge_ir
+    from .shard import iter_shard_outputs
+    from .writer import OutputWriter
+
+    writer = OutputWriter(output_path)
+    try:
+        for relative_path, text in iter_shard_outputs(shard_paths):
+            writer.write(output_path / relative_path, text)
+        if args.output_ir is not None:
+            merge_ir([Path(ir_path) for ir_path in args.ir], Path(args.output_ir))
+    except ValueError as e:
+        parser.error(str(e))
+
+    logger.info(
+        "Merged %d shards: wrote %d files, skipped %d unchanged files.",
+        len(shard_paths),
+        writer.written,
+        writer.skipped,
+    )
+    if args.output_manifest is not None:
+        writer.save_manifest(Path(args.output_manifest))
+
+
+# Subcommands, dispatched on the first command line argument. An input path with the
+# same name as a subcommand has to be given with a directory, ex: ./serve.
+SUBCOMMANDS = {"merge": merge_main, "render": render_main, "serve": serve_main}
+
+
+def main() -> None:
+    """Main entry point for the npdoc2md CLI utility."""
+
+    try:
+        if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+            SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        else:
+            _convert_main()
+    finally:
+        # Flush the log messages queued for the listener thread before exiting.
+        stop_logging()
+
+
+def _convert_main() -> None:
+    """Convert the input path, as configured by the command line arguments."""
+
+    parser = argparse.ArgumentParser(
+        description="Utility for autogenerating markdown from numpy-style docstrings. "
+        "Run 'npdoc2md serve --help' for the resident documentation server, "
+        "'npdoc2md render --help' to render the output of a build from its IR, and "
+        "'npdoc2md merge --help' to combine the shards of a build. An input path "
+        "named like one of these subcommands must be prefixed with its directory, "
+        "ex: ./serve."
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    _add_verbosity_arguments(parser)
+    _add_conversion_arguments(parser)
+    _add_format_argument(parser)
+    parser.add_argument(
+        "--output-ir",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Also write the element tree of every module to an IR file at PATH "
+        "(gzip compressed if it ends with .gz), for 'npdoc2md render --from-ir'.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes used to convert files in parallel.",
+    )
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="Import and convert modules in worker subprocesses (as many as --jobs), "
+        "keeping them out of the main process.",
+    )
+    parser.add_argument(
+        "--import-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Skip and report modules taking longer than this to import and convert "
+        "(implies --isolated).",
+    )
+    parser.add_argument(
+        "--max-modules-per-worker",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Replace isolated workers after converting N modules (implies "
+        "--isolated).",
+    )
+    parser.add_argument(
+        "--max-worker-rss",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Replace isolated workers whose resident memory exceeds this many "
+        "megabytes (implies --isolated).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip source files that are unchanged since the last run, using a "
+        "build manifest stored in the cache directory.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory for the build manifest used by --incremental, and for the "
+        "store of parsed docstrings reused across runs (implies --incremental). "
+        "Defaults to .npdoc2md-cache in the input directory.",
+    )
+    parser.add_argument(
+        "--docstring-cache-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of parsed docstrings memoized in memory by each process, "
+        "0 to disable.",
+    )
+    _add_discovery_arguments(parser)
+    parser.add_argument(
+        "--shard",
+        type=str,
+        default=None,
+        metavar="I/N",
+        help="Only convert the I-th of N deterministic, size balanced shards of the "
+        "source files, ex: 2/4. Combine the shards with 'npdoc2md merge'.",
+    )
+    parser.add_argument(
+        "--output-manifest",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Write a JSON manifest of the sha256 hash of every output file, and "
+        "whether this run changed it, to PATH.",
+    )
+    _add_replace_type_argument(parser)
+    parser.add_argument(
+        "--profile",
+        type=str,
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="PATH",
+        help="Write a JSON report of per-phase and per-module timings to PATH, or "
+        "to stdout if no path is given.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="Number of slowest modules and classes listed in the --profile report.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running after the initial build, regenerating the markdown of "
+        "modules whose source changes.",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="Seconds without further changes before --watch rebuilds, so that "
+        "bursts of saves trigger a single rebuild.",
+    )
+    parser.add_argument(
+        "input_path",
+        type=str,
+        help="Path to the input file or directory containing files to parse",
+    )
+    _add_output_arguments(parser)
+    args = parser.parse_args()
+    _register_type_replacements(parser, args)
+    if args.docstring_cache_size is not None and args.docstring_cache_size < 0:
+        parser.error("--docstring-cache-size must not be negative")
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    if args.import_timeout is not None and args.import_timeout <= 0:
+        parser.error("--import-timeout must be positive")
+    if args.max_modules_per_worker is not None and args.max_modules_per_worker < 1:
+        parser.error("--max-modules-per-worker must be >= 1")
+    if args.max_worker_rss is not None and args.max_worker_rss <= 0:
+        parser.error("--max-worker-rss must be positive")
+    formats = _parse_formats(parser, args.format)
+    shard: tuple[int, int] | None = None
+    if args.shard is not None:
+        from .shard import parse_shard
+
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.watch:
+            parser.error("--shard cannot be combined with --watch")
+    if args.output_ir is not None and (args.incremental or args.cache_dir):
+        parser.error(
+            "--output-ir cannot be combined with --incremental, which skips modules"
+        )
+    if args.output_archive is not None and (
+        args.incremental or args.cache_dir or args.watch
+    ):
+        parser.error(
+            "--output-archive cannot be combined with --incremental or --watch, "
+            "archives are written from scratch"
+        )
+
+    input_path = Path(args.input_path)
+    output_path, output_dir = _get_output_paths(parser, args)
+
+    import json
+    from contextlib import nullcontext
+
+    from .cache import default_cache_dir
+    from .formats import FORMAT_SUFFIXES, IR_FORMAT
+    from .ir import IRWriter
+    from .memo import DEFAULT_MAX_ENTRIES
+    from .mock import mocked_imports
+    from .npdoc2md import ConversionError, iter_npdoc2md
+    from .profiling import profile_phase, profiling
+    from .utils import validate_paths
+    from .watch import watch
+
+    validate_paths(input_path, output_dir)
+
+    _set_up_logging(args)
+
+    cache_dir: Path | None = None
+    if args.cache_dir is not None:
+        cache_dir = Path(args.cache_dir)
+    elif args.incremental:
+        # Not the output directory, which is published.
+        cache_dir = default_cache_dir(input_path)
+
+    writer = _create_output_writer(args, output_path)
+    ir_writer: IRWriter | None = None
+    if args.output_ir is not None:
+        ir_writer = IRWriter(Path(args.output_ir))
+    # The IR holds the element trees of the modules, rendered by the converting
+    # processes along with the output formats.
+    converted_formats = formats if ir_writer is None else (*formats, IR_FORMAT)
+    ir_suffix = FORMAT_SUFFIXES[IR_FORMAT]
+    dropped: ConversionError | None = None
+    with (
+        profiling() if args.profile is not None else nullcontext() as profiler,
+        ir_writer if ir_writer is not None else nullcontext(),
+        writer,
+    ):
+        try:
+            for output_file, text in iter_npdoc2md(
+                input_path,
+                output_path,
+                include_private=args.include_private,
+                private_whitelist=args.private_whitelist,
+                engine=args.engine,
+                jobs=args.jobs,
+                cache_dir=cache_dir,
+                exclude=args.exclude,
+                include=args.include,
+                use_gitignore=args.gitignore,
+                isolated=args.isolated,
+                import_timeout=args.import_timeout,
+                max_modules_per_worker=args.max_modules_per_worker,
+                max_worker_rss=(
+                    None
+                    if args.max_worker_rss is None
+                    else int(args.max_worker_rss * 2**20)
+                ),
+                mock_imports=args.mock_imports,
+                docstring_cache_size=(
+                    DEFAULT_MAX_ENTRIES
+                    if args.docstring_cache_size is None
+                    else args.docstring_cache_size
+                ),
+                formats=converted_formats,
+                shard=shard,
+            ):
+                with profile_phase("write"):
+                    if ir_writer is not None and output_file.suffix == ir_suffix:
+                        ir_writer.add_rendered(
+                            output_file.relative_to(output_path)
+                            .with_suffix("")
+                            .as_posix(),
+                            text,
+                        )
+                        continue
+                    writer.write(output_file, text)
+        except ConversionError as e:
+            # The other modules are written, the build fails once they are.
+            dropped = e
+
+    if dropped is None:
+        logger.info(
+            "Markdown generation completed successfully: wrote %d files, "
+            "skipped %d unchanged files.",
+            writer.written,
+            writer.skipped,
+        )
+    else:
+        logger.error(
+            "Markdown generation failed: %s Wrote %d files, skipped %d unchanged "
+            "files.",
+            dropped,
+            writer.written,
+            writer.skipped,
+        )
+    if args.output_manifest is not None:
+        writer.save_manifest(Path(args.output_manifest))
+
+    if profiler is not None:
+        report = json.dumps(profiler.report(top=args.profile_top), indent=2)
+        if args.profile == "-":
+            print(report)
+        elif args.profile is not None:
+            with open(args.profile, "w", encoding="utf-8") as f:
+                f.write(report + "\n")
+            logger.info("Wrote profiling report to %s", args.profile)
+
+    if args.watch:
+        try:
+            with mocked_imports(args.mock_imports):
+                watch(
+                    input_path,
+                    output_path,
+                    include_private=args.include_private,
+                    private_whitelist=args.private_whitelist,
+                    engine=args.engine,
+                    exclude=args.exclude,
+                    include=args.include,
+                    use_gitignore=args.gitignore,
+                    debounce=args.debounce,
+                    formats=formats,
+                )
+        except KeyboardInterrupt:
+            logger.info("Stopped watching for changes.")
+
+    if dropped is not None:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
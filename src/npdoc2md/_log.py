@@ -1,7 +1,11 @@
 import logging
+import os
+import queue
 import sys
+from typing import TYPE_CHECKING
 
-logging.basicConfig()
+if TYPE_CHECKING:
+    from logging.handlers import QueueListener
 
 logger = logging.getLogger("npdoc2md")
 
@@ -16,6 +20,9 @@ COLOR_MAP = {
 # ANSI reset code to clear formatting after the log level
 RESET = "\033[0m"
 
+# Output formats of the command line log messages, for --log-format.
+LOG_FORMATS = ("text", "json")
+
 
 class ColorFormatter(logging.Formatter):
     """ANSI color formatter for warnings and errors.
@@ -40,30 +47,176 @@ class ColorFormatter(logging.Formatter):
         super().__init__(fmt)
         self.use_color = use_color
 
-    def format(self, record: logging.LogRecord) -> str:
-        """Format the log record with optional color coding based on the log level."""
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """Format the log record with optional color coding based on the log level.
+
+        The record is left untouched, the padded and colored level name is only
+        substituted in the values interpolated into the format string.
+        """
+        # Pad to 8 characters (length of "CRITICAL") for consistent alignment
+        levelname = record.levelname.ljust(8)
         if self.use_color and record.levelno in COLOR_MAP:
-            # Temporarily modify the levelname with color codes
-            original_levelname = record.levelname
-            # Pad to 8 characters (length of "CRITICAL") for consistent alignment
-            padded_levelname = original_levelname.ljust(8)
-            record.levelname = f"{COLOR_MAP[record.levelno]}{padded_levelname}{RESET}"
-            base = super().format(record)
-            # Restore the original levelname
-            record.levelname = original_levelname
-            return base
-        # For non-colored output, still pad for consistency
-        original_levelname = record.levelname
-        record.levelname = original_levelname.ljust(8)
-        base = super().format(record)
-        record.levelname = original_levelname
-        return base
+            levelname = f"{COLOR_MAP[record.levelno]}{levelname}{RESET}"
+        fmt = self._fmt or logging.BASIC_FORMAT
+        return fmt % {**record.__dict__, "levelname": levelname}
+
+
+# Attributes of every log record, the others are extra fields passed by the caller.
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatter writing each log record as a JSON object on a single line.
+
+    The object holds the time of the record in ISO 8601 format with the UTC
+    offset, its level, logger, message, module and line number, the traceback
+    of the exception if any, and the extra fields passed with `extra=`, so that
+    log shippers ingest it without parsing the text format.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format the log record as a line of JSON."""
+        import json
+        from datetime import datetime
 
+        entry = {
+            "time": datetime.fromtimestamp(record.created)
+            .astimezone()
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        return json.dumps(entry, default=str)
 
+
+# Handlers of the command line interface, writing the records taken off the queue
+# of configure_logging. Importing npdoc2md as a library leaves the logging
+# configuration to the application.
 handler = logging.StreamHandler()
 use_color = sys.stderr.isatty()
 fmt = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
 handler.setFormatter(ColorFormatter(fmt, use_color=use_color))
-logger.addHandler(handler)
-logger.setLevel(logging.INFO)
-logger.propagate = False
+json_handler = logging.StreamHandler()
+json_handler.setFormatter(JsonFormatter())
+
+# Records of the npdoc2md logger, written to stderr by the listener thread.
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: "QueueListener | None" = None
+# Format of the records written by the listener, passed on to worker subprocesses.
+_log_format = "text"
+
+
+def configure_logging() -> None:
+    """Queue the npdoc2md log records for the command line, once per process.
+
+    The conversion thread only formats the message of the records it logs and puts
+    them on a queue, the listener thread started by start_logging does the I/O.
+    """
+
+    from logging.handlers import QueueHandler
+
+    if any(isinstance(h, QueueHandler) for h in logger.handlers):
+        return
+    logging.basicConfig()
+    logger.addHandler(QueueHandler(_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    # Forked worker processes do not inherit the listener thread, they write their
+    # records directly instead of queueing them for nobody.
+    os.register_at_fork(after_in_child=_log_directly)
+
+
+def start_logging(log_format: str = "text") -> None:
+    """Write the queued log records to stderr from a background thread.
+
+    Parameters
+    ----------
+    log_format : str, default="text"
+        Output format of the log records, one of LOG_FORMATS
+    """
+
+    global _listener, _log_format
+    from logging.handlers import QueueListener
+
+    configure_logging()
+    _log_format = log_format
+    if _listener is not None:
+        _listener.stop()
+    target = json_handler if log_format == "json" else handler
+    _listener = QueueListener(_queue, target, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Write out the pending log records, and stop the background thread."""
+
+    global _listener
+    if _listener is None and not _queue.empty():
+        # Records logged before start_logging, ex: while parsing the arguments.
+        start_logging()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_worker_logging() -> tuple[int, str] | None:
+    """Get the logging configuration to apply in worker subprocesses.
+
+    Returns
+    -------
+    tuple[int, str] | None
+        Log level and format of the command line, or None if configure_logging
+        was not called, leaving the configuration to the application.
+    """
+
+    from logging.handlers import QueueHandler
+
+    if not any(isinstance(h, QueueHandler) for h in logger.handlers):
+        return None
+    return logger.level, _log_format
+
+
+def configure_worker_logging(level: int, log_format: str = "text") -> None:
+    """Log to stderr directly, with the command line level and format, in a worker.
+
+    Worker subprocesses write their records without a listener thread, which would
+    not flush the records of a worker killed after a timeout.
+
+    Parameters
+    ----------
+    level : int
+        Log level of the command line
+    log_format : str, default="text"
+        Output format of the log records, one of LOG_FORMATS
+    """
+
+    target = json_handler if log_format == "json" else handler
+    if target not in logger.handlers:
+        logger.addHandler(target)
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def _log_directly() -> None:
+    """Replace the queue by direct logging, in a forked child process."""
+
+    global _listener
+    from logging.handlers import QueueHandler
+
+    if _listener is None:
+        return
+    for queue_handler in list(logger.handlers):
+        if isinstance(queue_handler, QueueHandler):
+            logger.removeHandler(queue_handler)
+    _listener = None
+    configure_worker_logging(logger.level, _log_format)
@@ -0,0 +1,636 @@
+"""Static extraction engine that builds the element tree without importing modules.
+
+The default import engine imports every target module and reads docstrings and
+signatures from the live objects. This module builds the same `ModuleElement`,
+`ClassElement` and `FunctionElement` tree from the output of `ast.parse` instead,
+so that neither the target module nor its dependencies are ever imported.
+
+Signatures are reconstructed from `ast.arguments`. Names used in annotations are
+resolved through the module's own imports, definitions and type aliases so that the
+rendered markdown matches the import engine wherever the source alone carries
+enough information. Default values computed at runtime (ex: a constant imported
+from another module) are rendered as written, and names re-exported by another
+module (ex: `docstring_parser.Docstring`) are not traced back to the module
+defining them. Aliases of the module's own classes and functions (`alias = func`)
+are documented like the import engine does, but other assignments replacing a
+member (ex: `func = decorator(func)`) are not followed.
+"""
+
+import ast
+import copy
+import importlib.util
+import re
+from collections.abc import Callable, Iterator
+from logging import getLogger
+from pathlib import Path
+
+from .npdoc2md import ClassElement, FunctionElement, ModuleElement, render_docstring
+from .profiling import profile_phase
+from .utils import _INVALID_BUILTIN_CLASSES, sanitize_signature
+
+logger = getLogger("npdoc2md")
+
+# Decorators that replace a function with a non-function object, meaning that
+# the import engine would not pick the decorated member up as a function.
+_NON_FUNCTION_DECORATORS: set[str] = {
+    "staticmethod",
+    "classmethod",
+    "property",
+    "cached_property",
+    "abstractproperty",
+    "lru_cache",
+    "cache",
+    "setter",
+    "getter",
+    "deleter",
+}
+
+# Types from the 'types' module are reported by name only at runtime, since their
+# __module__ is 'builtins' (ex: 'types.ModuleType' renders as 'module').
+_BUILTIN_TYPE_NAMES: dict[str, str] = {
+    correct_type: type_name
+    for (module_name, type_name), correct_type in _INVALID_BUILTIN_CLASSES.items()
+    if module_name == "builtins"
+}
+
+_DOTTED_NAME_REGEX = re.compile(r"[\w.]+")
+
+# Conditions of `if` blocks only executed by static type checkers.
+_TYPE_CHECKING_NAMES = {"TYPE_CHECKING", "typing.TYPE_CHECKING"}
+
+Annotator = Callable[[ast.expr], str]
+
+# Placeholder __init__ that typing sets on Protocol classes defining none.
+_PROTOCOL_INIT = ast.FunctionDef(
+    name="__init__",
+    args=ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg="self")],
+        vararg=ast.arg(arg="args"),
+        kwonlyargs=[],
+        kw_defaults=[],
+        kwarg=ast.arg(arg="kwargs"),
+        defaults=[],
+    ),
+    body=[ast.Pass()],
+    decorator_list=[],
+    returns=None,
+)
+
+
+def _iter_module_statements(body: list[ast.stmt]) -> Iterator[ast.stmt]:
+    """Iterate over module level statements, descending into if/try blocks.
+
+    The body of `if TYPE_CHECKING:` blocks is skipped, as it is never executed at
+    runtime (only its else branch is).
+
+    Parameters
+    ----------
+    body : list[ast.stmt]
+        Statements of the module (or of a nested if/try block).
+
+    Returns
+    -------
+    Iterator[ast.stmt]
+        Statements executed at module level when the module is imported.
+    """
+
+    for node in body:
+        if isinstance(node, ast.If):
+            if ast.unparse(node.test) not in _TYPE_CHECKING_NAMES:
+                yield from _iter_module_statements(node.body)
+            yield from _iter_module_statements(node.orelse)
+        elif isinstance(node, ast.Try):
+            yield from _iter_module_statements(node.body)
+            for handler in node.handlers:
+                yield from _iter_module_statements(handler.body)
+            yield from _iter_module_statements(node.orelse)
+            yield from _iter_module_statements(node.finalbody)
+        else:
+            yield node
+
+
+def _decorator_name(decorator: ast.expr) -> str:
+    """Get the trailing name of a decorator expression.
+
+    Parameters
+    ----------
+    decorator : ast.expr
+        Decorator expression (ex: `property`, `functools.lru_cache(maxsize=None)`)
+
+    Returns
+    -------
+    str
+        The last dotted component of the decorator (ex: `property`, `lru_cache`)
+    """
+
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr
+    if isinstance(decorator, ast.Name):
+        return decorator.id
+    return ""
+
+
+def _is_plain_function(node: ast.stmt) -> bool:
+    """Check if a statement defines something the import engine sees as a function.
+
+    Parameters
+    ----------
+    node : ast.stmt
+        Statement to check.
+
+    Returns
+    -------
+    bool
+        True if the statement is a (possibly async) function definition that is not
+        wrapped by a decorator turning it into a descriptor or other object.
+    """
+
+    return isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not any(
+        _decorator_name(decorator) in _NON_FUNCTION_DECORATORS
+        for decorator in node.decorator_list
+    )
+
+
+def _build_name_table(
+    statements: list[ast.stmt], module_name: str, package: str
+) -> dict[str, str]:
+    """Map names visible at module level to the name the import engine would render.
+
+    Parameters
+    ----------
+    statements : list[ast.stmt]
+        Module level statements of the module.
+    module_name : str
+        Fully qualified name of the module.
+    package : str
+        Package used to resolve relative imports.
+
+    Returns
+    -------
+    dict[str, str]
+        Mapping of local names to their fully qualified (rendered) names.
+    """
+
+    names: dict[str, str] = {}
+    for node in statements:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname is not None:
+                    names[alias.asname] = alias.name
+                else:
+                    root = alias.name.split(".")[0]
+                    names[root] = root
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level > 0:
+                try:
+                    base = importlib.util.resolve_name(
+                        f"{'.' * node.level}{base}", package
+                    )
+                except ImportError:
+                    logger.debug("Could not resolve relative import in %s", module_name)
+                    continue
+            for alias in node.names:
+                if alias.name != "*":
+                    names[alias.asname or alias.name] = f"{base}.{alias.name}"
+        elif isinstance(node, ast.ClassDef):
+            names[node.name] = f"{module_name}.{node.name}"
+        elif (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Call)
+            and _decorator_name(node.value) == "TypeVar"
+        ):
+            # TypeVars render as '~T' at runtime.
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    names[target.id] = f"~{target.id}"
+        elif (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and (
+                isinstance(node.value, ast.Subscript)
+                or isinstance(node.value, ast.BinOp)
+                and isinstance(node.value.op, ast.BitOr)
+            )
+        ):
+            # Type aliases (ex: Annotator = Callable[[ast.expr], str]) render as
+            # the aliased annotation at runtime.
+            resolved = _AnnotationResolver(names).visit(copy.deepcopy(node.value))
+            names[node.targets[0].id] = ast.unparse(resolved)
+
+    return names
+
+
+class _AnnotationResolver(ast.NodeTransformer):
+    """Rewrites names in an annotation expression to their fully qualified form."""
+
+    def __init__(self, names: dict[str, str]):
+        """Initialize the resolver with the module's name table.
+
+        Parameters
+        ----------
+        names : dict[str, str]
+            Mapping of local names to their fully qualified names.
+        """
+
+        self.names = names
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        """Replace a name with its qualified counterpart, if it is known."""
+        qualified = self.names.get(node.id)
+        if qualified is None:
+            return node
+        return ast.copy_location(ast.Name(id=qualified, ctx=node.ctx), node)
+
+
+def _make_annotator(names: dict[str, str], postponed: bool) -> Annotator:
+    """Create a function rendering annotation expressions like `inspect` would.
+
+    Parameters
+    ----------
+    names : dict[str, str]
+        Mapping of local names to their fully qualified names.
+    postponed : bool
+        Whether the module uses `from __future__ import annotations`, in which case
+        annotations are plain strings at runtime.
+
+    Returns
+    -------
+    Annotator
+        Function converting an annotation expression to its rendered string.
+    """
+
+    resolver = _AnnotationResolver(names)
+
+    def qualify(match: re.Match[str]) -> str:
+        name = match.group()
+        return _BUILTIN_TYPE_NAMES.get(name, name)
+
+    def qualify_typing(match: re.Match[str]) -> str:
+        return qualify(match).removeprefix("typing.")
+
+    def annotate(annotation: ast.expr) -> str:
+        if postponed:
+            return repr(ast.unparse(annotation))
+        resolved = resolver.visit(copy.deepcopy(annotation))
+        # Like inspect.formatannotation, the 'typing.' prefixes are only dropped
+        # from annotations that are typing objects (ex: Optional[Any], but not
+        # dict[str, typing.Any] or int | typing.Any).
+        origin = resolved
+        while isinstance(origin, ast.Subscript):
+            origin = origin.value
+        is_typing = ast.unparse(origin).startswith("typing.")
+        return _DOTTED_NAME_REGEX.sub(
+            qualify_typing if is_typing else qualify, ast.unparse(resolved)
+        )
+
+    return annotate
+
+
+def _base_name(base: ast.expr, names: dict[str, str]) -> str:
+    """Get the __name__ the import engine renders for a base class expression.
+
+    Parameters
+    ----------
+    base : ast.expr
+        Base class expression (ex: `ModuleType`, `abc.ABC`, `Generic[T]`)
+    names : dict[str, str]
+        Mapping of local names to their fully qualified names.
+
+    Returns
+    -------
+    str
+        The name of the base class at runtime (ex: `module`, `ABC`, `Generic`)
+    """
+
+    while isinstance(base, ast.Subscript):
+        base = base.value
+    if not isinstance(base, (ast.Name, ast.Attribute)):
+        return ast.unparse(base)
+    qualified = ast.unparse(_AnnotationResolver(names).visit(copy.deepcopy(base)))
+    return _BUILTIN_TYPE_NAMES.get(qualified, qualified).rsplit(".", 1)[-1]
+
+
+def _alias_target(node: ast.stmt) -> tuple[list[str], str] | None:
+    """Get the names bound and the name aliased by a `name = other` statement.
+
+    Parameters
+    ----------
+    node : ast.stmt
+        Statement to check.
+
+    Returns
+    -------
+    tuple[list[str], str] | None
+        Names assigned to, and the aliased name, or None if the statement is not
+        a plain alias.
+    """
+
+    if not isinstance(node, ast.Assign) or not isinstance(node.value, ast.Name):
+        return None
+    names = [target.id for target in node.targets if isinstance(target, ast.Name)]
+    if len(names) != len(node.targets):
+        return None
+    return names, node.value.id
+
+
+def _format_parameter(
+    arg: ast.arg, default: ast.expr | None, annotate: Annotator, prefix: str = ""
+) -> str:
+    """Format a single parameter the way `inspect.Parameter.__str__` does.
+
+    Parameters
+    ----------
+    arg : ast.arg
+        The parameter node.
+    default : ast.expr, optional
+        Default value expression of the parameter, if any.
+    annotate : Annotator
+        Function used to render the parameter annotation.
+    prefix : str, default=""
+        Prefix for variadic parameters ('*' or '**').
+
+    Returns
+    -------
+    str
+        The formatted parameter.
+    """
+
+    formatted = f"{prefix}{arg.arg}"
+    if arg.annotation is not None:
+        formatted += f": {annotate(arg.annotation)}"
+    if default is not None:
+        separator = " = " if arg.annotation is not None else "="
+        formatted += f"{separator}{ast.unparse(default)}"
+    return formatted
+
+
+def format_signature(
+    node: ast.FunctionDef | ast.AsyncFunctionDef, annotate: Annotator
+) -> str:
+    """Reconstruct a function signature string from its definition.
+
+    Parameters
+    ----------
+    node : ast.FunctionDef | ast.AsyncFunctionDef
+        Function definition to build the signature for.
+    annotate : Annotator
+        Function used to render annotations.
+
+    Returns
+    -------
+    str
+        The signature, formatted like `str(inspect.signature(func))`.
+    """
+
+    args = node.args
+    positional = [*args.posonlyargs, *args.args]
+    defaults: list[ast.expr | None] = [None] * (
+        len(positional) - len(args.defaults)
+    ) + list(args.defaults)
+
+    parts: list[str] = []
+    for index, (arg, default) in enumerate(zip(positional, defaults, strict=True)):
+        parts.append(_format_parameter(arg, default, annotate))
+        if index == len(args.posonlyargs) - 1:
+            parts.append("/")
+
+    if args.vararg is not None:
+        parts.append(_format_parameter(args.vararg, None, annotate, prefix="*"))
+    elif len(args.kwonlyargs) > 0:
+        parts.append("*")
+
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults, strict=True):
+        parts.append(_format_parameter(arg, default, annotate))
+
+    if args.kwarg is not None:
+        parts.append(_format_parameter(args.kwarg, None, annotate, prefix="**"))
+
+    signature = f"({', '.join(parts)})"
+    if node.returns is not None:
+        signature += f" -> {annotate(node.returns)}"
+    return signature
+
+
+def _function_element(
+    node: ast.FunctionDef | ast.AsyncFunctionDef,
+    annotate: Annotator,
+    level: int,
+    name: str | None = None,
+) -> FunctionElement:
+    """Build a FunctionElement from a function definition.
+
+    Parameters
+    ----------
+    node : ast.FunctionDef | ast.AsyncFunctionDef
+        The function definition.
+    annotate : Annotator
+        Function used to render annotations.
+    level : int
+        Heading level of the function in the markdown documentation.
+    name : str, optional
+        Name the function is documented under, if it is an alias of the
+        definition. Defaults to the name of the definition.
+
+    Returns
+    -------
+    FunctionElement
+        The function's element.
+    """
+
+    name = node.name if name is None else name
+    docstring = ast.get_docstring(node, clean=False)
+    return FunctionElement(
+        name=name,
+        signature=f"def {name}{sanitize_signature(format_signature(node, annotate))}",
+        docstring=render_docstring(
+            docstring if docstring is not None else f"Description for {name}()"
+        ),
+        level=level,
+    )
+
+
+def _is_included(
+    name: str, include_private: bool, private_whitelist: list[str] | None
+) -> bool:
+    """Check if a member should be documented given the private member settings.
+
+    Parameters
+    ----------
+    name : str
+        Name of the member.
+    include_private : bool
+        Whether to include private members.
+    private_whitelist : list[str], optional
+        List of private member names to include even if include_private is False.
+
+    Returns
+    -------
+    bool
+        True if the member should be included in the documentation.
+    """
+
+    return (
+        include_private
+        or not name.startswith("_")
+        or (private_whitelist is not None and name in private_whitelist)
+    )
+
+
+def _class_element(
+    node: ast.ClassDef,
+    names: dict[str, str],
+    annotate: Annotator,
+    include_private: bool,
+    private_whitelist: list[str] | None,
+) -> ClassElement:
+    """Build a ClassElement, including its methods, from a class definition.
+
+    Parameters
+    ----------
+    node : ast.ClassDef
+        The class definition.
+    names : dict[str, str]
+        Mapping of local names to their fully qualified names.
+    annotate : Annotator
+        Function used to render annotations.
+    include_private : bool
+        Whether to include private methods.
+    private_whitelist : list[str], optional
+        List of private method names to include even if include_private is False.
+
+    Returns
+    -------
+    ClassElement
+        The class's element.
+    """
+
+    # The import engine renders the bare __name__ of each base class.
+    bases = [_base_name(base, names) for base in node.bases]
+
+    # Later definitions replace earlier ones but keep their position, like __dict__.
+    methods: dict[str, ast.FunctionDef | ast.AsyncFunctionDef] = {}
+    for child in node.body:
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if _is_plain_function(child):
+                methods[child.name] = child
+            else:
+                methods.pop(child.name, None)
+        elif (alias := _alias_target(child)) is not None:
+            targets, aliased = alias
+            for target in targets:
+                if aliased in methods:
+                    methods[target] = methods[aliased]
+    # Protocol classes get a placeholder __init__ once created, if they define none.
+    if "__init__" not in methods and any(
+        isinstance(base, (ast.Name, ast.Attribute))
+        and ast.unparse(_AnnotationResolver(names).visit(copy.deepcopy(base)))
+        in ("typing.Protocol", "typing_extensions.Protocol")
+        for base in node.bases
+    ):
+        methods["__init__"] = _PROTOCOL_INIT
+
+    docstring = ast.get_docstring(node, clean=False)
+    return ClassElement.from_parts(
+        name=node.name,
+        signature=f"class {node.name}({', '.join(bases) or 'object'})",
+        docstring=render_docstring(
+            docstring if docstring is not None else f"Description for {node.name}"
+        ),
+        methods=[
+            _function_element(method, annotate, level=3, name=method_name)
+            for method_name, method in methods.items()
+            if _is_included(method_name, include_private, private_whitelist)
+        ],
+    )
+
+
+def module_element_from_source(
+    src_file: Path,
+    module_name: str,
+    package: str,
+    include_private: bool = False,
+    private_whitelist: list[str] | None = None,
+) -> ModuleElement:
+    """Build a ModuleElement for a python file by parsing its source.
+
+    Parameters
+    ----------
+    src_file : Path
+        Path to the python source file.
+    module_name : str
+        Fully qualified name the module would be imported as.
+    package : str
+        Package used to resolve relative imports in the module.
+    include_private : bool, default=False
+        Whether to include private members in the documentation.
+    private_whitelist : list[str], optional
+        List of private member names to include even if include_private is False.
+
+    Returns
+    -------
+    ModuleElement
+        The element tree for the module, equivalent to the import engine's.
+    """
+
+    with profile_phase("parse_source"):
+        tree = ast.parse(src_file.read_bytes(), filename=str(src_file))
+    statements = list(_iter_module_statements(tree.body))
+
+    postponed = any(
+        isinstance(node, ast.ImportFrom)
+        and node.module == "__future__"
+        and any(alias.name == "annotations" for alias in node.names)
+        for node in statements
+    )
+    names = _build_name_table(statements, module_name, package)
+    annotate = _make_annotator(names, postponed)
+
+    classes: dict[str, ast.ClassDef] = {}
+    functions: dict[str, ast.FunctionDef | ast.AsyncFunctionDef] = {}
+    for node in statements:
+        if isinstance(node, ast.ClassDef):
+            classes[node.name] = node
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if _is_plain_function(node):
+                functions[node.name] = node
+            else:
+                functions.pop(node.name, None)
+        elif (alias := _alias_target(node)) is not None:
+            # Aliases of the module's classes and functions are members too.
+            targets, aliased = alias
+            for target in targets:
+                if aliased in classes:
+                    classes[target] = classes[aliased]
+                elif aliased in functions:
+                    functions[target] = functions[aliased]
+
+    docstring = ast.get_docstring(tree, clean=False)
+    # Members are sorted by name, matching the order of inspect.getmembers.
+    return ModuleElement.from_parts(
+        name=module_name,
+        docstring=render_docstring(
+            docstring
+            if docstring is not None
+            else f"Description for {module_name} module"
+        ),
+        classes=[
+            _class_element(
+                classes[class_name],
+                names,
+                annotate,
+                include_private,
+                private_whitelist,
+            )
+            for class_name in sorted(classes)
+        ],
+        functions=[
+            _function_element(functions[func_name], annotate, level=2, name=func_name)
+            for func_name in sorted(functions)
+            if _is_included(func_name, include_private, private_whitelist)
+        ],
+    )
@@ -0,0 +1,177 @@
+"""Persistent build manifest used to skip regenerating unchanged source files.
+
+The manifest records, for every converted source file, a hash of its content along
+with the npdoc2md version and the conversion options used. On the next run, files
+whose recorded inputs still match are skipped entirely: they are not imported,
+parsed, or rendered.
+"""
+
+import hashlib
+import json
+from logging import getLogger
+from pathlib import Path
+from typing import Any
+
+from ._version import __version__
+
+logger = getLogger("npdoc2md")
+
+MANIFEST_FILE_NAME = ".npdoc2md-manifest.json"
+
+# Name of the default cache directory, kept out of the published output directory.
+DEFAULT_CACHE_DIR_NAME = ".npdoc2md-cache"
+
+
+def hash_file(path: Path) -> str:
+    """Compute the hash of a file's content.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the file to hash.
+
+    Returns
+    -------
+    str
+        Hex digest of the sha256 hash of the file content.
+    """
+
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def default_cache_dir(input_path: Path) -> Path:
+    """Get the default directory for the build manifest and docstring store.
+
+    The directory is created if needed, with a .gitignore file ignoring its content.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to the input file or directory containing files to parse.
+
+    Returns
+    -------
+    Path
+        The .npdoc2md-cache directory in the input directory, or next to the input
+        file.
+    """
+
+    base_dir = input_path if input_path.is_dir() else input_path.parent
+    cache_dir = base_dir / DEFAULT_CACHE_DIR_NAME
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    gitignore = cache_dir / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text(
+            "# Created by npdoc2md --incremental, safe to delete.\n*\n",
+            encoding="utf-8",
+        )
+    return cache_dir
+
+
+class BuildManifest:
+    """On-disk record of the inputs used to generate each output file.
+
+    Attributes
+    ----------
+    path : Path
+        Path to the manifest file.
+    options : dict[str, Any]
+        Conversion options for the current run. Entries recorded with different
+        options (or a different npdoc2md version) are discarded on load.
+    entries : dict[str, dict[str, str]]
+        Mapping of source file keys to their recorded content hash and output file.
+    """
+
+    def __init__(self, cache_dir: Path, options: dict[str, Any]):
+        """Load the manifest from the cache directory, if one exists.
+
+        Parameters
+        ----------
+        cache_dir : Path
+            Directory holding the manifest file.
+        options : dict[str, Any]
+            Conversion options for the current run. Must be JSON serializable.
+        """
+
+        self.path = cache_dir / MANIFEST_FILE_NAME
+        self.options = options
+        self.entries: dict[str, dict[str, str]] = {}
+
+        if not self.path.is_file():
+            logger.debug("No build manifest found at %s", self.path)
+            return
+
+        try:
+            with open(self.path, encoding="utf-8") as fp:
+                manifest = json.load(fp)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable build manifest %s: %s", self.path, e)
+            return
+
+        if manifest.get("version") != __version__:
+            logger.info("npdoc2md version changed since last run, rebuilding all.")
+        elif manifest.get("options") != self.options:
+            logger.info("Conversion options changed since last run, rebuilding all.")
+        else:
+            self.entries = manifest.get("files", {})
+
+    def is_up_to_date(self, key: str, content_hash: str, output_file: Path) -> bool:
+        """Check if an output file was generated from the given source content.
+
+        Parameters
+        ----------
+        key : str
+            Key identifying the source file in the manifest.
+        content_hash : str
+            Hash of the current content of the source file.
+        output_file : Path
+            Path to the output file generated from the source file.
+
+        Returns
+        -------
+        bool
+            True if the source is unchanged and its output file still exists.
+        """
+
+        entry = self.entries.get(key)
+        return (
+            entry is not None
+            and entry["hash"] == content_hash
+            and entry["output"] == str(output_file)
+            and output_file.is_file()
+        )
+
+    def record(self, key: str, content_hash: str, output_file: Path) -> None:
+        """Record the content hash a source file's output was generated from.
+
+        Parameters
+        ----------
+        key : str
+            Key identifying the source file in the manifest.
+        content_hash : str
+            Hash of the content of the source file.
+        output_file : Path
+            Path to the output file generated from the source file.
+        """
+
+        self.entries[key] = {"hash": content_hash, "output": str(output_file)}
+
+    def save(self, keys: list[str]) -> None:
+        """Write the manifest to disk, keeping only the given source file entries.
+
+        Parameters
+        ----------
+        keys : list[str]
+            Keys of the source files that are part of the current run. Entries for
+            sources that no longer exist are dropped.
+        """
+
+        manifest = {
+            "version": __version__,
+            "options": self.options,
+            "files": {key: self.entries[key] for key in keys if key in self.entries},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as fp:
+            json.dump(manifest, fp, indent=2, sort_keys=True)
+        logger.debug("Saved build manifest with %d entries", len(manifest["files"]))
@@ -0,0 +1,18 @@
+"""Constants shared by the conversion modules and the command line interface.
+
+This module imports nothing, so that the command line parser offers the same
+choices as the conversion machinery without importing it.
+"""
+
+# Engines available for extracting docstrings and signatures from source files.
+ENGINES = ("import", "ast")
+
+# Archive suffixes, and the tarfile mode (or "zip") of each.
+ARCHIVE_FORMATS = {
+    ".zip": "zip",
+    ".tar": "w:",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tar.xz": "w:xz",
+}
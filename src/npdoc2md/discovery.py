@@ -0,0 +1,311 @@
+"""Discovery of the python source files to document.
+
+Source trees are walked with `os.scandir`, pruning excluded directories (ex: virtual
+environments, build outputs, version control metadata) before descending into them.
+Files and directories can be excluded or included with glob patterns, and
+`.gitignore` files can optionally be honored.
+"""
+
+import os
+import re
+from collections.abc import Iterable, Iterator
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+# Directories which never contain sources to document, excluded by default.
+DEFAULT_EXCLUDES = (
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    "build",
+    "node_modules",
+    "__pycache__",
+    "*.egg-info",
+    ".npdoc2md-cache",
+)
+
+
+def _gitignore_pattern_to_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a .gitignore pattern (without negation or trailing slash) to a regex.
+
+    Parameters
+    ----------
+    pattern : str
+        The .gitignore pattern.
+
+    Returns
+    -------
+    re.Pattern[str]
+        Regex matching posix paths relative to the directory of the .gitignore file.
+    """
+
+    # Patterns containing a slash are relative to the .gitignore directory, others
+    # match at any depth.
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            parts.append(".*" if pattern.startswith("**", i) else "[^/]*")
+            i += 2 if pattern.startswith("**", i) else 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            parts.append("[" + pattern[i + 1 : end].replace("!", "^", 1) + "]")
+            i = end + 1
+        else:
+            if pattern[i] == "\\" and i + 1 < len(pattern):
+                i += 1
+            parts.append(re.escape(pattern[i]))
+            i += 1
+
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(f"^{prefix}{''.join(parts)}$")
+
+
+class GitIgnore:
+    """Rules of a single .gitignore file.
+
+    Attributes
+    ----------
+    base_dir : Path
+        Directory containing the .gitignore file, which its patterns are relative to.
+    rules : list[tuple[re.Pattern[str], bool, bool]]
+        Compiled patterns, with whether they are negated and only match directories.
+    """
+
+    def __init__(self, base_dir: Path, lines: Iterable[str]):
+        """Parse the lines of a .gitignore file.
+
+        Parameters
+        ----------
+        base_dir : Path
+            Directory containing the .gitignore file.
+        lines : Iterable[str]
+            Lines of the .gitignore file.
+        """
+
+        self.base_dir = base_dir
+        self.rules: list[tuple[re.Pattern[str], bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if line:
+                self.rules.append(
+                    (_gitignore_pattern_to_regex(line), negated, dir_only)
+                )
+
+    @classmethod
+    def from_directory(cls, directory: Path) -> "GitIgnore | None":
+        """Load the .gitignore file of a directory, if any.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory to look for a .gitignore file in.
+
+        Returns
+        -------
+        GitIgnore | None
+            The parsed rules, or None if the directory has no (readable) .gitignore.
+        """
+
+        try:
+            with open(directory / ".gitignore", encoding="utf-8") as f:
+                return cls(directory, f.readlines())
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def match(self, path: Path, is_dir: bool) -> bool | None:
+        """Check whether a path is ignored by these rules.
+
+        Parameters
+        ----------
+        path : Path
+            Path to check, below the base directory.
+        is_dir : bool
+            Whether the path is a directory.
+
+        Returns
+        -------
+        bool | None
+            True if ignored, False if explicitly re-included by a negated pattern, or
+            None if no pattern matches.
+        """
+
+        relative = path.relative_to(self.base_dir).as_posix()
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if (is_dir or not dir_only) and regex.match(relative):
+                result = not negated
+        return result
+
+
+def _find_parent_gitignores(directory: Path) -> list[GitIgnore]:
+    """Load the .gitignore files of the parents of a directory, up to the repo root.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory whose parents are searched.
+
+    Returns
+    -------
+    list[GitIgnore]
+        The rules found, outermost first. Empty if the directory is not in a git
+        repository.
+    """
+
+    directory = directory.resolve()
+    if (directory / ".git").exists():
+        return []
+
+    parents = []
+    for parent in directory.parents:
+        parents.append(parent)
+        if (parent / ".git").exists():
+            break
+    else:
+        return []
+
+    gitignores = []
+    for parent in reversed(parents):
+        gitignore = GitIgnore.from_directory(parent)
+        if gitignore is not None:
+            gitignores.append(gitignore)
+    return gitignores
+
+
+def _matches_any(relative: str, name: str, patterns: Iterable[str]) -> bool:
+    """Check whether a path or its name matches any of the glob patterns.
+
+    Parameters
+    ----------
+    relative : str
+        Posix path relative to the input path.
+    name : str
+        Name of the file or directory.
+    patterns : Iterable[str]
+        Glob patterns to match against.
+
+    Returns
+    -------
+    bool
+        True if any pattern matches the relative path or the name.
+    """
+
+    return any(
+        fnmatchcase(relative, pattern) or fnmatchcase(name, pattern)
+        for pattern in patterns
+    )
+
+
+def iter_python_files(
+    input_path: Path,
+    exclude: Iterable[str] | None = None,
+    include: Iterable[str] | None = None,
+    use_gitignore: bool = False,
+) -> Iterator[Path]:
+    """Walk a source tree, yielding python files in a deterministic order.
+
+    Directories are visited depth first in name order. Excluded and ignored
+    directories are pruned, so their contents are never listed. Symbolic links to
+    directories are not followed, and entries which cannot be read are skipped.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to the input file or directory to walk. A file is yielded as is.
+    exclude : Iterable[str], optional
+        Glob patterns of files and directories to skip, matched against their path
+        relative to the input path and against their name. These are added to
+        DEFAULT_EXCLUDES.
+    include : Iterable[str], optional
+        Glob patterns of files to keep, matched like exclude patterns. If given,
+        files matching none of them are skipped.
+    use_gitignore : bool, default=False
+        Whether to skip files and directories ignored by .gitignore files, both
+        inside the input path and in its parents up to the repository root.
+
+    Yields
+    ------
+    Path
+        Paths of python files to document.
+    """
+
+    if input_path.is_file():
+        yield input_path
+        return
+
+    exclude = (*DEFAULT_EXCLUDES, *(exclude or ()))
+    include = tuple(include) if include else ()
+    gitignores = _find_parent_gitignores(input_path) if use_gitignore else []
+
+    def is_ignored(path: Path, is_dir: bool, gitignores: list[GitIgnore]) -> bool:
+        ignored = False
+        for gitignore in gitignores:
+            result = gitignore.match(path, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    def walk(
+        directory: Path, resolved: Path, gitignores: list[GitIgnore]
+    ) -> Iterator[Path]:
+        if use_gitignore:
+            gitignore = GitIgnore.from_directory(resolved)
+            if gitignore is not None:
+                gitignores = [*gitignores, gitignore]
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        for entry in entries:
+            path = Path(entry.path)
+            relative = path.relative_to(input_path).as_posix()
+            try:
+                # Symlinked directories are not followed, they can form loops.
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            if _matches_any(relative, entry.name, exclude):
+                continue
+            # .gitignore rules are matched against resolved paths, like their base
+            if use_gitignore and is_ignored(resolved / entry.name, is_dir, gitignores):
+                continue
+            if is_dir:
+                yield from walk(path, resolved / entry.name, gitignores)
+            elif (
+                entry.name.endswith(".py")
+                and is_file
+                and (not include or _matches_any(relative, entry.name, include))
+            ):
+                yield path
+
+    yield from walk(input_path, input_path.resolve(), gitignores)
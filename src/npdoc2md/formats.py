@@ -0,0 +1,243 @@
+"""Output formats the element tree is rendered to, besides markdown.
+
+Markdown is rendered by the elements themselves. The other formats are rendered
+from the JSON serializable form of a module's element tree (see
+`DocToMarkdownElement.to_dict`), so that every requested format of a module is
+produced from a single import and a single docstring parse of its members:
+
+- json: the element tree itself, with a versioned, stable schema.
+- html: a standalone page, laid out like the markdown (headings, signatures and
+  tables), for serving or publishing without a markdown renderer.
+
+The internal ir format is the element tree on a single line, as stored in IR files,
+so that their records are serialized by the process building the tree.
+"""
+
+import json
+from collections.abc import Sequence
+from html import escape
+from io import StringIO
+from typing import IO, Any
+
+# Output formats, by the name used on the command line.
+OUTPUT_FORMATS = ("md", "json", "html")
+
+# Internal format, the compact element tree of a module as stored in IR files.
+IR_FORMAT = "ir"
+
+# Suffix of the output files of each format.
+FORMAT_SUFFIXES = {"md": ".md", "json": ".json", "html": ".html", IR_FORMAT: ".ir"}
+
+# Version of the JSON schema, incremented on any incompatible change.
+JSON_SCHEMA_VERSION = 1
+
+# Columns of the table rendered for each section, as (header, meta key) pairs.
+_PARAM_COLUMNS = (
+    ("Type", "type_name"),
+    ("Optional", "is_optional"),
+    ("Default", "default"),
+    ("Description", "description"),
+)
+_RETURN_COLUMNS = (
+    ("Type", "type_name"),
+    ("Variable Name", "return_name"),
+    ("Is Generator", "is_generator"),
+    ("Description", "description"),
+)
+_RAISE_COLUMNS = (("Error", "type_name"), ("Description", "description"))
+_EXAMPLE_COLUMNS = (("Snippet", "snippet"), ("Description", "description"))
+
+
+def validate_formats(formats: Sequence[str], allow_ir: bool = False) -> None:
+    """Check that output formats are known, and that there is at least one.
+
+    Parameters
+    ----------
+    formats : Sequence[str]
+        Names of the output formats
+    allow_ir : bool, default=False
+        Whether the internal IR_FORMAT is accepted as well
+
+    Raises
+    ------
+    ValueError
+        If no format is given, or if one of them is not in OUTPUT_FORMATS.
+    """
+
+    if len(formats) == 0:
+        raise ValueError("At least one output format is required.")
+    for output_format in formats:
+        if output_format not in OUTPUT_FORMATS and not (
+            allow_ir and output_format == IR_FORMAT
+        ):
+            raise ValueError(
+                f"Unknown output format '{output_format}', expected one of "
+                f"{OUTPUT_FORMATS}."
+            )
+
+
+def render_json(data: dict[str, Any]) -> str:
+    """Render the element tree of a module as JSON.
+
+    Parameters
+    ----------
+    data : dict[str, Any]
+        The module element, as returned by its `to_dict` method
+
+    Returns
+    -------
+    str
+        The JSON document, with the schema version as its first key
+    """
+
+    return json.dumps({"schema_version": JSON_SCHEMA_VERSION, **data}, indent=2) + "\n"
+
+
+def render_ir_module(data: dict[str, Any]) -> str:
+    """Render the element tree of a module as a compact line of JSON.
+
+    Parameters
+    ----------
+    data : dict[str, Any]
+        The module element, as returned by its `to_dict` method
+
+    Returns
+    -------
+    str
+        The JSON document on a single line, without the schema version, which IR
+        files record once in their header
+    """
+
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _cell(value: Any) -> str:
+    """Format a table cell, with the N/A placeholder the markdown uses."""
+    return "N/A" if value is None else escape(str(value))
+
+
+def _write_html_table(
+    stream: IO[str],
+    name: str,
+    level: int,
+    columns: tuple[tuple[str, str], ...],
+    rows: list[dict[str, Any]],
+) -> None:
+    """Write a section of an element as an html table.
+
+    Parameters
+    ----------
+    stream : IO[str]
+        Text stream to write the table to
+    name : str
+        Name of the section (ex: Parameters, Returns, Raises)
+    level : int
+        Heading level of the section
+    columns : tuple[tuple[str, str], ...]
+        Header and key of each column
+    rows : list[dict[str, Any]]
+        Items of the section
+    """
+
+    level = min(level, 6)
+    stream.write(f"<h{level}>{escape(name)}</h{level}>\n<table>\n<tr>")
+    stream.write("".join(f"<th>{escape(header)}</th>" for header, _ in columns))
+    stream.write("</tr>\n")
+    for row in rows:
+        stream.write("<tr>")
+        stream.write("".join(f"<td>{_cell(row[key])}</td>" for _, key in columns))
+        stream.write("</tr>\n")
+    stream.write("</table>\n")
+
+
+def _write_html_element(stream: IO[str], data: dict[str, Any]) -> None:
+    """Write an element, and its sub-elements, as html.
+
+    Parameters
+    ----------
+    stream : IO[str]
+        Text stream to write the element to
+    data : dict[str, Any]
+        The element, as returned by its `to_dict` method
+    """
+
+    level = min(data["level"], 6)
+    name = escape(data["name"])
+    docstring = data["docstring"]
+    stream.write(f'<h{level} id="{name}">{name}</h{level}>\n')
+    if data["signature"] is not None:
+        stream.write(
+            f'<pre><code class="language-python">{escape(data["signature"])}'
+            "</code></pre>\n"
+        )
+    if docstring["description"] is not None:
+        stream.write(f"<p>{escape(docstring['description'])}</p>\n")
+
+    sub_level = data["level"] + 1
+    if docstring["params"]:
+        # Class docstrings include attributes instead of parameters.
+        section = "Attributes" if data["kind"] == "class" else "Parameters"
+        params = [
+            {**param, "default": param["default"] if param["is_optional"] else None}
+            for param in docstring["params"]
+        ]
+        columns = ((section[:-1], "arg_name"), *_PARAM_COLUMNS)
+        _write_html_table(stream, section, sub_level, columns, params)
+    if docstring["returns"] is not None:
+        _write_html_table(
+            stream, "Returns", sub_level, _RETURN_COLUMNS, [docstring["returns"]]
+        )
+    if docstring["raises"]:
+        _write_html_table(
+            stream, "Raises", sub_level, _RAISE_COLUMNS, docstring["raises"]
+        )
+    if docstring["examples"]:
+        _write_html_table(
+            stream, "Examples", sub_level, _EXAMPLE_COLUMNS, docstring["examples"]
+        )
+
+    members = [
+        (subc, data[subc])
+        for subc in ["classes", "functions", "methods"]
+        if len(data.get(subc, ())) > 0
+    ]
+    for subc, elements in members:
+        header = min(sub_level, 6)
+        stream.write(
+            f"<h{header}>{subc.capitalize()}</h{header}>\n<table>\n"
+            f"<tr><th>{subc.capitalize()[:-1]}</th><th>Description</th></tr>\n"
+        )
+        for element in elements:
+            member = escape(element["name"])
+            stream.write(
+                f'<tr><td><a href="#{member}">{member}</a></td>'
+                f"<td>{_cell(element['docstring']['short_description'])}</td></tr>\n"
+            )
+        stream.write("</table>\n")
+    for _, elements in members:
+        for element in elements:
+            _write_html_element(stream, element)
+
+
+def render_html(data: dict[str, Any]) -> str:
+    """Render the element tree of a module as a standalone html page.
+
+    Parameters
+    ----------
+    data : dict[str, Any]
+        The module element, as returned by its `to_dict` method
+
+    Returns
+    -------
+    str
+        The html page
+    """
+
+    stream = StringIO()
+    stream.write(
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{escape(data['name'])}</title>\n</head>\n<body>\n"
+    )
+    _write_html_element(stream, data)
+    stream.write("</body>\n</html>\n")
+    return stream.getvalue()
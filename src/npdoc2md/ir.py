@@ -0,0 +1,304 @@
+"""Serialized intermediate representation (IR) of the element trees of a build.
+
+Extracting documentation needs each module (and its dependencies) to be imported,
+or at least parsed, which is the expensive part of a build. The IR file keeps the
+result of that extraction: the element tree of every module, in the JSON schema of
+the json output format, so that markdown (or another output format) can be
+rendered again later, ex: in a slim CI container, without importing or parsing any
+source.
+
+The file is in JSON Lines: a header line with the IR and schema versions, then one
+compact line per module, with the relative path of its output files (without
+suffix) and its element tree. Files whose name ends with .gz are gzip compressed.
+"""
+
+import gzip
+import json
+from collections.abc import Iterator
+from logging import getLogger
+from pathlib import Path
+from typing import IO, Any, cast
+
+from ._version import __version__
+from .formats import (
+    FORMAT_SUFFIXES,
+    JSON_SCHEMA_VERSION,
+    render_html,
+    render_ir_module,
+    render_json,
+    validate_formats,
+)
+from .npdoc2md import (
+    ClassElement,
+    DocToMarkdownElement,
+    FunctionElement,
+    ModuleElement,
+    RenderedDocstring,
+)
+
+logger = getLogger("npdoc2md")
+
+# Version of the layout of IR files, incremented on any incompatible change.
+IR_VERSION = 1
+
+
+def _open_ir(path: Path, mode: str) -> IO[str]:
+    """Open an IR file as text, gzip compressed if its name ends with .gz."""
+
+    if path.suffix == ".gz":
+        return cast(IO[str], gzip.open(path, mode + "t", encoding="utf-8"))
+    return open(path, mode, encoding="utf-8")
+
+
+class IRWriter:
+    """Writes the element trees of modules to an IR file, one module at a time.
+
+    Attributes
+    ----------
+    path : Path
+        Path to the IR file.
+    modules : int
+        Number of modules written so far.
+    """
+
+    def __init__(self, path: Path):
+        """Create the IR file, and write its header.
+
+        Parameters
+        ----------
+        path : Path
+            Path to the IR file, gzip compressed if its name ends with .gz.
+        """
+
+        self.path = path
+        self.modules = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = _open_ir(path, "w")
+        self._write(
+            {
+                "ir_version": IR_VERSION,
+                "schema_version": JSON_SCHEMA_VERSION,
+                "npdoc2md_version": __version__,
+            }
+        )
+
+    def _write(self, data: dict[str, Any]) -> None:
+        """Write one compact JSON line."""
+
+        self._file.write(json.dumps(data, separators=(",", ":")) + "\n")
+
+    def add(self, relative_path: str, data: dict[str, Any]) -> None:
+        """Write the element tree of a module.
+
+        Parameters
+        ----------
+        relative_path : str
+            Path of the module's output files relative to the output directory,
+            without suffix, ex: mypackage/module
+        data : dict[str, Any]
+            The module element, as returned by its `to_dict` method
+        """
+
+        self.add_rendered(relative_path, render_ir_module(data))
+
+    def add_rendered(self, relative_path: str, text: str) -> None:
+        """Write the element tree of a module, already rendered in the ir format.
+
+        Parameters
+        ----------
+        relative_path : str
+            Path of the module's output files relative to the output directory,
+            without suffix, ex: mypackage/module
+        text : str
+            The module element, as rendered by `render_ir_module`
+        """
+
+        self._file.write(f'{{"path":{json.dumps(relative_path)},"module":{text}}}\n')
+        self.modules += 1
+
+    def close(self) -> None:
+        """Close the IR file."""
+
+        self._file.close()
+        logger.info(
+            "Wrote the element trees of %d modules to %s", self.modules, self.path
+        )
+
+    def __enter__(self) -> "IRWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def iter_ir(path: Path) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Read the element trees of the modules stored in an IR file.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the IR file
+
+    Yields
+    ------
+    tuple[str, dict[str, Any]]
+        Relative output path (without suffix) and element tree of each module
+
+    Raises
+    ------
+    ValueError
+        If the file is not an IR file, or was written with an incompatible
+        version of npdoc2md.
+    """
+
+    with _open_ir(path, "r") as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or "ir_version" not in header:
+            raise ValueError(f"{path} is not an npdoc2md IR file.")
+        if (
+            header["ir_version"] != IR_VERSION
+            or header.get("schema_version") != JSON_SCHEMA_VERSION
+        ):
+            raise ValueError(
+                f"{path} was written by npdoc2md {header.get('npdoc2md_version')} "
+                f"with IR version {header['ir_version']}, expected {IR_VERSION}."
+            )
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry["path"], entry["module"]
+
+
+def element_from_dict(data: dict[str, Any]) -> DocToMarkdownElement:
+    """Rebuild an element, and its sub-elements, from its JSON serializable form.
+
+    Parameters
+    ----------
+    data : dict[str, Any]
+        The element, as returned by its `to_dict` method
+
+    Returns
+    -------
+    DocToMarkdownElement
+        The element, rendering the same markdown as the original one
+
+    Raises
+    ------
+    ValueError
+        If the kind of the element is unknown.
+    """
+
+    kind = data["kind"]
+    if kind == "module":
+        return ModuleElement.from_parts(
+            name=data["name"],
+            docstring=RenderedDocstring.from_dict(data["docstring"]),
+            classes=[_class_from_dict(element) for element in data["classes"]],
+            functions=[_function_from_dict(element) for element in data["functions"]],
+        )
+    if kind == "class":
+        return _class_from_dict(data)
+    if kind == "function":
+        return _function_from_dict(data)
+    raise ValueError(f"Unknown element kind '{kind}'.")
+
+
+def _class_from_dict(data: dict[str, Any]) -> ClassElement:
+    """Rebuild a class element, and its methods, from its JSON serializable form."""
+
+    return ClassElement.from_parts(
+        name=data["name"],
+        signature=data["signature"],
+        docstring=RenderedDocstring.from_dict(data["docstring"]),
+        methods=[_function_from_dict(element) for element in data["methods"]],
+    )
+
+
+def _function_from_dict(data: dict[str, Any]) -> FunctionElement:
+    """Rebuild a function element from its JSON serializable form."""
+
+    return FunctionElement(
+        name=data["name"],
+        signature=data["signature"],
+        docstring=RenderedDocstring.from_dict(data["docstring"]),
+        level=data["level"],
+    )
+
+
+def render_ir(
+    ir_path: Path, output_path: Path, formats: tuple[str, ...] = ("md",)
+) -> Iterator[tuple[Path, str]]:
+    """Render the modules stored in an IR file, without importing or parsing them.
+
+    Parameters
+    ----------
+    ir_path : Path
+        Path to the IR file
+    output_path : Path
+        Path to the output directory where the files would be saved
+    formats : tuple[str, ...], default=("md",)
+        Output formats to generate for each module, among "md", "json" and "html"
+
+    Yields
+    ------
+    tuple[Path, str]
+        Output file path and generated content, for each module in the order of
+        the IR file, and for each of its formats in the given order
+
+    Raises
+    ------
+    ValueError
+        If the IR file cannot be read, or if an output format is unknown.
+    """
+
+    validate_formats(formats)
+    for relative_path, data in iter_ir(ir_path):
+        if Path(relative_path).is_absolute() or ".." in Path(relative_path).parts:
+            raise ValueError(f"Invalid output path '{relative_path}' in {ir_path}.")
+        output_file = output_path / relative_path
+        for output_format in formats:
+            if output_format == "md":
+                text = element_from_dict(data).__repr__()
+            elif output_format == "json":
+                text = render_json(data)
+            else:
+                text = render_html(data)
+            yield output_file.with_suffix(FORMAT_SUFFIXES[output_format]), text
+
+
+def merge_ir(ir_paths: list[Path], output_ir: Path) -> int:
+    """Combine the IR files of several shards of a build into one.
+
+    Parameters
+    ----------
+    ir_paths : list[Path]
+        IR files written by the shards
+    output_ir : Path
+        Path to the combined IR file, gzip compressed if its name ends with .gz
+
+    Returns
+    -------
+    int
+        Number of modules in the combined IR file
+
+    Raises
+    ------
+    ValueError
+        If an IR file cannot be read, or if a module is held by several of them.
+    """
+
+    seen: set[str] = set()
+    with IRWriter(output_ir) as ir_writer:
+        for ir_path in ir_paths:
+            for relative_path, data in iter_ir(ir_path):
+                if relative_path in seen:
+                    raise ValueError(
+                        f"Module '{relative_path}' is in several IR files, "
+                        f"including {ir_path}."
+                    )
+                seen.add(relative_path)
+                ir_writer.add(relative_path, data)
+        return ir_writer.modules
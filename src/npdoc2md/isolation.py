@@ -0,0 +1,377 @@
+"""Isolated execution of conversions in recyclable subprocess workers.
+
+With the import engine, every documented module is imported into the converting
+process and stays in `sys.modules`. Converting in worker subprocesses keeps the main
+process free of target modules, and allows:
+
+- killing a worker whose module takes longer than a timeout to import and convert,
+  reporting that module instead of stalling the whole build,
+- recycling workers after a number of modules, or once their resident memory
+  exceeds a ceiling, so that memory use stays bounded on large packages.
+"""
+
+import multiprocessing
+import multiprocessing.connection
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from logging import getLogger
+from pathlib import Path
+from typing import Any
+
+from ._log import configure_worker_logging, get_worker_logging
+from .memo import DEFAULT_MAX_ENTRIES
+from .mock import install_mock_imports
+from .npdoc2md import (
+    _convert_source_file_profiled,
+    configure_docstring_cache,
+    convert_source_file_to_formats,
+)
+from .profiling import Profiler
+from .utils import get_registered_type_replacements, register_type_replacements
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = getLogger("npdoc2md")
+
+
+def _current_rss_bytes() -> int | None:
+    """Get the resident set size of the current process.
+
+    Returns
+    -------
+    int | None
+        Current RSS in bytes on Linux, peak RSS on other Unix platforms, or None if
+        it cannot be determined.
+    """
+
+    if resource is None:
+        return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, AttributeError, IndexError, ValueError):
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS, and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _worker_main(
+    conn: multiprocessing.connection.Connection,
+    convert_kwargs: dict[str, Any],
+    type_replacements: dict[tuple[str, str], str],
+    mock_imports: list[str] | None,
+    profile: bool,
+    docstring_cache_size: int = DEFAULT_MAX_ENTRIES,
+    docstring_cache_dir: Path | None = None,
+    logging_config: tuple[int, str] | None = None,
+) -> None:
+    """Convert the source files received on a connection until told to stop.
+
+    Parameters
+    ----------
+    conn : multiprocessing.connection.Connection
+        Connection to the parent process. Receives source file paths (None to
+        stop), and sends back a (status, outputs or error, profile, rss) tuple.
+    convert_kwargs : dict[str, Any]
+        Keyword arguments passed on to convert_source_file_to_formats.
+    type_replacements : dict[tuple[str, str], str]
+        Type replacements registered in the parent process.
+    mock_imports : list[str], optional
+        Glob patterns of module names to serve stub modules for.
+    profile : bool
+        Whether to profile conversions and send back the profiler data.
+    docstring_cache_size : int, default=DEFAULT_MAX_ENTRIES
+        Maximum number of parsed docstrings kept in memory.
+    docstring_cache_dir : Path, optional
+        Directory holding the store of parsed docstrings shared across processes.
+    logging_config : tuple[int, str], optional
+        Log level and format of the parent process, if it logs to stderr.
+    """
+
+    if logging_config is not None:
+        configure_worker_logging(*logging_config)
+    register_type_replacements(type_replacements)
+    install_mock_imports(mock_imports)
+    configure_docstring_cache(docstring_cache_size, docstring_cache_dir)
+    while True:
+        try:
+            src_file = conn.recv()
+        except EOFError:
+            return
+        if src_file is None:
+            return
+
+        try:
+            if profile:
+                outputs, snapshot = _convert_source_file_profiled(
+                    src_file, **convert_kwargs
+                )
+            else:
+                outputs, snapshot = (
+                    convert_source_file_to_formats(src_file, **convert_kwargs),
+                    None,
+                )
+            conn.send(("ok", outputs, snapshot, _current_rss_bytes()))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", None, _current_rss_bytes()))
+
+
+class _Worker:
+    """A worker subprocess, and the task it is currently running."""
+
+    def __init__(
+        self,
+        context: Any,
+        convert_kwargs: dict[str, Any],
+        mock_imports: list[str] | None,
+        profile: bool,
+        docstring_cache_size: int,
+        docstring_cache_dir: Path | None,
+    ):
+        """Start the worker subprocess."""
+
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                convert_kwargs,
+                get_registered_type_replacements(),
+                mock_imports,
+                profile,
+                docstring_cache_size,
+                docstring_cache_dir,
+                get_worker_logging(),
+            ),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks_done = 0
+        # Index of the source file being converted, only meaningful while busy.
+        self.index = -1
+        self.deadline: float | None = None
+
+    def submit(self, index: int, src_file: Path, timeout: float | None) -> None:
+        """Send a source file to convert, starting its timeout."""
+
+        self.index = index
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.conn.send(src_file)
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        """Kill the worker if it is still running, and close its connection."""
+
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class IsolatedWorkerPool:
+    """Pool of subprocess workers converting source files with timeouts.
+
+    Attributes
+    ----------
+    jobs : int
+        Maximum number of worker processes running at once.
+    timeout : float | None
+        Maximum time a single source file may take to convert, in seconds.
+    max_modules_per_worker : int | None
+        Number of modules after which a worker is replaced by a fresh one.
+    max_worker_rss : int | None
+        Resident memory, in bytes, above which a worker is replaced by a fresh one.
+    timed_out : list[Path]
+        Source files whose conversion timed out.
+    failed : dict[Path, str]
+        Source files whose conversion failed, with the error.
+    """
+
+    def __init__(
+        self,
+        convert_kwargs: dict[str, Any],
+        jobs: int = 1,
+        timeout: float | None = None,
+        max_modules_per_worker: int | None = None,
+        max_worker_rss: int | None = None,
+        mock_imports: list[str] | None = None,
+        profiler: Profiler | None = None,
+        docstring_cache_size: int = DEFAULT_MAX_ENTRIES,
+        docstring_cache_dir: Path | None = None,
+    ):
+        """Initialize the pool. Workers are started when needed.
+
+        Parameters
+        ----------
+        convert_kwargs : dict[str, Any]
+            Keyword arguments passed on to convert_source_file_to_formats.
+        jobs : int, default=1
+            Maximum number of worker processes running at once.
+        timeout : float, optional
+            Maximum time a single source file may take to convert, in seconds.
+        max_modules_per_worker : int, optional
+            Number of modules after which a worker is replaced by a fresh one.
+        max_worker_rss : int, optional
+            Resident memory, in bytes, above which a worker is replaced.
+        mock_imports : list[str], optional
+            Glob patterns of module names to serve stub modules for in the workers.
+        profiler : Profiler, optional
+            Profiler the data collected by the workers is merged into.
+        docstring_cache_size : int, default=DEFAULT_MAX_ENTRIES
+            Maximum number of parsed docstrings kept in memory by each worker.
+        docstring_cache_dir : Path, optional
+            Directory holding the store of parsed docstrings shared by the workers.
+        """
+
+        self.convert_kwargs = convert_kwargs
+        self.jobs = jobs
+        self.timeout = timeout
+        self.max_modules_per_worker = max_modules_per_worker
+        self.max_worker_rss = max_worker_rss
+        self.mock_imports = mock_imports
+        self.profiler = profiler
+        self.docstring_cache_size = docstring_cache_size
+        self.docstring_cache_dir = docstring_cache_dir
+        self.timed_out: list[Path] = []
+        self.failed: dict[Path, str] = {}
+        # Spawned workers start without the parent's imported modules and threads.
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: list[_Worker] = []
+
+    def _should_recycle(self, worker: _Worker, rss: int | None) -> bool:
+        """Check whether a worker reached its module count or memory limit."""
+
+        if (
+            self.max_modules_per_worker is not None
+            and worker.tasks_done >= self.max_modules_per_worker
+        ):
+            logger.debug("Recycling worker after %d modules", worker.tasks_done)
+            return True
+        if self.max_worker_rss is not None and rss is not None:
+            if rss > self.max_worker_rss:
+                logger.debug("Recycling worker using %.0f MB", rss / 2**20)
+                return True
+        return False
+
+    def map(self, src_files: list[Path]) -> Iterator[dict[str, str] | None]:
+        """Convert source files, yielding their generated content in order.
+
+        Parameters
+        ----------
+        src_files : list[Path]
+            Paths to the source files to convert.
+
+        Yields
+        ------
+        dict[str, str] | None
+            Generated content of each source file by format, or None if its
+            conversion failed or timed out.
+        """
+
+        pending = deque(enumerate(src_files))
+        results: dict[int, dict[str, str] | None] = {}
+        idle: list[_Worker] = []
+        busy: list[_Worker] = []
+        next_index = 0
+
+        def finish(
+            worker: _Worker, outputs: dict[str, str] | None, recycle: bool
+        ) -> None:
+            results[worker.index] = outputs
+            busy.remove(worker)
+            if recycle:
+                worker.stop()
+                self._workers.remove(worker)
+            else:
+                idle.append(worker)
+
+        while next_index < len(src_files):
+            if next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+                continue
+
+            while pending and (idle or len(self._workers) < self.jobs):
+                if idle:
+                    worker = idle.pop()
+                else:
+                    worker = _Worker(
+                        self._context,
+                        self.convert_kwargs,
+                        self.mock_imports,
+                        self.profiler is not None,
+                        self.docstring_cache_size,
+                        self.docstring_cache_dir,
+                    )
+                    self._workers.append(worker)
+                index, src_file = pending.popleft()
+                worker.submit(index, src_file, self.timeout)
+                busy.append(worker)
+
+            deadlines = [w.deadline for w in busy if w.deadline is not None]
+            wait_timeout = (
+                max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+            )
+            ready = multiprocessing.connection.wait(
+                [worker.conn for worker in busy], wait_timeout
+            )
+
+            for worker in list(busy):
+                src_file = src_files[worker.index]
+                if worker.conn in ready:
+                    try:
+                        status, payload, snapshot, rss = worker.conn.recv()
+                    except (EOFError, OSError):
+                        worker.process.join(timeout=1)
+                        error = f"worker exited with code {worker.process.exitcode}"
+                        logger.error("Failed to convert %s: %s", src_file, error)
+                        self.failed[src_file] = error
+                        finish(worker, None, recycle=True)
+                        continue
+
+                    worker.tasks_done += 1
+                    if snapshot is not None and self.profiler is not None:
+                        self.profiler.merge(snapshot)
+                    if status == "ok":
+                        outputs = payload
+                    else:
+                        logger.error("Failed to convert %s: %s", src_file, payload)
+                        self.failed[src_file] = payload
+                        outputs = None
+                    finish(worker, outputs, self._should_recycle(worker, rss))
+                elif (
+                    worker.deadline is not None and time.monotonic() >= worker.deadline
+                ):
+                    logger.error(
+                        "Timed out converting %s after %s seconds",
+                        src_file,
+                        self.timeout,
+                    )
+                    self.timed_out.append(src_file)
+                    worker.kill()
+                    busy.remove(worker)
+                    self._workers.remove(worker)
+                    results[worker.index] = None
+
+    def close(self) -> None:
+        """Stop all the workers."""
+
+        for worker in self._workers:
+            worker.stop()
+        self._workers.clear()
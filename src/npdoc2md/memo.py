@@ -0,0 +1,317 @@
+"""Content-addressed memoization of parsed docstrings.
+
+Docstrings repeat a lot: inherited and overridden methods, generated modules and
+templated code share the same text across many members. Parsed docstrings are
+memoized by their text in a bounded in-memory LRU, optionally backed by an sqlite
+store on disk, keyed by the sha256 of the text, which is shared across runs and
+between worker processes. The disk store is cleared whenever the npdoc2md or
+docstring_parser version changes, since either can change the parsed result.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Callable
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from ._version import __version__
+
+# sqlite3 is only imported once a disk store is used.
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = getLogger("npdoc2md")
+
+DOCSTRING_STORE_FILE_NAME = ".npdoc2md-docstrings.sqlite"
+
+# Default number of parsed docstrings kept in memory.
+DEFAULT_MAX_ENTRIES = 4096
+
+# Number of parsed docstrings written to the disk store in one transaction.
+_WRITE_BATCH_SIZE = 512
+
+ValueT = TypeVar("ValueT")
+
+
+def _store_version() -> str:
+    """Get the version of the parsing code, stored alongside the parsed docstrings.
+
+    Returns
+    -------
+    str
+        The npdoc2md and docstring_parser versions.
+    """
+
+    # importlib.metadata is slow to import, and only needed with a disk store.
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        parser_version = version("docstring_parser")
+    except PackageNotFoundError:
+        parser_version = "unknown"
+    return f"npdoc2md {__version__}, docstring_parser {parser_version}"
+
+
+class DocstringCache(Generic[ValueT]):
+    """Two-tier cache of values computed from docstring texts.
+
+    Attributes
+    ----------
+    max_entries : int
+        Maximum number of values kept in memory, least recently used first out.
+        With 0, nothing is kept in memory.
+    cache_dir : Path or None
+        Directory holding the disk store, if any.
+    path : Path or None
+        Path to the sqlite store holding the encoded values on disk, if any.
+    hits : int
+        Number of lookups answered from memory.
+    disk_hits : int
+        Number of lookups answered from the disk store.
+    misses : int
+        Number of lookups for which the value had to be computed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: Path | None = None,
+        encode: Callable[[ValueT], Any] | None = None,
+        decode: Callable[[Any], ValueT] | None = None,
+    ):
+        """Initialize an empty cache. The disk store is opened on first use.
+
+        Parameters
+        ----------
+        max_entries : int, default=DEFAULT_MAX_ENTRIES
+            Maximum number of values kept in memory.
+        cache_dir : Path, optional
+            Directory holding the disk store. If not given, values are only
+            memoized in memory.
+        encode : Callable[[ValueT], Any], optional
+            Function converting a value to JSON serializable data, for the disk
+            store. Required with cache_dir.
+        decode : Callable[[Any], ValueT], optional
+            Function converting data read from the disk store back to a value.
+            Required with cache_dir.
+
+        Raises
+        ------
+        ValueError
+            If max_entries is negative, or if cache_dir is given without encode
+            and decode functions.
+        """
+
+        if max_entries < 0:
+            raise ValueError(f"Cache size must not be negative, got {max_entries}.")
+        if cache_dir is not None and (encode is None or decode is None):
+            raise ValueError("A disk store requires encode and decode functions.")
+
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.path = None if cache_dir is None else cache_dir / DOCSTRING_STORE_FILE_NAME
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._encode = encode
+        self._decode = decode
+        self._entries: OrderedDict[str, ValueT] = OrderedDict()
+        self._pending: list[tuple[str, str]] = []
+        self._connection: sqlite3.Connection | None = None
+        # Process the connection was opened in, forked workers open their own.
+        self._pid: int | None = None
+
+    @property
+    def lookups(self) -> int:
+        """Total number of lookups since the statistics were last reset."""
+        return self.hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from memory or disk, 0.0 without lookups."""
+        lookups = self.lookups
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def reset_stats(self) -> None:
+        """Reset the hit and miss counters, keeping the cached values."""
+        self.hits = self.disk_hits = self.misses = 0
+
+    def get(self, text: str, compute: Callable[[str], ValueT]) -> ValueT:
+        """Get the value computed from a docstring text, computing it if needed.
+
+        Parameters
+        ----------
+        text : str
+            The docstring text
+        compute : Callable[[str], ValueT]
+            Function computing the value from the text, on a miss.
+
+        Returns
+        -------
+        ValueT
+            The value, which may be shared with other callers and must not be
+            modified.
+        """
+
+        value = self._entries.get(text)
+        if value is not None:
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return value
+
+        key = None
+        connection = self._connect()
+        if connection is not None:
+            key = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+            value = self._load(connection, key)
+
+        if value is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            value = compute(text)
+            if key is not None:
+                assert self._encode is not None
+                self._pending.append((key, json.dumps(self._encode(value))))
+                if len(self._pending) >= _WRITE_BATCH_SIZE:
+                    self.flush()
+
+        if self.max_entries > 0:
+            self._entries[text] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def flush(self) -> None:
+        """Write the values computed since the last flush to the disk store."""
+
+        if not self._pending:
+            return
+        import sqlite3
+
+        connection = self._connect()
+        if connection is None:
+            self._pending.clear()
+            return
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO docstrings (key, value) VALUES (?, ?)",
+                    self._pending,
+                )
+        except sqlite3.Error as e:
+            self._disable(e)
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Flush pending values and close the disk store, if open."""
+
+        self.flush()
+        if self._connection is not None:
+            if self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> "sqlite3.Connection | None":
+        """Open the disk store on first use in this process.
+
+        Returns
+        -------
+        sqlite3.Connection | None
+            Connection to the disk store, or None if there is none.
+        """
+
+        if self.path is None:
+            return None
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        import sqlite3
+
+        self._pid = os.getpid()
+        self._connection = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Worker processes write to the same store concurrently.
+            connection = sqlite3.connect(self.path, timeout=30)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                with connection:
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"  # noqa: E501
+                    )
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS docstrings (key TEXT PRIMARY KEY, value TEXT)"  # noqa: E501
+                    )
+                    row = connection.execute(
+                        "SELECT value FROM meta WHERE key = 'version'"
+                    ).fetchone()
+                    store_version = _store_version()
+                    if row is None or row[0] != store_version:
+                        logger.debug("Clearing outdated docstring store %s", self.path)
+                        connection.execute("DELETE FROM docstrings")
+                        connection.execute(
+                            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                            ("version", store_version),
+                        )
+            except sqlite3.Error:
+                connection.close()
+                raise
+        except (OSError, sqlite3.Error) as e:
+            self._disable(e)
+            return None
+        self._connection = connection
+        return connection
+
+    def _load(self, connection: "sqlite3.Connection", key: str) -> ValueT | None:
+        """Read a value from the disk store.
+
+        Parameters
+        ----------
+        connection : sqlite3.Connection
+            Connection to the disk store
+        key : str
+            Hash of the docstring text
+
+        Returns
+        -------
+        ValueT | None
+            The decoded value, or None if it is not in the store.
+        """
+
+        import sqlite3
+
+        try:
+            row = connection.execute(
+                "SELECT value FROM docstrings WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+        if row is None:
+            return None
+        try:
+            assert self._decode is not None
+            return self._decode(json.loads(row[0]))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug("Ignoring unreadable docstring store entry %s: %s", key, e)
+            return None
+
+    def _disable(self, error: Exception) -> None:
+        """Stop using the disk store after an error, keeping the memory tier.
+
+        Parameters
+        ----------
+        error : Exception
+            The error raised by the disk store
+        """
+
+        logger.warning("Disabling docstring store %s: %s", self.path, error)
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._pending.clear()
+        self.cache_dir = self.path = None
@@ -0,0 +1,203 @@
+"""Lightweight stand-ins for dependencies of documented modules.
+
+Documenting a module with the import engine requires importing it, along with all
+of its dependencies. For missing or heavy dependencies (ex: large C extensions), a
+finder can be installed on `sys.meta_path` which serves stub modules for names
+matching glob patterns instead. Any attribute of a stub module is a mock object,
+which can be called, subscripted, used as a decorator, or subclassed. Classes
+deriving from a mock object get a stub base class carrying the mocked name, so that
+their bases still render correctly.
+"""
+
+import sys
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from logging import getLogger
+from types import ModuleType
+from typing import Any
+
+logger = getLogger("npdoc2md")
+
+
+def _is_dunder(name: str) -> bool:
+    """Check whether a name is a special (double underscore) name."""
+    return name.startswith("__") and name.endswith("__")
+
+
+class _MockObject:
+    """Stand-in for any object of a mocked module.
+
+    Attributes
+    ----------
+    _mock_name : str
+        Fully qualified name of the mocked object, ex: torch.nn.Module.
+    """
+
+    def __init__(self, name: str):
+        """Initialize the mock object.
+
+        Parameters
+        ----------
+        name : str
+            Fully qualified name of the mocked object.
+        """
+
+        self._mock_name = name
+        self._mock_class: type | None = None
+
+    def __getattr__(self, name: str) -> "_MockObject":
+        if _is_dunder(name):
+            raise AttributeError(name)
+        attr = _MockObject(f"{self._mock_name}.{name}")
+        setattr(self, name, attr)
+        return attr
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        # Used as a bare decorator, keep the decorated object documented as is.
+        if len(args) == 1 and not kwargs and callable(args[0]):
+            return args[0]
+        return _MockObject(self._mock_name)
+
+    def __getitem__(self, key: Any) -> "_MockObject":
+        return _MockObject(self._mock_name)
+
+    def __or__(self, other: Any) -> "_MockObject":
+        return _MockObject(self._mock_name)
+
+    __ror__ = __or__
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(())
+
+    def __mro_entries__(self, bases: tuple[Any, ...]) -> tuple[type]:
+        # Subclassing a mock object derives from a stub class with the mocked name.
+        if self._mock_class is None:
+            module, _, name = self._mock_name.rpartition(".")
+            self._mock_class = type(
+                name, (), {"__module__": module, "__qualname__": name}
+            )
+        return (self._mock_class,)
+
+    def __repr__(self) -> str:
+        return self._mock_name
+
+
+class MockModule(ModuleType):
+    """Stub module whose attributes are all mock objects."""
+
+    __all__: list[str] = []
+
+    def __getattr__(self, name: str) -> _MockObject:
+        if _is_dunder(name):
+            raise AttributeError(name)
+        attr = _MockObject(f"{self.__name__}.{name}")
+        setattr(self, name, attr)
+        return attr
+
+
+class MockImportFinder(MetaPathFinder, Loader):
+    """Finder serving stub modules for names matching glob patterns.
+
+    A module is mocked if its name, or the name of any of its parent packages,
+    matches one of the patterns.
+
+    Attributes
+    ----------
+    patterns : tuple[str, ...]
+        Glob patterns of the module names to mock, ex: torch, google.cloud.*
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """Initialize the finder.
+
+        Parameters
+        ----------
+        patterns : Iterable[str]
+            Glob patterns of the module names to mock.
+        """
+
+        self.patterns = tuple(patterns)
+
+    def matches(self, fullname: str) -> bool:
+        """Check whether a module is mocked.
+
+        Parameters
+        ----------
+        fullname : str
+            Fully qualified name of the module.
+
+        Returns
+        -------
+        bool
+            True if the module or one of its parent packages matches a pattern.
+        """
+
+        parts = fullname.split(".")
+        return any(
+            fnmatchcase(".".join(parts[:depth]), pattern)
+            for depth in range(1, len(parts) + 1)
+            for pattern in self.patterns
+        )
+
+    def find_spec(
+        self, fullname: str, path: Any = None, target: Any = None
+    ) -> ModuleSpec | None:
+        """Get the spec of a stub module, if the module is mocked."""
+
+        if not self.matches(fullname):
+            return None
+        logger.debug("Mocking import of module %s", fullname)
+        return ModuleSpec(fullname, self, origin="mocked by npdoc2md", is_package=True)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType:
+        """Create a stub module."""
+        return MockModule(spec.name)
+
+    def exec_module(self, module: ModuleType) -> None:
+        """Stub modules have no code to execute."""
+
+
+@contextmanager
+def mocked_imports(patterns: Iterable[str] | None) -> Iterator[None]:
+    """Context manager serving stub modules for the given module name patterns.
+
+    Modules matching the patterns that are already imported are left as is. Stub
+    modules are removed from sys.modules on exit.
+
+    Parameters
+    ----------
+    patterns : Iterable[str], optional
+        Glob patterns of the module names to mock. Nothing is mocked if empty.
+    """
+
+    if not patterns:
+        yield
+        return
+
+    finder = MockImportFinder(patterns)
+    sys.meta_path.insert(0, finder)
+    try:
+        yield
+    finally:
+        sys.meta_path.remove(finder)
+        for name, module in list(sys.modules.items()):
+            if isinstance(module, MockModule) and finder.matches(name):
+                del sys.modules[name]
+
+
+def install_mock_imports(patterns: Iterable[str] | None) -> None:
+    """Serve stub modules for the given module name patterns, for the process lifetime.
+
+    Used to initialize worker processes.
+
+    Parameters
+    ----------
+    patterns : Iterable[str], optional
+        Glob patterns of the module names to mock. Nothing is mocked if empty.
+    """
+
+    if patterns:
+        sys.meta_path.insert(0, MockImportFinder(patterns))
@@ -8,52 +8,321 @@ This module defines the main functionality for the npdoc2md package, which inclu
 
 # Some standard lib imports
 import importlib
-import inspect
 import logging
+import sys
+import time
+from collections.abc import Callable, Generator, Iterator, Sequence
+from functools import partial
+from io import StringIO
 from pathlib import Path
 from types import ModuleType
-from typing import Protocol, TypeVar, runtime_checkable
-
-# Import typing to use python3 typing features
-from docstring_parser import (
-    Docstring,
-    DocstringDeprecated,
-    DocstringMeta,
-    DocstringParam,
-    DocstringRaises,
-    DocstringReturns,
-    Style,
-    parse,
+from typing import IO, TYPE_CHECKING, Any, Protocol, TypeVar, runtime_checkable
+from weakref import WeakKeyDictionary
+
+from ._log import configure_worker_logging, get_worker_logging
+from .constants import ENGINES
+from .discovery import iter_python_files
+from .memo import DEFAULT_MAX_ENTRIES, DocstringCache
+from .profiling import (
+    Profiler,
+    get_active_profiler,
+    profile_phase,
+    profiling,
+    record_class,
+    record_module,
 )
-from docstring_parser.common import DocstringExample
-
 from .utils import (
     get_cls_and_func_defined_in_module,
+    get_registered_type_replacements,
     get_target_output_file_path,
+    register_type_replacements,
     sanitize_signature,
 )
 
+# docstring_parser, inspect and the modules only needed by a conversion are imported
+# where they are used, so that importing the package (ex: for `npdoc2md --version`)
+# does not import them.
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from docstring_parser import (
+        Docstring,
+        DocstringMeta,
+        DocstringParam,
+        DocstringRaises,
+        DocstringReturns,
+    )
+    from docstring_parser.common import DocstringExample
+
+    from .isolation import IsolatedWorkerPool
+
 logger = logging.getLogger("npdoc2md")
 
 
+class ConversionError(Exception):
+    """Raised once a build is done, if isolated workers dropped some modules.
+
+    Attributes
+    ----------
+    failed : dict[Path, str]
+        Source files that failed or timed out, with the reason
+    """
+
+    def __init__(self, failed: dict[Path, str]):
+        """Initialize the error from the dropped source files and their reasons."""
+
+        self.failed = failed
+        super().__init__(
+            f"{len(failed)} files could not be converted and were skipped: "
+            + ", ".join(f"{src_file} ({reason})" for src_file, reason in failed.items())
+        )
+
+
+def _intern_optional(name: str | None) -> str | None:
+    """Helper function to intern a type or argument name, if there is one
+
+    Parameters
+    ----------
+    name : str | None
+        The name to intern
+
+    Returns
+    -------
+    str | None
+        The interned name, or None
+    """
+
+    return None if name is None else sys.intern(name)
+
+
+class RenderedDocstring:
+    """Compact form of a parsed docstring, keeping only the fields that are rendered.
+
+    Generated modules can hold tens of thousands of members, so elements do not
+    keep the full `Docstring` graph around. Empty sections share the empty tuple,
+    and type names, which repeat across members, are interned.
+
+    Attributes
+    ----------
+    short_description : str | None
+        First line of the docstring, used in the member tables
+    description : str | None
+        Full description of the element (short and long descriptions)
+    params : tuple[DocstringParam, ...]
+        Parameters (or attributes, for classes) of the element
+    returns : DocstringReturns | None
+        First return value of the element
+    raises : tuple[DocstringRaises, ...]
+        Exceptions raised by the element
+    examples : tuple[DocstringExample, ...]
+        Examples of using the element
+    """
+
+    __slots__ = (
+        "short_description",
+        "description",
+        "params",
+        "returns",
+        "raises",
+        "examples",
+    )
+
+    def __init__(
+        self,
+        short_description: str | None = None,
+        description: str | None = None,
+        params: "tuple[DocstringParam, ...]" = (),
+        returns: "DocstringReturns | None" = None,
+        raises: "tuple[DocstringRaises, ...]" = (),
+        examples: "tuple[DocstringExample, ...]" = (),
+    ):
+        """Initialize the rendered docstring from its fields.
+
+        Parameters
+        ----------
+        short_description : str, optional
+            First line of the docstring
+        description : str, optional
+            Full description of the element
+        params : tuple[DocstringParam, ...], default=()
+            Parameters (or attributes, for classes) of the element
+        returns : DocstringReturns, optional
+            First return value of the element
+        raises : tuple[DocstringRaises, ...], default=()
+            Exceptions raised by the element
+        examples : tuple[DocstringExample, ...], default=()
+            Examples of using the element
+        """
+        self.short_description = short_description
+        self.description = description
+        self.params = params
+        self.returns = returns
+        self.raises = raises
+        self.examples = examples
+
+    @classmethod
+    def from_docstring(cls, docstring: "Docstring") -> "RenderedDocstring":
+        """Extract the rendered fields of a parsed docstring.
+
+        Parameters
+        ----------
+        docstring : Docstring
+            The parsed docstring
+
+        Returns
+        -------
+        RenderedDocstring
+            The compact docstring
+        """
+
+        from docstring_parser import DocstringParam, DocstringRaises, DocstringReturns
+        from docstring_parser.common import DocstringExample
+
+        # Metas are copied rather than trimmed in place, since the parsed docstring
+        # may be shared. The raw section arguments (ex: ["param", "x"]) are never
+        # rendered, so they are dropped.
+        params = tuple(
+            DocstringParam(
+                args=[],
+                description=param.description,
+                arg_name=sys.intern(param.arg_name),
+                type_name=_intern_optional(param.type_name),
+                is_optional=param.is_optional,
+                default=param.default,
+            )
+            for param in docstring.params
+        )
+        returns = docstring.returns
+        if returns is not None:
+            returns = DocstringReturns(
+                args=[],
+                description=returns.description,
+                type_name=_intern_optional(returns.type_name),
+                is_generator=returns.is_generator,
+                return_name=returns.return_name,
+            )
+        raises = tuple(
+            DocstringRaises(
+                args=[],
+                description=raises.description,
+                type_name=_intern_optional(raises.type_name),
+            )
+            for raises in docstring.raises
+        )
+        examples = tuple(
+            DocstringExample(
+                args=[], snippet=example.snippet, description=example.description
+            )
+            for example in docstring.examples
+        )
+        return cls(
+            short_description=docstring.short_description,
+            description=docstring.description,
+            params=params,
+            returns=returns,
+            raises=raises,
+            examples=examples,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the rendered docstring to JSON serializable data.
+
+        Returns
+        -------
+        dict[str, Any]
+            The rendered fields, with each docstring meta as a dictionary
+        """
+
+        returns = self.returns
+        return {
+            "short_description": self.short_description,
+            "description": self.description,
+            "params": [
+                {
+                    "arg_name": param.arg_name,
+                    "type_name": param.type_name,
+                    "is_optional": param.is_optional,
+                    "default": param.default,
+                    "description": param.description,
+                }
+                for param in self.params
+            ],
+            "returns": None
+            if returns is None
+            else {
+                "type_name": returns.type_name,
+                "return_name": returns.return_name,
+                "is_generator": returns.is_generator,
+                "description": returns.description,
+            },
+            "raises": [
+                {"type_name": raises.type_name, "description": raises.description}
+                for raises in self.raises
+            ],
+            "examples": [
+                {"snippet": example.snippet, "description": example.description}
+                for example in self.examples
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RenderedDocstring":
+        """Build a rendered docstring from the output of `to_dict`.
+
+        Parameters
+        ----------
+        data : dict[str, Any]
+            The rendered fields, with each docstring meta as a dictionary
+
+        Returns
+        -------
+        RenderedDocstring
+            The compact docstring
+        """
+
+        from docstring_parser import DocstringParam, DocstringRaises, DocstringReturns
+        from docstring_parser.common import DocstringExample
+
+        returns = data["returns"]
+        return cls(
+            short_description=data["short_description"],
+            description=data["description"],
+            params=tuple(DocstringParam(args=[], **param) for param in data["params"]),
+            returns=None if returns is None else DocstringReturns(args=[], **returns),
+            raises=tuple(
+                DocstringRaises(args=[], **raises) for raises in data["raises"]
+            ),
+            examples=tuple(
+                DocstringExample(args=[], **example) for example in data["examples"]
+            ),
+        )
+
+
 @runtime_checkable
 class DocToMarkdownElementProtocol(Protocol):
+    __slots__ = ()
+
     name: str
-    docstring: Docstring
+    docstring: RenderedDocstring
     signature: str | None
     level: int
 
 
-TableItem = DocstringMeta | DocToMarkdownElementProtocol
+if TYPE_CHECKING:
+    TableItem = DocstringMeta | DocToMarkdownElementProtocol
 
-TableItemT = TypeVar("TableItemT", bound=TableItem)
+TableItemT = TypeVar("TableItemT", bound="TableItem")
 
 
-def docstring_metas_to_md_table(name: str, level: int, meta: list[TableItemT]) -> str:
-    """Helper function to convert docstring meta to markdown table
+def write_docstring_metas_md_table(
+    stream: IO[str], name: str, level: int, meta: Sequence[TableItemT]
+) -> None:
+    """Helper function to write docstring meta as a markdown table to a stream
 
     Parameters
     ----------
+    stream : IO[str]
+        Text stream to write the markdown table to (ex: io.StringIO, open file)
     name : str
         Name of the docstring meta (ex: Parameters, Returns, Raises)
     level : int
@@ -61,39 +330,60 @@ def docstring_metas_to_md_table(name: str, level: int, meta: list[TableItemT]) -
     meta : list[DocstringMetaT]
         List of docstring meta items to include in the table
 
-    Returns
-    -------
-    str
-        Markdown table representation of the docstring meta items
+    Raises
+    ------
+    ValueError
+        If the items in the meta list are not all of the same type
     """
 
+    from docstring_parser import (
+        DocstringDeprecated,
+        DocstringMeta,
+        DocstringParam,
+        DocstringRaises,
+        DocstringReturns,
+    )
+    from docstring_parser.common import DocstringExample
+
     if len(meta) == 0:
-        logger.warning(f"No items provided for {name} meta. Skipping table generation.")
-        return ""
+        logger.warning(
+            "No items provided for %s meta. Skipping table generation.", name
+        )
+        return
 
     meta_type = type(meta[0])
     if not all(isinstance(item, meta_type) for item in meta):
         raise ValueError("All items in meta list must be of the same type")
 
-    logger.debug(f"Generating markdown table listing {len(meta)} {name}")
+    logger.debug("Generating markdown table listing %d %s", len(meta), name)
 
     # ruff: disable[E501]
-    header = ""
     if meta_type == DocstringParam:
-        header = f"{'#' * level} {name}\n{' | '.join([name[:-1], 'Type', 'Optional', 'Default', 'Description'])}\n{' | '.join(['---'] * 5)}\n"
+        stream.write(
+            f"{'#' * level} {name}\n{' | '.join([name[:-1], 'Type', 'Optional', 'Default', 'Description'])}\n{' | '.join(['---'] * 5)}\n"
+        )
     elif meta_type == DocstringReturns:
-        header = f"{'#' * level} {name}\n{' | '.join(['Type', 'Variable Name', 'Is Generator', 'Description'])}\n{' | '.join(['---'] * 4)}\n"
+        stream.write(
+            f"{'#' * level} {name}\n{' | '.join(['Type', 'Variable Name', 'Is Generator', 'Description'])}\n{' | '.join(['---'] * 4)}\n"
+        )
     elif meta_type == DocstringRaises:
-        header = f"{'#' * level} {name}\n{' | '.join(['Error', 'Description'])}\n{' | '.join(['---'] * 2)}\n"
+        stream.write(
+            f"{'#' * level} {name}\n{' | '.join(['Error', 'Description'])}\n{' | '.join(['---'] * 2)}\n"
+        )
     elif meta_type == DocstringDeprecated:
-        header = f"{'#' * level} {name}\n{' | '.join(['Version', 'Description'])}\n{' | '.join(['---'] * 2)}\n"
+        stream.write(
+            f"{'#' * level} {name}\n{' | '.join(['Version', 'Description'])}\n{' | '.join(['---'] * 2)}\n"
+        )
     elif meta_type == DocstringExample:
-        header = f"{'#' * level} {name}\n{' | '.join(['Snippet', 'Description'])}\n{' | '.join(['---'] * 2)}\n"
+        stream.write(
+            f"{'#' * level} {name}\n{' | '.join(['Snippet', 'Description'])}\n{' | '.join(['---'] * 2)}\n"
+        )
     # Cannot use issubclass w/ DocstringElementProtocol since it's a protocol w/ non-method members
     elif isinstance(meta[0], DocToMarkdownElementProtocol):
-        header = f"{'#' * level} {name}\n{' | '.join([name[:-1], 'Description'])}\n{' | '.join(['---'] * 2)}\n"
+        stream.write(
+            f"{'#' * level} {name}\n{' | '.join([name[:-1], 'Description'])}\n{' | '.join(['---'] * 2)}\n"
+        )
 
-    table = header
     for item in meta:
         description: str = ""
         if isinstance(item, DocstringMeta):
@@ -110,21 +400,217 @@ def docstring_metas_to_md_table(name: str, level: int, meta: list[TableItemT]) -
         )  # Replace newlines in description w/ spaces
 
         if isinstance(item, DocstringParam):
-            table += f"{item.arg_name} | {item.type_name} | {item.is_optional} | {item.default if item.is_optional else 'N/A'} | {description}\n"
+            stream.write(
+                f"{item.arg_name} | {item.type_name} | {item.is_optional} | {item.default if item.is_optional else 'N/A'} | {description}\n"
+            )
         elif isinstance(item, DocstringReturns):
-            table += f"{item.type_name} | {item.return_name if item.return_name is not None else 'N/A'} | {item.is_generator} | {description}\n"
+            stream.write(
+                f"{item.type_name} | {item.return_name if item.return_name is not None else 'N/A'} | {item.is_generator} | {description}\n"
+            )
         elif isinstance(item, DocstringRaises):
-            table += f"{item.type_name} | {description}\n"
+            stream.write(f"{item.type_name} | {description}\n")
         elif isinstance(item, DocstringDeprecated):
-            table += f"{item.version} | {description}\n"
+            stream.write(f"{item.version} | {description}\n")
         elif isinstance(item, DocstringExample):
-            table += f"{item.snippet} | {description}\n"
+            stream.write(f"{item.snippet} | {description}\n")
         elif isinstance(item, DocToMarkdownElementProtocol):
-            table += f"[{item.name}](#{item.name}) | {description}\n"
+            stream.write(f"[{item.name}](#{item.name}) | {description}\n")
 
     # ruff: enable[E501]
 
-    return table
+
+def docstring_metas_to_md_table(
+    name: str, level: int, meta: Sequence[TableItemT]
+) -> str:
+    """Helper function to convert docstring meta to markdown table
+
+    Parameters
+    ----------
+    name : str
+        Name of the docstring meta (ex: Parameters, Returns, Raises)
+    level : int
+        Heading level for the markdown table
+    meta : list[DocstringMetaT]
+        List of docstring meta items to include in the table
+
+    Returns
+    -------
+    str
+        Markdown table representation of the docstring meta items
+    """
+
+    stream = StringIO()
+    write_docstring_metas_md_table(stream, name, level, meta)
+    return stream.getvalue()
+
+
+def _parse_numpydoc(text: str) -> "Docstring":
+    """Helper function parsing a docstring with the fast scanner, or docstring_parser
+
+    Parameters
+    ----------
+    text : str
+        The raw docstring text
+
+    Returns
+    -------
+    Docstring
+        The parsed docstring
+    """
+
+    from .scanner import scan_docstring
+
+    docstring = scan_docstring(text)
+    if docstring is None:
+        # The scanner gave up on an unknown kind of section
+        from docstring_parser import Style, parse
+
+        docstring = parse(text, style=Style.NUMPYDOC)
+    return docstring
+
+
+def parse_docstring(text: str) -> "Docstring":
+    """Helper function to parse a numpy-style docstring
+
+    Parameters
+    ----------
+    text : str
+        The raw docstring text
+
+    Returns
+    -------
+    Docstring
+        The parsed docstring
+    """
+
+    with profile_phase("parse"):
+        return _parse_numpydoc(text)
+
+
+def _render_parsed_docstring(text: str) -> RenderedDocstring:
+    """Helper function parsing a docstring into its compact rendered form
+
+    Parameters
+    ----------
+    text : str
+        The raw docstring text
+
+    Returns
+    -------
+    RenderedDocstring
+        The rendered fields of the parsed docstring
+    """
+
+    return RenderedDocstring.from_docstring(_parse_numpydoc(text))
+
+
+# Parsed docstrings, memoized by their text. See configure_docstring_cache.
+_docstring_cache: DocstringCache[RenderedDocstring] = DocstringCache()
+
+
+def configure_docstring_cache(
+    max_entries: int = DEFAULT_MAX_ENTRIES, cache_dir: Path | None = None
+) -> DocstringCache[RenderedDocstring]:
+    """Configure the memoization of parsed docstrings in the current process.
+
+    The current cache is kept, along with its memoized docstrings, if its
+    configuration is unchanged.
+
+    Parameters
+    ----------
+    max_entries : int, default=DEFAULT_MAX_ENTRIES
+        Maximum number of parsed docstrings kept in memory, 0 to disable.
+    cache_dir : Path, optional
+        Directory holding a store of parsed docstrings on disk, shared across runs.
+
+    Returns
+    -------
+    DocstringCache[RenderedDocstring]
+        The docstring cache used by render_docstring
+    """
+
+    global _docstring_cache
+
+    if (
+        _docstring_cache.max_entries != max_entries
+        or _docstring_cache.cache_dir != cache_dir
+    ):
+        _docstring_cache.close()
+        _docstring_cache = DocstringCache(
+            max_entries,
+            cache_dir,
+            encode=RenderedDocstring.to_dict,
+            decode=RenderedDocstring.from_dict,
+        )
+    return _docstring_cache
+
+
+def get_docstring_cache() -> DocstringCache[RenderedDocstring]:
+    """Get the cache memoizing parsed docstrings in the current process.
+
+    Returns
+    -------
+    DocstringCache[RenderedDocstring]
+        The docstring cache used by render_docstring
+    """
+
+    return _docstring_cache
+
+
+def render_docstring(text: str) -> RenderedDocstring:
+    """Helper function to parse a numpy-style docstring into its rendered fields
+
+    Results are memoized by docstring text (see configure_docstring_cache), so the
+    returned docstring may be shared between elements and must not be modified.
+
+    Parameters
+    ----------
+    text : str
+        The raw docstring text
+
+    Returns
+    -------
+    RenderedDocstring
+        The rendered fields of the parsed docstring
+    """
+
+    with profile_phase("parse"):
+        return _docstring_cache.get(text, _render_parsed_docstring)
+
+
+# Signatures of the functions inspected so far, so that functions re-exported or
+# aliased under several names are inspected once. Entries go away with their
+# function, ex: when a module is reloaded. Type replacements are applied on every
+# use, as they can be registered in between.
+_signature_cache: "WeakKeyDictionary[Callable, str]" = WeakKeyDictionary()
+
+
+def format_function_signature(func: Callable) -> str:
+    """Helper function to get the sanitized signature of a function
+
+    Parameters
+    ----------
+    func : Callable
+        The function (or method) to get the signature of
+
+    Returns
+    -------
+    str
+        The function's signature, ex: (x: int, y: str = 'y') -> bool
+    """
+
+    import inspect
+
+    with profile_phase("signature"):
+        try:
+            signature = _signature_cache.get(func)
+        except TypeError:
+            # Not weakly referenceable, or not hashable
+            return sanitize_signature(str(inspect.signature(func)))
+        if signature is None:
+            signature = str(inspect.signature(func))
+            _signature_cache[func] = signature
+        return sanitize_signature(signature)
 
 
 class DocToMarkdownElement(DocToMarkdownElementProtocol):
@@ -134,8 +620,8 @@ class DocToMarkdownElement(DocToMarkdownElementProtocol):
     ----------
     name : str
         Name of the element (ex: function name, class name)
-    docstring : Docstring
-        Parsed docstring object for the element
+    docstring : RenderedDocstring
+        Rendered fields of the parsed docstring for the element
     signature : str
         Signature of the element (ex: function signature)
     level : int
@@ -144,15 +630,23 @@ class DocToMarkdownElement(DocToMarkdownElementProtocol):
 
     """
 
+    # Slots keep elements small, since generated modules can have thousands of them.
+    __slots__ = ("name", "docstring", "signature", "level")
+
+    # Kind of element, in its JSON serializable form
+    kind = "element"
+
     name: str
-    docstring: Docstring
-    signature: str | None = (
-        None  # Signature is optional since modules may not have a signature
-    )
+    docstring: RenderedDocstring
+    signature: str | None
     level: int
 
     def __init__(
-        self, name: str, docstring: Docstring, level: int, signature: str | None = None
+        self,
+        name: str,
+        docstring: "Docstring | RenderedDocstring",
+        level: int,
+        signature: str | None = None,
     ):
         """Initialize the element with its name, docstring, signature, and heading.
 
@@ -162,78 +656,216 @@ class DocToMarkdownElement(DocToMarkdownElementProtocol):
             Name of the element (ex: function name, class name)
         signature : str, optional
             Signature of the element (ex: function signature)
-        docstring : Docstring
-            Parsed docstring object for the element
+        docstring : Docstring or RenderedDocstring
+            Parsed docstring object for the element, only its rendered fields are kept
         level : int
             Heading level for the element in the markdown documentation.
             For example, 1 for module, 2 for class, 3 for method.
         """
         self.name = name
-        self.signature = signature
-        self.docstring = docstring
+        # Signatures of generated members repeat a lot, ex: def __init__(self)
+        self.signature = None if signature is None else sys.intern(signature)
+        self.docstring = (
+            docstring
+            if isinstance(docstring, RenderedDocstring)
+            else RenderedDocstring.from_docstring(docstring)
+        )
         self.level = level
 
-    def __repr__(self) -> str:
-        """String representation of the element in markdown format.
+    def render_to(self, stream: IO[str]) -> None:
+        """Write the markdown representation of the element to a text stream.
 
-        Returns
-        -------
-        str
-            Markdown representation of the element.
+        Sub-elements are written to the same stream, so the cost of rendering
+        grows linearly with the number of members.
+
+        Parameters
+        ----------
+        stream : IO[str]
+            Text stream to write to (ex: io.StringIO, or an open file).
         """
 
-        repr = f"{'#' * self.level} {self.name}\n"
-        repr += (
-            f"```Python\n{self.signature}\n```\n" if self.signature is not None else ""
-        )
-        repr += (
-            f"{self.docstring.description}\n"
-            if self.docstring.description is not None
-            else ""
-        )
+        self.render_summary_to(stream)
+        for subc in ["classes", "functions", "methods"]:
+            if hasattr(self, subc):
+                for element in getattr(self, subc):
+                    stream.write("\n")
+                    element.render_to(stream)
+
+    def render_summary_to(self, stream: IO[str]) -> None:
+        """Write the element's own markdown, up to the tables of its sub-elements.
+
+        Parameters
+        ----------
+        stream : IO[str]
+            Text stream to write to (ex: io.StringIO, or an open file).
+        """
+
+        stream.write(f"{'#' * self.level} {self.name}\n")
+        if self.signature is not None:
+            stream.write(f"```Python\n{self.signature}\n```\n")
+        if self.docstring.description is not None:
+            stream.write(f"{self.docstring.description}\n")
 
         # Class docstrings will include attributes instead of parameters.
         param_header = (
             "Parameters" if not isinstance(self, ClassElement) else "Attributes"
         )
         if len(self.docstring.params) > 0:
-            repr += docstring_metas_to_md_table(
-                param_header, self.level + 1, self.docstring.params
+            write_docstring_metas_md_table(
+                stream, param_header, self.level + 1, self.docstring.params
             )
 
         if self.docstring.returns is not None:
-            repr += docstring_metas_to_md_table(
-                "Returns", self.level + 1, [self.docstring.returns]
+            write_docstring_metas_md_table(
+                stream, "Returns", self.level + 1, [self.docstring.returns]
             )
 
         if len(self.docstring.raises) > 0:
-            repr += docstring_metas_to_md_table(
-                "Raises", self.level + 1, self.docstring.raises
+            write_docstring_metas_md_table(
+                stream, "Raises", self.level + 1, self.docstring.raises
             )
 
         if len(self.docstring.examples) > 0:
-            repr += docstring_metas_to_md_table(
-                "Examples", self.level + 1, self.docstring.examples
+            write_docstring_metas_md_table(
+                stream, "Examples", self.level + 1, self.docstring.examples
             )
 
         for subc in ["classes", "functions", "methods"]:
             if hasattr(self, subc) and len(getattr(self, subc)) > 0:
-                repr += docstring_metas_to_md_table(
-                    subc.capitalize(), self.level + 1, getattr(self, subc)
+                write_docstring_metas_md_table(
+                    stream, subc.capitalize(), self.level + 1, getattr(self, subc)
                 )
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the element, and its sub-elements, to JSON serializable data.
+
+        Returns
+        -------
+        dict[str, Any]
+            The kind, name, signature, heading level and rendered docstring of the
+            element, with its sub-elements under classes, functions or methods.
+        """
+
+        data: dict[str, Any] = {
+            "kind": self.kind,
+            "name": self.name,
+            "signature": self.signature,
+            "level": self.level,
+            "docstring": self.docstring.to_dict(),
+        }
         for subc in ["classes", "functions", "methods"]:
             if hasattr(self, subc):
-                for element in getattr(self, subc):
-                    repr += f"\n{element.__repr__()}"
+                data[subc] = [element.to_dict() for element in getattr(self, subc)]
+        return data
 
-        return repr
+    def __repr__(self) -> str:
+        """String representation of the element in markdown format.
+
+        Returns
+        -------
+        str
+            Markdown representation of the element.
+        """
+
+        stream = StringIO()
+        self.render_to(stream)
+        return stream.getvalue()
 
 
 class FunctionElement(DocToMarkdownElement):
     """Class for representing function docstrings."""
 
-    ...
+    __slots__ = ()
+    kind = "function"
+
+
+def _class_signature(cls: type) -> str:
+    """Helper function to get the signature of a class, listing its bases
+
+    Parameters
+    ----------
+    cls : type
+        The class to get the signature of
+
+    Returns
+    -------
+    str
+        The class's signature, ex: class MyClass(Base)
+    """
+
+    bases = ", ".join(base_cls.__name__ for base_cls in cls.__bases__)
+    return (
+        f"class {cls.__name__}({bases})"
+        if len(cls.__bases__) > 0
+        else f"class {cls.__name__}"
+    )
+
+
+def _parse_class_docstring(cls: type) -> RenderedDocstring:
+    """Helper function to parse the docstring of a class, or a placeholder if none
+
+    Parameters
+    ----------
+    cls : type
+        The class to parse the docstring of
+
+    Returns
+    -------
+    RenderedDocstring
+        The rendered fields of the parsed docstring
+    """
+
+    return render_docstring(
+        cls.__doc__ if cls.__doc__ is not None else f"Description for {cls.__name__}"
+    )
+
+
+def _method_elements(
+    cls: type,
+    include_private: bool = False,
+    private_whitelist: list[str] | None = None,
+) -> list[FunctionElement]:
+    """Helper function building the elements of the methods defined in a class
+
+    Functions and methods found in the class namespace are what getattr would
+    return, their docstrings are read directly.
+
+    Parameters
+    ----------
+    cls : type
+        The class defining the methods
+    include_private : bool, default=False
+        Whether to include private methods in the documentation.
+    private_whitelist : list[str], optional
+        List of private method names to include even if include_private is False.
+
+    Returns
+    -------
+    list[FunctionElement]
+        Elements of the documented methods
+    """
+
+    import inspect
+
+    return [
+        FunctionElement(
+            name=method_name,
+            signature=f"def {method_name}{format_function_signature(method)}",
+            docstring=render_docstring(
+                method.__doc__
+                if method.__doc__ is not None
+                else f"Description for {method_name}()"
+            ),
+            level=3,
+        )
+        for method_name, method in cls.__dict__.items()
+        if (inspect.isfunction(method) or inspect.ismethod(method))
+        and (
+            include_private
+            or not method_name.startswith("_")
+            or (private_whitelist and method_name in private_whitelist)
+        )
+    ]
 
 
 class ClassElement(DocToMarkdownElement):
@@ -245,6 +877,9 @@ class ClassElement(DocToMarkdownElement):
         List of methods defined in the class, represented as FunctionElement objects.
     """
 
+    __slots__ = ("methods",)
+    kind = "class"
+
     methods: list[FunctionElement]
 
     def __init__(
@@ -267,48 +902,115 @@ class ClassElement(DocToMarkdownElement):
             List of private member names to include even if include_private is False.
         """
 
-        bases = ", ".join(base_cls.__name__ for base_cls in cls.__bases__)
-        signature = (
-            f"class {cls.__name__}({bases})"
-            if len(cls.__bases__) > 0
-            else f"class {cls.__name__}"
-        )
+        start = time.perf_counter()
         super().__init__(
             name=cls.__name__,
-            signature=signature,
-            docstring=parse(
-                cls.__doc__
-                if cls.__doc__ is not None
-                else f"Description for {cls.__name__}",
-                style=Style.NUMPYDOC,
-            ),
+            signature=_class_signature(cls),
+            docstring=_parse_class_docstring(cls),
             level=2,
         )
+        self.methods = _method_elements(cls, include_private, private_whitelist)
+        record_class(
+            f"{cls.__module__}.{cls.__qualname__}", time.perf_counter() - start
+        )
 
-        target_methods = {
-            method_name: method
-            for method_name, method in cls.__dict__.items()
-            if (inspect.isfunction(method) or inspect.ismethod(method))
-            and (
-                include_private
-                or not method_name.startswith("_")
-                or (private_whitelist and method_name in private_whitelist)
-            )
-        }
-        self.methods = [
-            FunctionElement(
-                name=method_name,
-                signature=f"def {method_name}{sanitize_signature(str(inspect.signature(method)))}",  # noqa: E501
-                docstring=parse(
-                    getattr(cls, method_name).__doc__
-                    if getattr(cls, method_name).__doc__ is not None
-                    else f"Description for {method_name}()",
-                    style=Style.NUMPYDOC,
-                ),
-                level=3,
-            )
-            for method_name, method in target_methods.items()
-        ]
+    @classmethod
+    def from_parts(
+        cls,
+        name: str,
+        signature: str,
+        docstring: "Docstring | RenderedDocstring",
+        methods: list[FunctionElement],
+    ) -> "ClassElement":
+        """Build a class element from already extracted parts, without a live class.
+
+        Parameters
+        ----------
+        name : str
+            Name of the class
+        signature : str
+            Signature of the class (ex: class MyClass(Base))
+        docstring : Docstring or RenderedDocstring
+            Parsed docstring object for the class
+        methods : list[FunctionElement]
+            Elements for the methods of the class
+
+        Returns
+        -------
+        ClassElement
+            The class element
+        """
+
+        element = cls.__new__(cls)
+        DocToMarkdownElement.__init__(
+            element, name=name, signature=signature, docstring=docstring, level=2
+        )
+        element.methods = methods
+        return element
+
+
+def _parse_module_docstring(module: ModuleType) -> RenderedDocstring:
+    """Helper function to parse the docstring of a module, or a placeholder if none
+
+    Parameters
+    ----------
+    module : ModuleType
+        The module to parse the docstring of
+
+    Returns
+    -------
+    RenderedDocstring
+        The rendered fields of the parsed docstring
+    """
+
+    return render_docstring(
+        module.__doc__
+        if module.__doc__ is not None
+        else f"Description for {module.__name__} module"
+    )
+
+
+def _function_elements(
+    module: ModuleType,
+    functions: dict[str, Callable],
+    include_private: bool = False,
+    private_whitelist: list[str] | None = None,
+) -> list[FunctionElement]:
+    """Helper function building the elements of the functions defined in a module
+
+    Parameters
+    ----------
+    module : ModuleType
+        The module defining the functions
+    functions : dict[str, Callable]
+        Functions defined in the module, by name
+    include_private : bool, default=False
+        Whether to include private functions in the documentation.
+    private_whitelist : list[str], optional
+        List of private function names to include even if include_private is False.
+
+    Returns
+    -------
+    list[FunctionElement]
+        Elements of the documented functions
+    """
+
+    return [
+        FunctionElement(
+            name=func_name,
+            signature=f"def {func_name}{format_function_signature(func)}",
+            docstring=render_docstring(
+                func.__doc__
+                if func.__doc__ is not None
+                else f"Description for {func_name}()"
+            ),
+            level=2,
+        )
+        for func_name, func in functions.items()
+        if not func_name.startswith("_")
+        or include_private
+        or (private_whitelist and func_name in private_whitelist)
+    ]
 
 
 class ModuleElement(DocToMarkdownElement):
@@ -322,6 +1024,9 @@ class ModuleElement(DocToMarkdownElement):
         List of funcs defined in the module, represented as FunctionDocstring objects
     """
 
+    __slots__ = ("classes", "functions")
+    kind = "module"
+
     classes: list[ClassElement]
     functions: list[FunctionElement]
 
@@ -348,16 +1053,12 @@ class ModuleElement(DocToMarkdownElement):
         super().__init__(
             name=module.__name__,
             signature=None,
-            docstring=parse(
-                module.__doc__
-                if module.__doc__ is not None
-                else f"Description for {module.__name__} module",
-                style=Style.NUMPYDOC,
-            ),
+            docstring=_parse_module_docstring(module),
             level=1,
         )
 
-        all_classes, all_functions = get_cls_and_func_defined_in_module(module)
+        with profile_phase("introspect"):
+            all_classes, all_functions = get_cls_and_func_defined_in_module(module)
 
         self.classes = [
             ClassElement(
@@ -368,27 +1069,187 @@ class ModuleElement(DocToMarkdownElement):
             for cls in all_classes.values()
         ]
 
-        self.functions = [
-            FunctionElement(
-                name=func_name,
-                signature=f"def {func_name}{sanitize_signature(str(inspect.signature(func)))}",  # noqa: E501
-                docstring=parse(
-                    getattr(module, func_name).__doc__
-                    if getattr(module, func_name).__doc__ is not None
-                    else f"Description for {func_name}()",
-                    style=Style.NUMPYDOC,
-                ),
-                level=2,
+        self.functions = _function_elements(
+            module, all_functions, include_private, private_whitelist
+        )
+
+    @classmethod
+    def stream_to(
+        cls,
+        module: ModuleType,
+        stream: IO[str],
+        include_private: bool = False,
+        private_whitelist: list[str] | None = None,
+    ) -> None:
+        """Write the markdown representation of a module to a stream, class by class.
+
+        The output is the same as rendering the ModuleElement of the module, but the
+        tables of members are written from a first pass building each class element
+        without its methods. The methods of each class are then built, rendered and
+        dropped in turn, so that peak memory grows with the largest class rather than
+        with the whole module.
+
+        Parameters
+        ----------
+        module : ModuleType
+            The module to document
+        stream : IO[str]
+            Text stream to write to (ex: io.StringIO, or an open file).
+        include_private : bool, default=False
+            Whether to include private members in the documentation.
+        private_whitelist : list[str], optional
+            List of private member names to include even if include_private is False.
+        """
+
+        with profile_phase("introspect"):
+            all_classes, all_functions = get_cls_and_func_defined_in_module(module)
+
+        # Class elements are first built without their methods, for the tables of
+        # the module summary. Methods are then added, rendered and dropped in turn.
+        class_elements: list[ClassElement] = []
+        class_seconds: list[float] = []
+        for class_obj in all_classes.values():
+            start = time.perf_counter()
+            class_elements.append(
+                ClassElement.from_parts(
+                    name=class_obj.__name__,
+                    signature=_class_signature(class_obj),
+                    docstring=_parse_class_docstring(class_obj),
+                    methods=[],
+                )
             )
-            for func_name, func in all_functions.items()
-            if not func_name.startswith("_")
-            or include_private
-            or (private_whitelist and func_name in private_whitelist)
-        ]
+            class_seconds.append(time.perf_counter() - start)
+        functions = _function_elements(
+            module, all_functions, include_private, private_whitelist
+        )
+        element = cls.from_parts(
+            name=module.__name__,
+            docstring=_parse_module_docstring(module),
+            classes=class_elements,
+            functions=functions,
+        )
+        with profile_phase("render"):
+            element.render_summary_to(stream)
+
+        for class_obj, class_element, seconds in zip(
+            all_classes.values(), class_elements, class_seconds, strict=True
+        ):
+            start = time.perf_counter()
+            class_element.methods = _method_elements(
+                class_obj, include_private, private_whitelist
+            )
+            record_class(
+                f"{class_obj.__module__}.{class_obj.__qualname__}",
+                seconds + time.perf_counter() - start,
+            )
+            with profile_phase("render"):
+                stream.write("\n")
+                class_element.render_to(stream)
+            class_element.methods = []
+
+        with profile_phase("render"):
+            for function in functions:
+                stream.write("\n")
+                function.render_to(stream)
+
+    @classmethod
+    def from_parts(
+        cls,
+        name: str,
+        docstring: "Docstring | RenderedDocstring",
+        classes: list[ClassElement],
+        functions: list[FunctionElement],
+    ) -> "ModuleElement":
+        """Build a module element from already extracted parts, without importing.
+
+        Parameters
+        ----------
+        name : str
+            Fully qualified name of the module
+        docstring : Docstring or RenderedDocstring
+            Parsed docstring object for the module
+        classes : list[ClassElement]
+            Elements for the classes defined in the module
+        functions : list[FunctionElement]
+            Elements for the functions defined in the module
+
+        Returns
+        -------
+        ModuleElement
+            The module element
+        """
+
+        element = cls.__new__(cls)
+        DocToMarkdownElement.__init__(
+            element, name=name, signature=None, docstring=docstring, level=1
+        )
+        element.classes = classes
+        element.functions = functions
+        return element
+
+
+def _merge_worker_profiles(
+    results: Iterator[tuple[dict[str, str], dict[str, Any]]], profiler: Profiler
+) -> Iterator[dict[str, str]]:
+    """Helper generator merging profiles collected in worker processes
+
+    Parameters
+    ----------
+    results : Iterator[tuple[dict[str, str], dict[str, Any]]]
+        Generated content by format and profiler data returned by the workers
+    profiler : Profiler
+        Profiler to merge the worker profiler data into
+
+    Yields
+    ------
+    dict[str, str]
+        The generated content by format, in order
+    """
+
+    for outputs, snapshot in results:
+        profiler.merge(snapshot)
+        yield outputs
+
+
+def _initialize_worker(
+    type_replacements: dict[tuple[str, str], str],
+    mock_imports: list[str] | None,
+    docstring_cache_size: int = DEFAULT_MAX_ENTRIES,
+    docstring_cache_dir: Path | None = None,
+    logging_config: tuple[int, str] | None = None,
+) -> None:
+    """Helper function setting up a worker process like the current process
+
+    Parameters
+    ----------
+    type_replacements : dict[tuple[str, str], str]
+        Type replacements registered in the current process
+    mock_imports : list[str], optional
+        Glob patterns of module names to serve stub modules for
+    docstring_cache_size : int, default=DEFAULT_MAX_ENTRIES
+        Maximum number of parsed docstrings kept in memory
+    docstring_cache_dir : Path, optional
+        Directory holding the store of parsed docstrings shared across processes
+    logging_config : tuple[int, str], optional
+        Log level and format of the current process, if it logs to stderr
+    """
+
+    from .mock import install_mock_imports
+
+    if logging_config is not None:
+        configure_worker_logging(*logging_config)
+    register_type_replacements(type_replacements)
+    install_mock_imports(mock_imports)
+    configure_docstring_cache(docstring_cache_size, docstring_cache_dir)
 
 
 def get_target_python_files(
-    input_path: Path, include_private: bool, private_whitelist: list[str] | None
+    input_path: Path,
+    include_private: bool,
+    private_whitelist: list[str] | None,
+    exclude: list[str] | None = None,
+    include: list[str] | None = None,
+    use_gitignore: bool = False,
 ) -> list[Path]:
     """Helper function to get list of target python files to process
 
@@ -398,35 +1259,543 @@ def get_target_python_files(
         Path to the input file or directory containing files to parse
     include_private : bool
         Whether to include private members (those starting with an underscore)
+    private_whitelist : list[str], optional
+        List of private file names to include even if include_private is False
+    exclude : list[str], optional
+        Glob patterns of files and directories to skip, in addition to the default
+        excludes (ex: .git, .venv, build). Excluded directories are not descended into.
+    include : list[str], optional
+        Glob patterns of files to keep. If given, files matching none are skipped.
+    use_gitignore : bool, default=False
+        Whether to skip files and directories ignored by .gitignore files
 
     Returns
     -------
     List[Path]
-        List of paths to target python files to process
+        List of paths to target python files to process, in a deterministic order
     """
 
-    all_src_files: list[Path] = []
+    src_files: list[Path] = []
+    for file in iter_python_files(
+        input_path, exclude=exclude, include=include, use_gitignore=use_gitignore
+    ):
+        if (
+            not include_private
+            and file.name.startswith("_")
+            and (private_whitelist is None or file.name not in private_whitelist)
+        ):
+            logger.info("Ignoring private file %s", file.name)
+        else:
+            src_files.append(file)
+    return src_files
+
+
+def get_module_and_package_names(src_file: Path, input_path: Path) -> tuple[str, str]:
+    """Helper function to get the names a source file is imported under
+
+    Parameters
+    ----------
+    src_file : Path
+        Path to the python source file
+    input_path : Path
+        Path to the input file or directory containing files to parse
+
+    Returns
+    -------
+    tuple[str, str]
+        The name of the module relative to its package, and the package name
+    """
+
+    module_name = (
+        src_file.stem if src_file.name != "__init__.py" else src_file.parent.stem
+    )
+    package = input_path.stem if input_path.is_dir() else input_path.parent.stem
+    return module_name, package
+
+
+def convert_source_file(
+    src_file: Path,
+    input_path: Path,
+    include_private: bool = False,
+    private_whitelist: list[str] | None = None,
+    engine: str = "import",
+    reload: bool = False,
+) -> str:
+    """Helper function to convert a single python source file to markdown
+
+    Defined at module level so that it can be dispatched to worker processes.
+
+    Parameters
+    ----------
+    src_file : Path
+        Path to the python source file to convert
+    input_path : Path
+        Path to the input file or directory containing files to parse
+    include_private : bool, optional
+        Whether to ignore private members, by default False
+    private_whitelist : list[str], optional
+        List of private member names to include even if include_private is False
+    engine : str, default="import"
+        Engine used to extract docstrings, one of ENGINES
+    reload : bool, default=False
+        Whether to reload the module if it was already imported, so that changes
+        made to the source file since are picked up. Only used by the import engine.
+
+    Returns
+    -------
+    str
+        The generated markdown content for the source file
+    """
+
+    return convert_source_file_to_formats(
+        src_file,
+        input_path,
+        include_private=include_private,
+        private_whitelist=private_whitelist,
+        engine=engine,
+        reload=reload,
+    )["md"]
+
+
+def convert_source_file_to_formats(
+    src_file: Path,
+    input_path: Path,
+    include_private: bool = False,
+    private_whitelist: list[str] | None = None,
+    engine: str = "import",
+    reload: bool = False,
+    formats: Sequence[str] = ("md",),
+) -> dict[str, str]:
+    """Helper function to convert a single python source file to several formats
 
-    # Find all python files at the input path
-    if input_path.is_file():
-        all_src_files.append(input_path)
+    The module is imported (or its source parsed) and its docstrings are parsed
+    once, whatever the number of formats. Defined at module level so that it can
+    be dispatched to worker processes.
+
+    Parameters
+    ----------
+    src_file : Path
+        Path to the python source file to convert
+    input_path : Path
+        Path to the input file or directory containing files to parse
+    include_private : bool, optional
+        Whether to ignore private members, by default False
+    private_whitelist : list[str], optional
+        List of private member names to include even if include_private is False
+    engine : str, default="import"
+        Engine used to extract docstrings, one of ENGINES
+    reload : bool, default=False
+        Whether to reload the module if it was already imported, so that changes
+        made to the source file since are picked up. Only used by the import engine.
+    formats : Sequence[str], default=("md",)
+        Output formats to render, among OUTPUT_FORMATS
+
+    Returns
+    -------
+    dict[str, str]
+        The generated content for the source file, by format, in the given order
+    """
+
+    from .formats import IR_FORMAT, render_html, render_ir_module, render_json
+
+    start = time.perf_counter()
+    module_name, package = get_module_and_package_names(src_file, input_path)
+    logger.info("Processing file %s as module %s", src_file, module_name)
+    if engine == "ast":
+        # Imported lazily, the ast engine builds on the element classes above.
+        from .ast_engine import module_element_from_source
+
+        logger.debug("Parsing source of module %s from %s...", module_name, src_file)
+        module_element = module_element_from_source(
+            src_file,
+            f"{package}.{module_name}",
+            package,
+            include_private=include_private,
+            private_whitelist=private_whitelist,
+        )
     else:
-        for file_path in input_path.glob("**/*.py"):
-            if file_path.is_file():
-                all_src_files.append(file_path)
-
-    if not include_private:
-        src_files = []
-        for file in all_src_files:
-            if file.name.startswith("_") and (
-                private_whitelist is None or file.name not in private_whitelist
+        # Import the module to access its docstrings
+        logger.debug("Importing module %s from file %s...", module_name, src_file)
+        with profile_phase("import"):
+            module = sys.modules.get(f"{package}.{module_name}")
+            if reload and module is not None:
+                logger.debug("Reloading module %s", module.__name__)
+                module = importlib.reload(module)
+            else:
+                module = importlib.import_module(f".{module_name}", package=package)
+        logger.debug("Successfully imported module %s", module_name)
+        if tuple(formats) == ("md",):
+            # Classes are rendered one at a time, without building the whole tree.
+            stream = StringIO()
+            ModuleElement.stream_to(
+                module,
+                stream,
+                include_private=include_private,
+                private_whitelist=private_whitelist,
+            )
+            _docstring_cache.flush()
+            record_module(module.__name__, time.perf_counter() - start)
+            return {"md": stream.getvalue()}
+        # The tree is kept, and rendered once per format.
+        module_element = ModuleElement(
+            module,
+            include_private=include_private,
+            private_whitelist=private_whitelist,
+        )
+
+    outputs: dict[str, str] = {}
+    with profile_phase("render"):
+        # Formats other than markdown are rendered from the same serialized tree.
+        data = module_element.to_dict() if set(formats) - {"md"} else {}
+        for output_format in formats:
+            if output_format == "md":
+                outputs[output_format] = module_element.__repr__()
+            elif output_format == "json":
+                outputs[output_format] = render_json(data)
+            elif output_format == IR_FORMAT:
+                outputs[output_format] = render_ir_module(data)
+            else:
+                outputs[output_format] = render_html(data)
+
+    # Parsed docstrings are stored once per module, workers may exit at any time.
+    _docstring_cache.flush()
+    record_module(module_element.name, time.perf_counter() - start)
+    return outputs
+
+
+def _convert_source_file_profiled(
+    src_file: Path, **kwargs: Any
+) -> tuple[dict[str, str], dict[str, Any]]:
+    """Helper function converting a source file with a worker-local profiler
+
+    Parameters
+    ----------
+    src_file : Path
+        Path to the python source file to convert
+    **kwargs : Any
+        Keyword arguments passed on to convert_source_file_to_formats
+
+    Returns
+    -------
+    tuple[dict[str, str], dict[str, Any]]
+        The generated content by format, and the data collected by the profiler
+    """
+
+    with profiling() as profiler:
+        outputs = convert_source_file_to_formats(src_file, **kwargs)
+    return outputs, profiler.snapshot()
+
+
+def iter_npdoc2md(
+    input_path: Path,
+    output_path: Path,
+    include_private: bool = False,
+    private_whitelist: list[str] | None = None,
+    engine: str = "import",
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    exclude: list[str] | None = None,
+    include: list[str] | None = None,
+    use_gitignore: bool = False,
+    isolated: bool = False,
+    import_timeout: float | None = None,
+    max_modules_per_worker: int | None = None,
+    max_worker_rss: int | None = None,
+    mock_imports: list[str] | None = None,
+    docstring_cache_size: int = DEFAULT_MAX_ENTRIES,
+    formats: Sequence[str] = ("md",),
+    shard: tuple[int, int] | None = None,
+) -> Generator[tuple[Path, str], None, None]:
+    """Generator converting docstrings to markdown one module at a time
+
+    This function orchestrates the process of converting docstrings in Python files
+    to markdown format. It identifies the target Python files, imports them to
+    access their docstrings, and then parses the docstrings to generate markdown docs.
+    Each module's markdown is yielded as soon as it is generated, so that callers
+    can write it out without holding the whole documentation set in memory.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to the input file or directory containing files to parse
+    output_path : Path
+        Path to the output directory where markdown files will be saved
+    include_private : bool, optional
+        Whether to ignore private members, by default False
+    private_whitelist : list[str], default=[]
+        List of private member names to include even if include_private is False
+    engine : str, default="import"
+        Engine used to extract docstrings. "import" imports each module and reads
+        its live objects, "ast" parses the source files without importing them.
+    jobs : int, default=1
+        Number of worker processes used to convert files in parallel. With the
+        default of 1, files are converted sequentially in the current process.
+    cache_dir : Path, optional
+        Directory holding a build manifest from previous runs. If given, source
+        files whose content and conversion options are unchanged since the last
+        run (and whose output file still exists) are skipped, and are not
+        yielded. A file is recorded in the manifest once the caller resumes the
+        generator after receiving its markdown.
+        Parsed docstrings are also stored there, and reused across runs.
+    exclude : list[str], optional
+        Glob patterns of files and directories to skip, in addition to the default
+        excludes (ex: .git, .venv, build). Excluded directories are not descended into.
+    include : list[str], optional
+        Glob patterns of files to keep. If given, files matching none are skipped.
+    use_gitignore : bool, default=False
+        Whether to skip files and directories ignored by .gitignore files
+    isolated : bool, default=False
+        Whether to convert files in worker subprocesses (as many as jobs), keeping
+        target modules out of the current process. Implied by the options below.
+    import_timeout : float, optional
+        Maximum time a single file may take to import and convert, in seconds.
+        Files that time out are skipped, instead of stalling the run, and reported
+        with ConversionError at the end.
+    max_modules_per_worker : int, optional
+        Number of modules after which a worker subprocess is replaced.
+    max_worker_rss : int, optional
+        Resident memory, in bytes, above which a worker subprocess is replaced.
+    mock_imports : list[str], optional
+        Glob patterns of module names (ex: torch, google.cloud.*) for which stub
+        modules are imported instead of the real ones, including their submodules.
+    docstring_cache_size : int, default=DEFAULT_MAX_ENTRIES
+        Maximum number of parsed docstrings memoized in memory, by docstring text,
+        in each converting process. 0 disables the in-memory memoization.
+    formats : Sequence[str], default=("md",)
+        Output formats to generate for each module, among "md", "json" and "html",
+        or "ir" for the compact element tree stored in IR files (see IRWriter).
+        All formats of a module are rendered from a single import and parse.
+    shard : tuple[int, int], optional
+        Index, starting at 1, and number of shards, to only convert one shard of
+        the source files, ex: (2, 4) for the second of four shards. The partition
+        is deterministic, and balanced by file size.
+
+    Yields
+    ------
+    tuple[Path, str]
+        Output file path and generated content, for each module in order, and for
+        each of its formats in the given order
+
+    Raises
+    ------
+    ValueError
+        If the requested engine is not one of the available engines, if the
+        number of jobs is less than 1, if a worker limit or the import timeout is
+        not positive, if the docstring cache size is negative, if an output format
+        is unknown, or if the shard is out of range.
+    ConversionError
+        Once the other modules are converted, if isolated workers failed to
+        convert some modules or timed out.
+    """
+
+    from .cache import BuildManifest, hash_file
+    from .formats import FORMAT_SUFFIXES, validate_formats
+    from .mock import mocked_imports
+    from .shard import select_shard, validate_shard
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}.")
+    if jobs < 1:
+        raise ValueError(f"Number of jobs must be at least 1, got {jobs}.")
+    if import_timeout is not None and import_timeout <= 0:
+        raise ValueError(f"Import timeout must be positive, got {import_timeout}.")
+    if max_modules_per_worker is not None and max_modules_per_worker < 1:
+        raise ValueError(
+            "Number of modules per worker must be at least 1, "
+            f"got {max_modules_per_worker}."
+        )
+    if max_worker_rss is not None and max_worker_rss <= 0:
+        raise ValueError(f"Worker RSS limit must be positive, got {max_worker_rss}.")
+    validate_formats(formats, allow_ir=True)
+    formats = tuple(formats)
+    if shard is not None:
+        validate_shard(shard)
+    # The output of the first format stands for all of them in the build manifest.
+    manifest_suffix = FORMAT_SUFFIXES[formats[0]]
+    docstring_cache = configure_docstring_cache(docstring_cache_size, cache_dir)
+    docstring_cache.reset_stats()
+
+    logger.info("Searching for Python files in %s...", input_path)
+    with profile_phase("discovery"):
+        src_files = get_target_python_files(
+            input_path,
+            include_private,
+            private_whitelist,
+            exclude=exclude,
+            include=include,
+            use_gitignore=use_gitignore,
+        )
+        if shard is not None:
+            src_files = select_shard(src_files, input_path, shard)
+
+    manifest: BuildManifest | None = None
+    manifest_keys: dict[Path, str] = {}
+    content_hashes: dict[Path, str] = {}
+    if cache_dir is not None:
+        type_replacements = get_registered_type_replacements()
+        manifest = BuildManifest(
+            cache_dir,
+            options={
+                "include_private": include_private,
+                "private_whitelist": private_whitelist,
+                "engine": engine,
+                "formats": list(formats),
+                "type_replacements": {
+                    ".".join(invalid_type): correct_type
+                    for invalid_type, correct_type in type_replacements.items()
+                },
+            },
+        )
+        stale_files: list[Path] = []
+        for src_file in src_files:
+            manifest_keys[src_file] = (
+                src_file.relative_to(input_path).as_posix()
+                if input_path.is_dir()
+                else src_file.name
+            )
+            with profile_phase("hash"):
+                content_hashes[src_file] = hash_file(src_file)
+            output_file_path = get_target_output_file_path(
+                src_file, input_path, output_path, manifest_suffix
+            )
+            if manifest.is_up_to_date(
+                manifest_keys[src_file], content_hashes[src_file], output_file_path
             ):
-                logger.info(f"Ignoring private file {file.name}")
+                logger.debug("Skipping unchanged file %s", src_file)
             else:
-                src_files.append(file)
-        return src_files
+                stale_files.append(src_file)
+        logger.info(
+            "Skipping %d unchanged files, %d files to convert.",
+            len(src_files) - len(stale_files),
+            len(stale_files),
+        )
+        src_files = stale_files
+
+    convert = partial(
+        convert_source_file_to_formats,
+        input_path=input_path,
+        include_private=include_private,
+        private_whitelist=private_whitelist,
+        engine=engine,
+        formats=formats,
+    )
+
+    executor: ProcessPoolExecutor | None = None
+    pool: IsolatedWorkerPool | None = None
+    profiler = get_active_profiler()
+    isolated = isolated or any(
+        option is not None
+        for option in (import_timeout, max_modules_per_worker, max_worker_rss)
+    )
+    if isolated and src_files:
+        # Imported lazily, the worker pool dispatches convert_source_file.
+        from . import isolation
+
+        logger.info(
+            "Converting %d files using %d isolated processes...", len(src_files), jobs
+        )
+        pool = isolation.IsolatedWorkerPool(
+            convert.keywords,
+            jobs=jobs,
+            mock_imports=mock_imports,
+            docstring_cache_size=docstring_cache.max_entries,
+            docstring_cache_dir=docstring_cache.cache_dir,
+            timeout=import_timeout,
+            max_modules_per_worker=max_modules_per_worker,
+            max_worker_rss=max_worker_rss,
+            profiler=profiler,
+        )
+        results = pool.map(src_files)
+    elif jobs > 1 and len(src_files) > 1:
+        logger.info("Converting %d files using %d processes...", len(src_files), jobs)
+        # Imported lazily, only parallel runs need it.
+        import concurrent.futures
+
+        # Executor.map yields results in submission order, keeping output stable.
+        # Registered type replacements are not inherited by spawned workers.
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_initialize_worker,
+            initargs=(
+                get_registered_type_replacements(),
+                mock_imports,
+                docstring_cache.max_entries,
+                docstring_cache.cache_dir,
+                get_worker_logging(),
+            ),
+        )
+        if profiler is None:
+            results = executor.map(convert, src_files)
+        else:
+            # Workers profile into their own profilers, which are merged here.
+            results = _merge_worker_profiles(
+                executor.map(
+                    partial(_convert_source_file_profiled, **convert.keywords),
+                    src_files,
+                ),
+                profiler,
+            )
     else:
-        return all_src_files
+        results = map(convert, src_files)
+
+    # Stub modules are served while modules are converted in this process.
+    with mocked_imports(mock_imports):
+        try:
+            for src_file, outputs in zip(src_files, results, strict=True):
+                if outputs is None:
+                    # Failed or timed out in an isolated worker, already reported.
+                    continue
+                for output_format, text in outputs.items():
+                    yield (
+                        get_target_output_file_path(
+                            src_file,
+                            input_path,
+                            output_path,
+                            FORMAT_SUFFIXES[output_format],
+                        ),
+                        text,
+                    )
+                if manifest is not None:
+                    manifest.record(
+                        manifest_keys[src_file],
+                        content_hashes[src_file],
+                        get_target_output_file_path(
+                            src_file, input_path, output_path, manifest_suffix
+                        ),
+                    )
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            if pool is not None:
+                pool.close()
+            if manifest is not None:
+                manifest.save(list(manifest_keys.values()))
+            docstring_cache.close()
+            if docstring_cache.lookups:
+                logger.debug(
+                    "Docstring cache hit rate %.1f%%: %d hits in memory, %d on disk, "
+                    "%d misses",
+                    docstring_cache.hit_rate * 100,
+                    docstring_cache.hits,
+                    docstring_cache.disk_hits,
+                    docstring_cache.misses,
+                )
+
+    if pool is not None:
+        dropped = {
+            **pool.failed,
+            **dict.fromkeys(
+                pool.timed_out, f"timed out after {import_timeout} seconds"
+            ),
+        }
+        if dropped:
+            raise ConversionError(
+                {
+                    src_file: dropped[src_file]
+                    for src_file in src_files
+                    if src_file in dropped
+                }
+            )
 
 
 def npdoc2md(
@@ -434,12 +1803,27 @@ def npdoc2md(
     output_path: Path,
     include_private: bool = False,
     private_whitelist: list[str] | None = None,
+    engine: str = "import",
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    exclude: list[str] | None = None,
+    include: list[str] | None = None,
+    use_gitignore: bool = False,
+    isolated: bool = False,
+    import_timeout: float | None = None,
+    max_modules_per_worker: int | None = None,
+    max_worker_rss: int | None = None,
+    mock_imports: list[str] | None = None,
+    docstring_cache_size: int = DEFAULT_MAX_ENTRIES,
+    formats: Sequence[str] = ("md",),
+    shard: tuple[int, int] | None = None,
 ) -> dict[Path, str]:
     """Main function for converting docstrings to markdown
 
     This function orchestrates the process of converting docstrings in Python files
     to markdown format. It identifies the target Python files, imports them to
     access their docstrings, and then parses the docstrings to generate markdown docs.
+    It collects the output of `iter_npdoc2md` into a single dictionary.
 
     Parameters
     ----------
@@ -451,36 +1835,86 @@ def npdoc2md(
         Whether to ignore private members, by default False
     private_whitelist : list[str], default=[]
         List of private member names to include even if include_private is False
+    engine : str, default="import"
+        Engine used to extract docstrings. "import" imports each module and reads
+        its live objects, "ast" parses the source files without importing them.
+    jobs : int, default=1
+        Number of worker processes used to convert files in parallel. With the
+        default of 1, files are converted sequentially in the current process.
+    cache_dir : Path, optional
+        Directory holding a build manifest from previous runs. If given, source
+        files whose content and conversion options are unchanged since the last
+        run (and whose output file still exists) are skipped, and are not
+        included in the returned dictionary.
+        Parsed docstrings are also stored there, and reused across runs.
+    exclude : list[str], optional
+        Glob patterns of files and directories to skip, in addition to the default
+        excludes (ex: .git, .venv, build). Excluded directories are not descended into.
+    include : list[str], optional
+        Glob patterns of files to keep. If given, files matching none are skipped.
+    use_gitignore : bool, default=False
+        Whether to skip files and directories ignored by .gitignore files
+    isolated : bool, default=False
+        Whether to convert files in worker subprocesses (as many as jobs), keeping
+        target modules out of the current process. Implied by the options below.
+    import_timeout : float, optional
+        Maximum time a single file may take to import and convert, in seconds.
+        Files that time out are skipped, instead of stalling the run, and reported
+        with ConversionError at the end.
+    max_modules_per_worker : int, optional
+        Number of modules after which a worker subprocess is replaced.
+    max_worker_rss : int, optional
+        Resident memory, in bytes, above which a worker subprocess is replaced.
+    mock_imports : list[str], optional
+        Glob patterns of module names (ex: torch, google.cloud.*) for which stub
+        modules are imported instead of the real ones, including their submodules.
+    docstring_cache_size : int, default=DEFAULT_MAX_ENTRIES
+        Maximum number of parsed docstrings memoized in memory, by docstring text,
+        in each converting process. 0 disables the in-memory memoization.
+    formats : Sequence[str], default=("md",)
+        Output formats to generate for each module, among "md", "json" and "html".
+        All formats of a module are rendered from a single import and parse.
+    shard : tuple[int, int], optional
+        Index, starting at 1, and number of shards, to only convert one shard of
+        the source files, ex: (2, 4) for the second of four shards. The partition
+        is deterministic, and balanced by file size.
 
     Returns
     -------
     dict[Path, str]
         A dictionary mapping output file paths to their generated markdown content
-    """
 
-    logger.info(f"Searching for Python files in {input_path}...")
-    src_files = get_target_python_files(input_path, include_private, private_whitelist)
-    output_files: dict[Path, str] = {}
-
-    for src_file in src_files:
-        # Import the module to access its docstrings
-        module_name = (
-            src_file.stem if src_file.name != "__init__.py" else src_file.parent.stem
-        )
-        logger.info(f"Processing file {src_file} as module {module_name}")
-        logger.debug(f"Importing module {module_name} from file {src_file}...")
-        module = importlib.import_module(
-            f".{module_name}",
-            package=input_path.stem if input_path.is_dir() else input_path.parent.stem,
-        )
-        logger.debug(f"Successfully imported module {module_name}")
+    Raises
+    ------
+    ValueError
+        If the requested engine is not one of the available engines, if the
+        number of jobs is less than 1, if a worker limit or the import timeout is
+        not positive, if the docstring cache size is negative, if an output format
+        is unknown, or if the shard is out of range.
+    ConversionError
+        Once the other modules are converted, if isolated workers failed to
+        convert some modules or timed out.
+    """
 
-        output_file_path = get_target_output_file_path(
-            src_file, input_path, output_path
+    return dict(
+        iter_npdoc2md(
+            input_path,
+            output_path,
+            include_private=include_private,
+            private_whitelist=private_whitelist,
+            engine=engine,
+            jobs=jobs,
+            cache_dir=cache_dir,
+            exclude=exclude,
+            include=include,
+            use_gitignore=use_gitignore,
+            isolated=isolated,
+            import_timeout=import_timeout,
+            max_modules_per_worker=max_modules_per_worker,
+            max_worker_rss=max_worker_rss,
+            mock_imports=mock_imports,
+            docstring_cache_size=docstring_cache_size,
+            formats=formats,
+            shard=shard,
         )
-        md_text = ModuleElement(
-            module, include_private=include_private, private_whitelist=private_whitelist
-        ).__repr__()
-        output_files[output_file_path] = md_text
-
-    return output_files
+    )
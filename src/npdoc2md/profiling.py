@@ -0,0 +1,203 @@
+"""Lightweight instrumentation of the conversion hot paths.
+
+Phases of the conversion (ex: importing modules, parsing docstrings, rendering)
+are wrapped in `profile_phase`, and per-module and per-class wall times are
+recorded with `record_module` and `record_class`. These are no-ops unless a
+profiler was activated with `profiling`, in which case they accumulate into a
+`Profiler` that can produce a JSON serializable report.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Profiler:
+    """Accumulates wall time and call counts for phases, modules and classes.
+
+    Attributes
+    ----------
+    phases : dict[str, list[float]]
+        Mapping of phase names to their total wall time (seconds) and call count.
+    modules : dict[str, float]
+        Mapping of module names to the wall time spent converting them.
+    classes : dict[str, float]
+        Mapping of fully qualified class names to the time spent building them.
+    """
+
+    def __init__(self):
+        """Initialize an empty profiler."""
+
+        self.phases: dict[str, list[float]] = {}
+        self.modules: dict[str, float] = {}
+        self.classes: dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager timing one call of a phase.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase (ex: import, parse, render)
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.phases.setdefault(name, [0.0, 0])
+            stats[0] += time.perf_counter() - start
+            stats[1] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get the raw collected data, for merging into another profiler.
+
+        Returns
+        -------
+        dict[str, Any]
+            The collected phase, module and class timings.
+        """
+
+        return {"phases": self.phases, "modules": self.modules, "classes": self.classes}
+
+    def merge(self, snapshot: dict[str, Any]) -> None:
+        """Merge data collected by another profiler (ex: in a worker process).
+
+        Parameters
+        ----------
+        snapshot : dict[str, Any]
+            Data returned by `snapshot` of the other profiler.
+        """
+
+        for name, (seconds, calls) in snapshot["phases"].items():
+            stats = self.phases.setdefault(name, [0.0, 0])
+            stats[0] += seconds
+            stats[1] += calls
+        self.modules.update(snapshot["modules"])
+        self.classes.update(snapshot["classes"])
+
+    def report(self, top: int = 10) -> dict[str, Any]:
+        """Build a JSON serializable report of the collected data.
+
+        Parameters
+        ----------
+        top : int, default=10
+            Number of slowest modules and classes to list.
+
+        Returns
+        -------
+        dict[str, Any]
+            Report with total wall time, per-phase and per-module timings, and the
+            slowest modules and classes.
+        """
+
+        def slowest(timings: dict[str, float]) -> list[dict[str, Any]]:
+            ranked = sorted(timings.items(), key=lambda item: item[1], reverse=True)
+            return [
+                {"name": name, "seconds": seconds} for name, seconds in ranked[:top]
+            ]
+
+        return {
+            "wall_seconds": time.perf_counter() - self._start,
+            "phases": {
+                name: {"seconds": seconds, "calls": calls}
+                for name, (seconds, calls) in sorted(self.phases.items())
+            },
+            "modules": dict(sorted(self.modules.items())),
+            "slowest_modules": slowest(self.modules),
+            "slowest_classes": slowest(self.classes),
+        }
+
+
+_active_profiler: Profiler | None = None
+
+
+def get_active_profiler() -> Profiler | None:
+    """Get the currently active profiler.
+
+    Returns
+    -------
+    Profiler | None
+        The active profiler, or None if profiling is disabled.
+    """
+
+    return _active_profiler
+
+
+@contextmanager
+def profiling(profiler: Profiler | None = None) -> Iterator[Profiler]:
+    """Context manager activating a profiler for the conversion hot paths.
+
+    Parameters
+    ----------
+    profiler : Profiler, optional
+        Profiler to activate. A new one is created if not given.
+
+    Yields
+    ------
+    Profiler
+        The active profiler.
+    """
+
+    global _active_profiler
+
+    previous = _active_profiler
+    _active_profiler = profiler if profiler is not None else Profiler()
+    try:
+        yield _active_profiler
+    finally:
+        _active_profiler = previous
+
+
+def profile_phase(name: str) -> AbstractContextManager[None]:
+    """Time a phase with the active profiler, if any.
+
+    Parameters
+    ----------
+    name : str
+        Name of the phase (ex: import, parse, render)
+
+    Returns
+    -------
+    AbstractContextManager[None]
+        Context manager timing the phase, or a no-op if profiling is disabled.
+    """
+
+    if _active_profiler is None:
+        return _NULL_CONTEXT
+    return _active_profiler.phase(name)
+
+
+def record_module(name: str, seconds: float) -> None:
+    """Record the wall time spent converting a module with the active profiler.
+
+    Parameters
+    ----------
+    name : str
+        Name of the module.
+    seconds : float
+        Wall time spent converting the module.
+    """
+
+    if _active_profiler is not None:
+        _active_profiler.modules[name] = seconds
+
+
+def record_class(name: str, seconds: float) -> None:
+    """Record the wall time spent building a class element with the active profiler.
+
+    Parameters
+    ----------
+    name : str
+        Fully qualified name of the class.
+    seconds : float
+        Wall time spent building the class element.
+    """
+
+    if _active_profiler is not None:
+        _active_profiler.classes[name] = seconds
@@ -0,0 +1,262 @@
+"""Fast scanner for numpy-style docstrings, in front of docstring_parser.
+
+`docstring_parser.parse` is general: every call builds a parser matching any of its
+section titles with one large regex, and cleans the indentation of every item
+separately with `inspect.cleandoc`. This scanner produces the same `Docstring`
+from a single pass over the lines of the cleaned docstring. It finds section
+headers with a set lookup (confirmed with docstring_parser's own title patterns),
+and splits key-value sections (Parameters, Attributes, Returns, Raises, ...) into
+items directly. Key and type parsing reuses docstring_parser's regexes, and the
+Examples and deprecation sections are handed to docstring_parser's own section
+parsers, so the results are identical.
+
+Sections of a kind the scanner does not know make it give up, in which case the
+caller falls back to `docstring_parser.parse`.
+"""
+
+import inspect
+import re
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from docstring_parser import (
+    Docstring,
+    DocstringMeta,
+    DocstringParam,
+    DocstringRaises,
+    DocstringReturns,
+    DocstringStyle,
+)
+from docstring_parser.numpydoc import (
+    DEFAULT_SECTIONS,
+    PARAM_DEFAULT_REGEX,
+    PARAM_DEFAULT_REGEX_IN_DESC,
+    PARAM_KEY_REGEX,
+    PARAM_OPTIONAL_REGEX,
+    RETURN_KEY_REGEX,
+    DeprecationSection,
+    ExamplesSection,
+    ParamSection,
+    RaisesSection,
+    ReturnsSection,
+    Section,
+    YieldsSection,
+)
+
+_SECTIONS = {section.title: section for section in DEFAULT_SECTIONS}
+# Header patterns of each section, matched at the start of candidate lines only.
+_TITLE_PATTERNS = {
+    title: re.compile(section.title_pattern, flags=re.M)
+    for title, section in _SECTIONS.items()
+}
+# Title of the only section using a sphinx directive header, ex: .. deprecated:: 1.0
+_DIRECTIVE_TITLE = "deprecated"
+# First characters of section headers, to quickly skip all other lines.
+_HEADER_INITIALS = frozenset(title[0] for title in _SECTIONS) | {"."}
+
+
+def _clean_str(text: str) -> str | None:
+    """Strip a string, or None if nothing is left."""
+    text = text.strip()
+    return text if text else None
+
+
+def _clean_item_lines(lines: list[str]) -> str:
+    """Join the description lines of an item, removing their common indentation.
+
+    Matches `inspect.cleandoc` on the item's text, up to leading and trailing
+    whitespace, which is stripped.
+    """
+
+    if len(lines) == 1:
+        return lines[0].strip()
+
+    margin = None
+    for line in lines:
+        content = len(line.lstrip())
+        if content and (margin is None or len(line) - content < margin):
+            margin = len(line) - content
+    if not margin:
+        return "\n".join(lines).strip()
+    return "\n".join([line[margin:] for line in lines]).strip()
+
+
+def _iter_items(text: str) -> Iterator[tuple[str, str]]:
+    """Split the body of a key-value section into its items.
+
+    Keys are the lines starting at the first column, descriptions are the lines
+    following them.
+
+    Parameters
+    ----------
+    text : str
+        Body of the section, after its header.
+
+    Yields
+    ------
+    tuple[str, str]
+        Key line and cleaned description of each item.
+    """
+
+    key: str | None = None
+    lines: list[str] = []
+    for line in text.split("\n"):
+        if line and not line[0].isspace():
+            if key is not None:
+                yield key, _clean_item_lines(lines)
+            key = line
+            lines = []
+        elif key is not None:
+            lines.append(line)
+    if key is not None:
+        yield key, _clean_item_lines(lines)
+
+
+def _scan_params(section: ParamSection, text: str) -> Iterator[DocstringParam]:
+    """Scan the items of a parameters (or attributes) section."""
+
+    for key, value in _iter_items(text):
+        # The key regex matches any line, the whole key is only a fallback.
+        match = PARAM_KEY_REGEX.match(key)
+        arg_name: str = key
+        type_name = is_optional = default = None
+        if match is not None:
+            arg_name = match.group("name")
+            type_name = match.group("type")
+            if type_name is not None:
+                optional_match = PARAM_OPTIONAL_REGEX.match(type_name)
+                if optional_match is not None:
+                    type_name = optional_match.group("type")
+                    is_optional = True
+                else:
+                    is_optional = False
+
+                default_match = PARAM_DEFAULT_REGEX.match(type_name)
+                if default_match is not None:
+                    is_optional = True
+                    type_name = default_match.group("type")
+                    default = default_match.group("value")
+
+        # Defaults not given with the type may be found in the description.
+        if value and default is None:
+            default_match = PARAM_DEFAULT_REGEX_IN_DESC.search(value)
+            if default_match is not None:
+                default = default_match.group("value")
+
+        yield DocstringParam(
+            args=[section.key, arg_name],
+            description=_clean_str(value),
+            arg_name=arg_name,
+            type_name=type_name,
+            is_optional=is_optional,
+            default=default,
+        )
+
+
+def _scan_raises(section: RaisesSection, text: str) -> Iterator[DocstringRaises]:
+    """Scan the items of a raises (or warns) section."""
+
+    for key, value in _iter_items(text):
+        yield DocstringRaises(
+            args=[section.key, key],
+            description=_clean_str(value),
+            type_name=key if len(key) > 0 else None,
+        )
+
+
+def _scan_returns(section: ReturnsSection, text: str) -> Iterator[DocstringReturns]:
+    """Scan the items of a returns (or yields) section."""
+
+    for key, value in _iter_items(text):
+        match = RETURN_KEY_REGEX.match(key)
+        if match is not None:
+            return_name = match.group("name")
+            type_name = match.group("type")
+        else:
+            return_name = None
+            type_name = None
+
+        yield DocstringReturns(
+            args=[section.key],
+            description=_clean_str(value),
+            type_name=type_name,
+            is_generator=section.is_generator,
+            return_name=return_name,
+        )
+
+
+def _parse_section(section: Section, text: str) -> Iterator[DocstringMeta]:
+    """Parse a section without key-value items with docstring_parser itself."""
+    return iter(section.parse(text))
+
+
+# Scanner of each kind of section, by exact section class.
+_SECTION_SCANNERS: dict[type, Callable[[Any, str], Iterator[DocstringMeta]]] = {
+    ParamSection: _scan_params,
+    RaisesSection: _scan_raises,
+    ReturnsSection: _scan_returns,
+    YieldsSection: _scan_returns,
+    ExamplesSection: _parse_section,
+    DeprecationSection: _parse_section,
+    Section: _parse_section,
+}
+
+
+def scan_docstring(text: str | None) -> Docstring | None:
+    """Parse a numpy-style docstring, like docstring_parser but faster.
+
+    Parameters
+    ----------
+    text : str, optional
+        The raw docstring text
+
+    Returns
+    -------
+    Docstring | None
+        The parsed docstring, identical to the result of docstring_parser, or None
+        if the docstring has a section the scanner does not know, in which case it
+        should be parsed with docstring_parser.
+    """
+
+    docstring = Docstring(style=DocstringStyle.NUMPYDOC)
+    if not text:
+        return docstring
+    text = inspect.cleandoc(text)
+
+    # Section headers, as (section, start of header, end of header)
+    headers: list[tuple[Section, int, int]] = []
+    offset = 0
+    for line in text.split("\n"):
+        line_start = offset
+        offset += len(line) + 1
+        if line[:1] not in _HEADER_INITIALS:
+            continue
+        if headers and line_start < headers[-1][2]:
+            continue  # Part of the previous header
+        title = _DIRECTIVE_TITLE if line.startswith("..") else line.rstrip()
+        pattern = _TITLE_PATTERNS.get(title)
+        if pattern is None:
+            continue
+        match = pattern.match(text, line_start)
+        if match is None:
+            continue
+        section = _SECTIONS[title]
+        if type(section) not in _SECTION_SCANNERS:
+            return None
+        headers.append((section, match.start(), match.end()))
+
+    # Break the description into short and long parts
+    parts = text[: headers[0][1] if headers else len(text)].split("\n", 1)
+    docstring.short_description = parts[0] or None
+    if len(parts) > 1:
+        long_description = parts[1] or ""
+        docstring.blank_after_short_description = long_description.startswith("\n")
+        docstring.blank_after_long_description = long_description.endswith("\n\n")
+        docstring.long_description = long_description.strip() or None
+
+    for index, (section, _, body_start) in enumerate(headers):
+        body_end = headers[index + 1][1] if index + 1 < len(headers) else len(text)
+        scan_section = _SECTION_SCANNERS[type(section)]
+        docstring.meta.extend(scan_section(section, text[body_start:body_end]))
+
+    return docstring
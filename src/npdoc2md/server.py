@@ -0,0 +1,498 @@
+"""Resident documentation server, answering JSON-RPC requests for markdown.
+
+The server keeps the documented package imported and the markdown of every module
+it rendered in memory, so that requests such as "render module X" or "render
+everything changed since the last request" are answered without paying for
+interpreter startup and imports again. Requests and responses are JSON-RPC 2.0
+messages, one per line, read from stdin (responses on stdout) or from the
+connections to a local Unix socket.
+
+Available methods:
+- `list_modules`: names and source paths of the modules to document.
+- `render`: markdown of a single module, given its `module` name or source `path`.
+- `render_changed`: markdown of every module whose source changed since the last
+  `render_changed` request (all of them on the first request), along with the
+  modules whose sources were removed.
+- `shutdown`: stop the server.
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+from collections.abc import Iterable
+from logging import getLogger
+from pathlib import Path
+from typing import IO, Any, BinaryIO, cast
+
+from .constants import ENGINES
+from .npdoc2md import (
+    convert_source_file,
+    get_module_and_package_names,
+    get_target_python_files,
+)
+
+logger = getLogger("npdoc2md")
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+CONVERSION_ERROR = -32000
+
+
+class RequestError(Exception):
+    """Error answered to a JSON-RPC request.
+
+    Attributes
+    ----------
+    code : int
+        JSON-RPC error code.
+    message : str
+        Description of the error.
+    """
+
+    def __init__(self, code: int, message: str):
+        """Initialize the error.
+
+        Parameters
+        ----------
+        code : int
+            JSON-RPC error code.
+        message : str
+            Description of the error.
+        """
+
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class DocServer:
+    """Keeps the documented modules and their markdown warm between requests.
+
+    Attributes
+    ----------
+    input_path : Path
+        Path to the input file or directory containing files to document.
+    engine : str
+        Engine used to extract docstrings, one of ENGINES.
+    running : bool
+        False once a shutdown request was handled.
+    """
+
+    def __init__(
+        self,
+        input_path: Path,
+        include_private: bool = False,
+        private_whitelist: list[str] | None = None,
+        engine: str = "import",
+        exclude: list[str] | None = None,
+        include: list[str] | None = None,
+        use_gitignore: bool = False,
+    ):
+        """Initialize the server.
+
+        Parameters
+        ----------
+        input_path : Path
+            Path to the input file or directory containing files to parse
+        include_private : bool, default=False
+            Whether to include private members (those starting with an underscore)
+        private_whitelist : list[str], optional
+            List of private member names to include even if include_private is False
+        engine : str, default="import"
+            Engine used to extract docstrings, one of ENGINES
+        exclude : list[str], optional
+            Glob patterns of files and directories to skip, in addition to the
+            default excludes
+        include : list[str], optional
+            Glob patterns of files to keep. If given, files matching none are skipped.
+        use_gitignore : bool, default=False
+            Whether to skip files and directories ignored by .gitignore files
+
+        Raises
+        ------
+        ValueError
+            If the requested engine is not one of the available engines.
+        """
+
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}.")
+
+        self.input_path = input_path
+        self.include_private = include_private
+        self.private_whitelist = private_whitelist
+        self.engine = engine
+        self.exclude = exclude
+        self.include = include
+        self.use_gitignore = use_gitignore
+        self.running = True
+
+        # Source file -> (stat signature, markdown) of its last rendering
+        self._rendered: dict[Path, tuple[tuple[int, int], str]] = {}
+        # Source file -> stat signature reported by the last render_changed request
+        self._reported: dict[Path, tuple[int, int]] = {}
+        self._modules: dict[str, Path] = {}
+
+    def _discover(self) -> dict[str, Path]:
+        """Discover the source files to document, and the modules they define.
+
+        Returns
+        -------
+        dict[str, Path]
+            Mapping of full module names to their source files.
+        """
+
+        src_files = get_target_python_files(
+            self.input_path,
+            self.include_private,
+            self.private_whitelist,
+            exclude=self.exclude,
+            include=self.include,
+            use_gitignore=self.use_gitignore,
+        )
+        self._modules = {}
+        for src_file in src_files:
+            module_name, package = get_module_and_package_names(
+                src_file, self.input_path
+            )
+            self._modules[f"{package}.{module_name}"] = src_file
+        return self._modules
+
+    def _render_file(self, src_file: Path) -> dict[str, Any]:
+        """Render a source file, reusing its markdown if the file is unchanged.
+
+        Parameters
+        ----------
+        src_file : Path
+            Path to the source file to render.
+
+        Returns
+        -------
+        dict[str, Any]
+            The module name, source path and markdown of the file.
+
+        Raises
+        ------
+        RequestError
+            If the source file cannot be read or converted.
+        """
+
+        try:
+            st = src_file.stat()
+        except OSError as e:
+            raise RequestError(CONVERSION_ERROR, f"Cannot read {src_file}: {e}") from e
+        signature = (st.st_mtime_ns, st.st_size)
+
+        cached = self._rendered.get(src_file)
+        if cached is not None and cached[0] == signature:
+            markdown = cached[1]
+        else:
+            try:
+                markdown = convert_source_file(
+                    src_file,
+                    self.input_path,
+                    include_private=self.include_private,
+                    private_whitelist=self.private_whitelist,
+                    engine=self.engine,
+                    # Modules imported by an earlier request may be outdated
+                    reload=True,
+                )
+            except Exception as e:
+                raise RequestError(
+                    CONVERSION_ERROR, f"Failed to convert {src_file}: {e}"
+                ) from e
+            self._rendered[src_file] = (signature, markdown)
+
+        module_name, package = get_module_and_package_names(src_file, self.input_path)
+        return {
+            "module": f"{package}.{module_name}",
+            "path": str(src_file),
+            "markdown": markdown,
+        }
+
+    def list_modules(self) -> list[dict[str, str]]:
+        """List the modules to document.
+
+        Returns
+        -------
+        list[dict[str, str]]
+            Name and source path of each module.
+        """
+
+        return [
+            {"module": module, "path": str(src_file)}
+            for module, src_file in self._discover().items()
+        ]
+
+    def render(self, module: str | None = None, path: str | None = None) -> dict:
+        """Render a single module.
+
+        Parameters
+        ----------
+        module : str, optional
+            Full name of the module to render.
+        path : str, optional
+            Path to the source file of the module to render, if module is not given.
+            Relative paths are resolved against the current working directory.
+
+        Returns
+        -------
+        dict
+            The module name, source path and markdown of the module.
+
+        Raises
+        ------
+        RequestError
+            If the module is unknown, or cannot be converted.
+        """
+
+        if module is not None:
+            src_file = self._modules.get(module) or self._discover().get(module)
+            if src_file is None:
+                raise RequestError(INVALID_PARAMS, f"Unknown module '{module}'")
+        elif path is not None:
+            # Compare resolved paths, relative and absolute paths name the same file.
+            discovered = {
+                src_file.resolve(): src_file for src_file in self._discover().values()
+            }
+            src_file = discovered.get(Path(path).resolve())
+            if src_file is None:
+                raise RequestError(INVALID_PARAMS, f"Unknown source file '{path}'")
+        else:
+            raise RequestError(INVALID_PARAMS, "Expected a 'module' or 'path'")
+        return self._render_file(src_file)
+
+    def render_changed(self) -> dict[str, Any]:
+        """Render every module whose source changed since the last such request.
+
+        Returns
+        -------
+        dict[str, Any]
+            The rendered modules, those which failed to convert along with the
+            error, and the source paths of the modules that were removed.
+        """
+
+        src_files = set(self._discover().values())
+        rendered, errors = [], []
+        for src_file in sorted(src_files):
+            try:
+                st = src_file.stat()
+            except OSError:
+                continue
+            signature = (st.st_mtime_ns, st.st_size)
+            if self._reported.get(src_file) == signature:
+                continue
+            try:
+                rendered.append(self._render_file(src_file))
+            except RequestError as e:
+                errors.append({"path": str(src_file), "error": e.message})
+            self._reported[src_file] = signature
+
+        removed = sorted(str(path) for path in self._reported.keys() - src_files)
+        for path in self._reported.keys() - src_files:
+            del self._reported[path]
+            self._rendered.pop(path, None)
+        return {"modules": rendered, "errors": errors, "removed": removed}
+
+    def shutdown(self) -> None:
+        """Stop the server once the current request is answered."""
+        self.running = False
+
+    def handle(self, request: Any) -> dict[str, Any] | None:
+        """Handle a single JSON-RPC request.
+
+        Parameters
+        ----------
+        request : Any
+            The decoded JSON-RPC request.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The JSON-RPC response, or None if the request was a notification.
+        """
+
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(
+                request.get("method"), str
+            ):
+                raise RequestError(INVALID_REQUEST, "Invalid JSON-RPC request")
+
+            methods = {
+                "list_modules": self.list_modules,
+                "render": self.render,
+                "render_changed": self.render_changed,
+                "shutdown": self.shutdown,
+            }
+            method = methods.get(request["method"])
+            if method is None:
+                raise RequestError(
+                    METHOD_NOT_FOUND, f"Unknown method '{request['method']}'"
+                )
+
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "Expected named parameters")
+            try:
+                result = method(**params)
+            except TypeError as e:
+                raise RequestError(INVALID_PARAMS, str(e)) from e
+        except RequestError as e:
+            logger.error("Request failed: %s", e.message)
+            response = {"error": {"code": e.code, "message": e.message}}
+        else:
+            response = {"result": result}
+
+        if isinstance(request, dict) and "id" not in request:
+            # Notifications are not answered
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, **response}
+
+    def handle_line(self, line: str) -> str | None:
+        """Handle a single line holding a JSON-RPC request.
+
+        Parameters
+        ----------
+        line : str
+            The JSON encoded request.
+
+        Returns
+        -------
+        str | None
+            The JSON encoded response, or None if no response is due.
+        """
+
+        if not line.strip():
+            return None
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response: dict[str, Any] | None = {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": PARSE_ERROR, "message": f"Parse error: {e}"},
+            }
+        else:
+            response = self.handle(request)
+        return None if response is None else json.dumps(response)
+
+    def serve_stream(self, lines: Iterable[str], output: IO[str]) -> None:
+        """Answer requests read line by line, until shutdown or end of input.
+
+        Parameters
+        ----------
+        lines : Iterable[str]
+            Lines holding JSON-RPC requests (ex: stdin).
+        output : IO[str]
+            Stream the responses are written to, one per line.
+        """
+
+        for line in lines:
+            response = self.handle_line(line)
+            if response is not None:
+                output.write(response + "\n")
+                output.flush()
+            if not self.running:
+                break
+
+    def serve_socket(self, socket_path: Path) -> None:
+        """Answer requests from connections to a Unix socket, until shutdown.
+
+        Connections are handled one at a time, each until the client closes it.
+
+        Parameters
+        ----------
+        socket_path : Path
+            Path of the Unix socket to listen on. A stale socket left at this path
+            is replaced.
+        """
+
+        if socket_path.exists() and stat.S_ISSOCK(socket_path.stat().st_mode):
+            socket_path.unlink()
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                # Both are buffered binary files over the connected socket.
+                rfile = cast(BinaryIO, self.rfile)
+                wfile = cast(BinaryIO, self.wfile)
+                server.serve_stream(
+                    io.TextIOWrapper(rfile, encoding="utf-8"),
+                    io.TextIOWrapper(wfile, encoding="utf-8", write_through=True),
+                )
+
+        with socketserver.UnixStreamServer(str(socket_path), Handler) as unix_server:
+            logger.info("Listening on %s", socket_path)
+            try:
+                while self.running:
+                    unix_server.handle_request()
+            finally:
+                os.unlink(socket_path)
+
+
+def send_request(socket_path: Path, method: str, **params: Any) -> Any:
+    """Send a single request to a server listening on a Unix socket.
+
+    Parameters
+    ----------
+    socket_path : Path
+        Path of the Unix socket the server listens on.
+    method : str
+        Name of the method to call.
+    **params : Any
+        Parameters of the method.
+
+    Returns
+    -------
+    Any
+        The result of the request.
+
+    Raises
+    ------
+    RuntimeError
+        If the server answered with an error.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        message = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as rfile:
+            sock.shutdown(socket.SHUT_WR)
+            response = json.loads(rfile.readline())
+    if "error" in response:
+        raise RuntimeError(response["error"]["message"])
+    return response["result"]
+
+
+def serve(
+    input_path: Path,
+    socket_path: Path | None = None,
+    **options: Any,
+) -> None:
+    """Run a documentation server until it is shut down.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to the input file or directory containing files to document
+    socket_path : Path, optional
+        Path of a Unix socket to listen on. Requests are read from stdin, and
+        answered on stdout, if not given.
+    **options : Any
+        Options passed on to DocServer (ex: engine, include_private).
+    """
+
+    server = DocServer(input_path, **options)
+    if socket_path is None:
+        server.serve_stream(sys.stdin, sys.stdout)
+    else:
+        server.serve_socket(socket_path)
@@ -0,0 +1,171 @@
+"""Deterministic sharding of a build across machines, and merging of the shards.
+
+Large documentation builds can be spread over several CI runners, each converting
+one shard of the source files with `--shard I/N`. Files are assigned to shards by
+size, largest first, each going to the least loaded shard, with ties broken by a
+stable hash of the file's path relative to the input path. Every runner computes
+the same partition from the same checkout, wherever it is located, without any
+coordination, and the shards are balanced by the amount of source they convert.
+
+The output directories of the shards are then combined with `npdoc2md merge`.
+"""
+
+import hashlib
+import heapq
+import os
+from collections.abc import Iterator, Sequence
+from logging import getLogger
+from pathlib import Path
+
+logger = getLogger("npdoc2md")
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a shard specification, ex: 2/4 for the second of four shards.
+
+    Parameters
+    ----------
+    value : str
+        Shard specification, as I/N with 1 <= I <= N
+
+    Returns
+    -------
+    tuple[int, int]
+        Index of the shard, starting at 1, and number of shards
+
+    Raises
+    ------
+    ValueError
+        If the specification is not of the form I/N, or if I is out of range.
+    """
+
+    index, sep, count = value.partition("/")
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        shard = None
+    if not sep or shard is None:
+        raise ValueError(f"Invalid shard '{value}', expected I/N, ex: 1/4.")
+    validate_shard(shard)
+    return shard
+
+
+def validate_shard(shard: tuple[int, int]) -> None:
+    """Check that a shard index is within the number of shards.
+
+    Parameters
+    ----------
+    shard : tuple[int, int]
+        Index of the shard, starting at 1, and number of shards
+
+    Raises
+    ------
+    ValueError
+        If the number of shards is less than 1, or the index is out of range.
+    """
+
+    index, count = shard
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(
+            f"Invalid shard {index}/{count}, expected 1 <= I <= N with N >= 1."
+        )
+
+
+def select_shard(
+    src_files: Sequence[Path], input_path: Path, shard: tuple[int, int]
+) -> list[Path]:
+    """Select the source files converted by a shard of the build.
+
+    Parameters
+    ----------
+    src_files : Sequence[Path]
+        All source files of the build
+    input_path : Path
+        Path to the input file or directory, which paths are hashed relative to
+    shard : tuple[int, int]
+        Index of the shard, starting at 1, and number of shards
+
+    Returns
+    -------
+    list[Path]
+        Source files of the shard, in their original order
+    """
+
+    validate_shard(shard)
+    index, count = shard
+    if count == 1:
+        return list(src_files)
+
+    def sort_key(src_file: Path) -> tuple[int, str]:
+        key = (
+            src_file.relative_to(input_path).as_posix()
+            if input_path.is_dir()
+            else src_file.name
+        )
+        return -sizes[src_file], hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    sizes = {src_file: src_file.stat().st_size for src_file in src_files}
+    # Loads of the shards, as (converted bytes, shard index) pairs.
+    loads = [(0, i) for i in range(1, count + 1)]
+    selected = set()
+    for src_file in sorted(src_files, key=sort_key):
+        load, shard_index = loads[0]
+        # Empty files still cost an import, count them as one byte.
+        heapq.heapreplace(loads, (load + max(sizes[src_file], 1), shard_index))
+        if shard_index == index:
+            selected.add(src_file)
+
+    logger.info(
+        "Shard %d/%d: converting %d of %d files.",
+        index,
+        count,
+        len(selected),
+        len(src_files),
+    )
+    return [src_file for src_file in src_files if src_file in selected]
+
+
+def iter_shard_outputs(shard_paths: Sequence[Path]) -> Iterator[tuple[str, str]]:
+    """Read the output files of several shards of a build, to merge them.
+
+    Hidden files, such as the build manifest and docstring store kept by
+    `--incremental`, are internal to each shard and are not merged.
+
+    Parameters
+    ----------
+    shard_paths : Sequence[Path]
+        Output directories of the shards
+
+    Yields
+    ------
+    tuple[str, str]
+        Posix path relative to the output directory and content of each output
+        file, once even if several shards hold it
+
+    Raises
+    ------
+    ValueError
+        If two shards hold different content for the same output file.
+    """
+
+    hashes: dict[str, tuple[str, Path]] = {}
+    for shard_path in shard_paths:
+        for directory, dirnames, filenames in os.walk(shard_path):
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+            for filename in sorted(filenames):
+                if filename.startswith("."):
+                    continue
+                path = Path(directory) / filename
+                relative_path = path.relative_to(shard_path).as_posix()
+                text = path.read_text(encoding="utf-8")
+                content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if relative_path in hashes:
+                    previous_hash, previous_shard = hashes[relative_path]
+                    if previous_hash != content_hash:
+                        raise ValueError(
+                            f"Conflicting content for {relative_path} in shards "
+                            f"{previous_shard} and {shard_path}."
+                        )
+                    continue
+                hashes[relative_path] = (content_hash, shard_path)
+                yield relative_path, text
@@ -1,9 +1,9 @@
-import inspect
 import os
+import re
 from collections.abc import Callable, Mapping
 from logging import getLogger
 from pathlib import Path
-from types import ModuleType
+from types import FunctionType, ModuleType
 from typing import Final
 
 logger = getLogger("npdoc2md")
@@ -79,13 +79,80 @@ _INVALID_BUILTIN_CLASSES: Final[Mapping[tuple[str, str], str]] = {
 }
 
 
+def _compile_type_replacements_pattern(replacements: Mapping[str, str]) -> re.Pattern:
+    """Compile a single regex matching any of the invalid type names in one pass.
+
+    Parameters
+    ----------
+    replacements : Mapping[str, str]
+        Mapping of invalid, fully qualified type names to their correct names.
+
+    Returns
+    -------
+    re.Pattern
+        Pattern matching any of the invalid type names as a whole dotted name.
+    """
+
+    # Longest names first, since regex alternation picks the first matching branch.
+    alternation = "|".join(
+        re.escape(invalid_type)
+        for invalid_type in sorted(replacements, key=len, reverse=True)
+    )
+    return re.compile(rf"(?<![\w.])(?:{alternation})(?!\w)")
+
+
+_type_replacements: dict[str, str] = {
+    f"{module_name}.{type_name}": correct_type
+    for (module_name, type_name), correct_type in _INVALID_BUILTIN_CLASSES.items()
+}
+_registered_type_replacements: dict[tuple[str, str], str] = {}
+_type_replacements_pattern = _compile_type_replacements_pattern(_type_replacements)
+
+
+def register_type_replacements(replacements: Mapping[tuple[str, str], str]) -> None:
+    """Register additional invalid type names to replace in rendered signatures.
+
+    Useful for types from private or C-extension modules that report an internal
+    module name at runtime (ex: '_mypkg_ext.Handle' instead of 'mypkg.Handle').
+
+    Parameters
+    ----------
+    replacements : Mapping[tuple[str, str], str]
+        Mapping of (module name, type name) pairs to the correct type name.
+    """
+
+    global _type_replacements_pattern
+
+    _registered_type_replacements.update(replacements)
+    _type_replacements.update(
+        {
+            f"{module_name}.{type_name}": correct_type
+            for (module_name, type_name), correct_type in replacements.items()
+        }
+    )
+    _type_replacements_pattern = _compile_type_replacements_pattern(_type_replacements)
+
+
+def get_registered_type_replacements() -> dict[tuple[str, str], str]:
+    """Get the type replacements registered in addition to the built-in ones.
+
+    Returns
+    -------
+    dict[tuple[str, str], str]
+        Mapping of (module name, type name) pairs to the correct type name.
+    """
+
+    return dict(_registered_type_replacements)
+
+
 def sanitize_signature(signature: str) -> str:
     """Sanitize a signature by replacing invalid types with their correct names.
 
     This is necessary because some types are represented in the signature
     as their internal names (e.g., '_io.BytesIO' instead of 'io.BytesIO'),
-    which can be confusing. This function uses a predefined mapping to replace these
-    invalid type representations with their correct, fully qualified names.
+    which can be confusing. This function uses a predefined mapping, extended by
+    any registered replacements, to replace these invalid type representations
+    with their correct, fully qualified names in a single pass over the signature.
 
     Parameters
     ----------
@@ -98,12 +165,9 @@ def sanitize_signature(signature: str) -> str:
         The sanitized signature with invalid types replaced by their correct names.
     """
 
-    for (module_name, type_name), correct_type in _INVALID_BUILTIN_CLASSES.items():
-        invalid_type = f"{module_name}.{type_name}"
-        if invalid_type in signature:
-            signature = signature.replace(invalid_type, correct_type)
-
-    return signature
+    return _type_replacements_pattern.sub(
+        lambda match: _type_replacements[match.group()], signature
+    )
 
 
 def create_output_directory(output_path: Path) -> None:
@@ -121,7 +185,7 @@ def create_output_directory(output_path: Path) -> None:
     """
 
     output_path.mkdir(parents=True, exist_ok=True)
-    logger.info(f"Created output directory at '{output_path}'.")
+    logger.info("Created output directory at '%s'.", output_path)
 
 
 def validate_paths(input_path: Path, output_path: Path) -> None:
@@ -158,7 +222,7 @@ def validate_paths(input_path: Path, output_path: Path) -> None:
 
 
 def get_target_output_file_path(
-    input_file: Path, input_base_path: Path, output_base_path: Path
+    input_file: Path, input_base_path: Path, output_base_path: Path, suffix: str = ".md"
 ) -> Path:
     """Get the output file path for a given input file, preserving directory structure.
 
@@ -170,6 +234,8 @@ def get_target_output_file_path(
         The base path of the input files (used to determine relative paths).
     output_base_path : Path
         The base path for the output markdown files.
+    suffix : str, default=".md"
+        Suffix of the output file, for output formats other than markdown.
 
     Returns
     -------
@@ -185,7 +251,7 @@ def get_target_output_file_path(
     )
 
     # Build the output file path by joining the output base path with the rel path
-    output_file = output_base_path / relative_path.with_suffix(".md")
+    output_file = output_base_path / relative_path.with_suffix(suffix)
 
     return output_file
 
@@ -207,14 +273,25 @@ def get_cls_and_func_defined_in_module(
         objects, and the second maps function names to function objects, for all
         classes and functions defined in the given module.
     """
-    classes = {
-        name: obj
-        for name, obj in inspect.getmembers(module, inspect.isclass)
-        if obj.__module__ == module.__name__
-    }
-    functions = {
-        name: obj
-        for name, obj in inspect.getmembers(module, inspect.isfunction)
-        if obj.__module__ == module.__name__
-    }
+
+    # A single sweep over the module namespace, in the sorted order of dir(). A
+    # module customizing dir() (PEP 562) is read through getattr, like getmembers.
+    namespace = vars(module)
+    lazy = "__dir__" in namespace
+    classes: dict[str, type] = {}
+    functions: dict[str, Callable] = {}
+    for name in dir(module) if lazy else sorted(namespace):
+        if lazy:
+            try:
+                obj = getattr(module, name)
+            except AttributeError:
+                continue
+        else:
+            obj = namespace[name]
+        if isinstance(obj, type):
+            if obj.__module__ == module.__name__:
+                classes[name] = obj
+        # Same check as inspect.isfunction, without importing inspect.
+        elif isinstance(obj, FunctionType) and obj.__module__ == module.__name__:
+            functions[name] = obj
     return classes, functions
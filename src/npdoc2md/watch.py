@@ -0,0 +1,648 @@
+"""Watch mode, regenerating markdown only for modules whose source changed.
+
+Changes to the input tree are detected with inotify where it is available (Linux),
+and by polling file modification times otherwise. Bursts of changes (ex: editors
+writing a file in several steps) are debounced into a single rebuild, which
+reloads and re-renders only the affected modules.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from fnmatch import fnmatchcase
+from logging import getLogger
+from pathlib import Path
+
+from .discovery import DEFAULT_EXCLUDES
+from .formats import FORMAT_SUFFIXES
+from .npdoc2md import (
+    convert_source_file_to_formats,
+    get_target_python_files,
+)
+from .utils import get_target_output_file_path
+from .writer import OutputWriter
+
+logger = getLogger("npdoc2md")
+
+# inotify constants, from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def _is_skipped_dir(name: str) -> bool:
+    """Check if a directory is never watched for changes.
+
+    Parameters
+    ----------
+    name : str
+        Name of the directory.
+
+    Returns
+    -------
+    bool
+        True for hidden directories and default excludes, such as the cache
+        directory written to during builds.
+    """
+
+    return name.startswith(".") or any(
+        fnmatchcase(name, pattern) for pattern in DEFAULT_EXCLUDES
+    )
+
+
+def _iter_watched_dirs(input_path: Path) -> list[Path]:
+    """Get the directories to watch for changes under the input path.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to the input file or directory being documented.
+
+    Returns
+    -------
+    list[Path]
+        The input directory and its subdirectories, excluding hidden directories
+        and default excludes, or the parent directory if the input is a single file.
+    """
+
+    if input_path.is_file():
+        return [input_path.parent]
+
+    dirs = []
+    for dir_path, dir_names, _ in os.walk(input_path):
+        dir_names[:] = [name for name in dir_names if not _is_skipped_dir(name)]
+        dirs.append(Path(dir_path))
+    return dirs
+
+
+class Watcher(ABC):
+    """Base class for detecting changed python files under an input path.
+
+    Attributes
+    ----------
+    input_path : Path
+        Path to the input file or directory being watched.
+    """
+
+    def __init__(self, input_path: Path):
+        """Initialize the watcher.
+
+        Parameters
+        ----------
+        input_path : Path
+            Path to the input file or directory to watch.
+        """
+
+        self.input_path = input_path
+
+    @abstractmethod
+    def wait(self, timeout: float) -> set[Path]:
+        """Wait for python files to change.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time to wait for changes, in seconds.
+
+        Returns
+        -------
+        set[Path]
+            Paths of python files created, modified or deleted. Empty if nothing
+            changed before the timeout.
+        """
+
+    def close(self) -> None:  # noqa: B027, optional to override
+        """Release any resources held by the watcher, none by default."""
+
+
+class PollingWatcher(Watcher):
+    """Watcher comparing modification times and sizes of python files.
+
+    Attributes
+    ----------
+    poll_interval : float
+        Time between two scans of the input path, in seconds.
+    """
+
+    def __init__(self, input_path: Path, poll_interval: float = 0.5):
+        """Initialize the watcher, taking a first snapshot of the input path.
+
+        Parameters
+        ----------
+        input_path : Path
+            Path to the input file or directory to watch.
+        poll_interval : float, default=0.5
+            Time between two scans of the input path, in seconds.
+        """
+
+        super().__init__(input_path)
+        self.poll_interval = poll_interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        """Get the modification time and size of every watched python file.
+
+        Returns
+        -------
+        dict[Path, tuple[int, int]]
+            Mapping of python file paths to their mtime (ns) and size.
+        """
+
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for dir_path in _iter_watched_dirs(self.input_path):
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.endswith(".py") and entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float) -> set[Path]:
+        """Wait for python files to change, scanning every poll interval.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time to wait for changes, in seconds.
+
+        Returns
+        -------
+        set[Path]
+            Paths of python files created, modified or deleted.
+        """
+
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.poll_interval, remaining))
+
+
+class InotifyWatcher(Watcher):
+    """Watcher using the Linux inotify API, through ctypes."""
+
+    def __init__(self, input_path: Path):
+        """Initialize the watcher, adding a watch for every watched directory.
+
+        Parameters
+        ----------
+        input_path : Path
+            Path to the input file or directory to watch.
+
+        Raises
+        ------
+        OSError
+            If inotify is not available, or a watch cannot be added.
+        """
+
+        super().__init__(input_path)
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        for dir_path in _iter_watched_dirs(input_path):
+            self._add_watch(dir_path)
+
+    def _add_watch(self, dir_path: Path) -> None:
+        """Add an inotify watch for a directory.
+
+        Parameters
+        ----------
+        dir_path : Path
+            The directory to watch.
+        """
+
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(dir_path), _IN_WATCH_MASK
+        )
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Cannot watch directory {dir_path}")
+        self._dirs[wd] = dir_path
+
+    def _rescan(self) -> set[Path]:
+        """Get every python file under the input path, after missed events.
+
+        Returns
+        -------
+        set[Path]
+            All python files under the watched directories.
+        """
+
+        return {
+            dir_path / name
+            for dir_path in _iter_watched_dirs(self.input_path)
+            for name in os.listdir(dir_path)
+            if name.endswith(".py")
+        }
+
+    def wait(self, timeout: float) -> set[Path]:
+        """Wait for inotify events on python files.
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time to wait for changes, in seconds.
+
+        Returns
+        -------
+        set[Path]
+            Paths of python files created, modified or deleted.
+        """
+
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not ready:
+            return set()
+
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, name_len = _INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += _INOTIFY_EVENT.size
+            name = os.fsdecode(buffer[offset : offset + name_len].rstrip(b"\0"))
+            offset += name_len
+
+            if mask & _IN_Q_OVERFLOW:
+                logger.warning("Missed file system events, rescanning input path.")
+                return self._rescan()
+
+            dir_path = self._dirs.get(wd)
+            if dir_path is None:
+                continue
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and not _is_skipped_dir(name):
+                    # New subpackage, watch it and pick up any files already in it.
+                    self._add_watch(dir_path / name)
+                    changed.update((dir_path / name).glob("*.py"))
+            elif name.endswith(".py"):
+                changed.add(dir_path / name)
+        return changed
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        os.close(self._fd)
+
+
+def create_watcher(
+    input_path: Path, poll_interval: float = 0.5, use_inotify: bool = True
+) -> Watcher:
+    """Create the best available watcher for the input path.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to the input file or directory to watch.
+    poll_interval : float, default=0.5
+        Time between two scans of the input path when polling, in seconds.
+    use_inotify : bool, default=True
+        Whether to use inotify if it is available.
+
+    Returns
+    -------
+    Watcher
+        An InotifyWatcher on Linux, a PollingWatcher otherwise.
+    """
+
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(input_path)
+        except (OSError, AttributeError) as e:
+            logger.warning("Could not use inotify (%s), falling back to polling.", e)
+    return PollingWatcher(input_path, poll_interval=poll_interval)
+
+
+def wait_for_changes(
+    watcher: Watcher, debounce: float, timeout: float = 1.0
+) -> set[Path]:
+    """Wait for changes, then keep collecting until none arrive for a while.
+
+    Parameters
+    ----------
+    watcher : Watcher
+        The watcher to get changes from.
+    debounce : float
+        Time without further changes after which a burst is considered done.
+    timeout : float, default=1.0
+        Maximum time to wait for the first change, in seconds.
+
+    Returns
+    -------
+    set[Path]
+        Paths of all python files changed during the burst.
+    """
+
+    changed = watcher.wait(timeout)
+    if changed:
+        while more := watcher.wait(debounce):
+            changed |= more
+    return changed
+
+
+class TargetFiles:
+    """Python files to document under the input path, kept up to date across rebuilds.
+
+    The input path is only walked again when a python file it does not know of
+    appears, deleted files are dropped from the targets without walking it.
+
+    Attributes
+    ----------
+    targets : set[Path]
+        Python files to document, after excludes, includes and private filtering.
+    """
+
+    def __init__(
+        self,
+        input_path: Path,
+        include_private: bool = False,
+        private_whitelist: list[str] | None = None,
+        exclude: list[str] | None = None,
+        include: list[str] | None = None,
+        use_gitignore: bool = False,
+    ):
+        """Initialize the target files, discovering them under the input path.
+
+        Parameters
+        ----------
+        input_path : Path
+            Path to the input file or directory containing files to parse
+        include_private : bool, default=False
+            Whether to include private members (those starting with an underscore)
+        private_whitelist : list[str], optional
+            List of private file names to include even if include_private is False
+        exclude : list[str], optional
+            Glob patterns of files and directories to skip, in addition to the defaults
+        include : list[str], optional
+            Glob patterns of files to keep. If given, files matching none are skipped.
+        use_gitignore : bool, default=False
+            Whether to skip files and directories ignored by .gitignore files
+        """
+
+        self._input_path = input_path
+        self._include_private = include_private
+        self._private_whitelist = private_whitelist
+        self._exclude = exclude
+        self._include = include
+        self._use_gitignore = use_gitignore
+        self.targets: set[Path] = set()
+        # Every existing python file seen so far, including filtered out ones, so
+        # that edits to those do not trigger a new discovery.
+        self._known: set[Path] = set()
+        self._discover()
+
+    def _discover(self) -> None:
+        """Walk the input path, replacing the target and known files."""
+
+        self.targets = set(
+            get_target_python_files(
+                self._input_path,
+                self._include_private,
+                self._private_whitelist,
+                exclude=self._exclude,
+                include=self._include,
+                use_gitignore=self._use_gitignore,
+            )
+        )
+        self._known = set(self.targets)
+
+    def update(self, changed: set[Path]) -> set[Path]:
+        """Update the targets from a batch of changed files.
+
+        Parameters
+        ----------
+        changed : set[Path]
+            Paths of python files that were created, modified or deleted.
+
+        Returns
+        -------
+        set[Path]
+            The changed files that are targets, and should be converted.
+        """
+
+        deleted = {path for path in changed if not path.exists()}
+        created = changed - deleted - self._known
+        if created:
+            logger.debug("Discovering target files after %d new files", len(created))
+            self._discover()
+            self._known |= created
+        self.targets -= deleted
+        self._known -= deleted
+        return changed & self.targets
+
+
+def rebuild_changed(
+    changed: set[Path],
+    input_path: Path,
+    output_path: Path,
+    include_private: bool = False,
+    private_whitelist: list[str] | None = None,
+    engine: str = "import",
+    exclude: list[str] | None = None,
+    include: list[str] | None = None,
+    use_gitignore: bool = False,
+    formats: tuple[str, ...] = ("md",),
+    targets: TargetFiles | None = None,
+) -> list[Path]:
+    """Regenerate (or remove) the output files of changed source files.
+
+    Parameters
+    ----------
+    changed : set[Path]
+        Paths of python files that were created, modified or deleted.
+    input_path : Path
+        Path to the input file or directory containing files to parse
+    output_path : Path
+        Path to the output directory where markdown files are saved
+    include_private : bool, default=False
+        Whether to include private members (those starting with an underscore)
+    private_whitelist : list[str], optional
+        List of private member names to include even if include_private is False
+    engine : str, default="import"
+        Engine used to extract docstrings, "import" or "ast"
+    exclude : list[str], optional
+        Glob patterns of files and directories to skip, in addition to the defaults
+    include : list[str], optional
+        Glob patterns of files to keep. If given, files matching none are skipped.
+    use_gitignore : bool, default=False
+        Whether to skip files and directories ignored by .gitignore files
+    formats : tuple[str, ...], default=("md",)
+        Output formats to generate for each module, among "md", "json" and "html"
+    targets : TargetFiles, optional
+        Target files discovered by a previous rebuild, updated with the changed
+        files instead of discovering them again. If not given, they are discovered.
+
+    Returns
+    -------
+    list[Path]
+        Output files that were written or removed. Output files whose content is
+        unchanged are not rewritten.
+    """
+
+    writer = OutputWriter(output_path)
+    if targets is None:
+        targets = TargetFiles(
+            input_path,
+            include_private,
+            private_whitelist,
+            exclude=exclude,
+            include=include,
+            use_gitignore=use_gitignore,
+        )
+    to_convert = targets.update(changed)
+    updated: list[Path] = []
+    for src_file in sorted(changed):
+        output_files = {
+            output_format: get_target_output_file_path(
+                src_file, input_path, output_path, FORMAT_SUFFIXES[output_format]
+            )
+            for output_format in formats
+        }
+        if not src_file.exists():
+            for output_file in output_files.values():
+                if output_file.is_file():
+                    logger.info("Removing %s, its source was deleted.", output_file)
+                    output_file.unlink()
+                    updated.append(output_file)
+            continue
+        if src_file not in to_convert:
+            continue
+
+        try:
+            outputs = convert_source_file_to_formats(
+                src_file,
+                input_path,
+                include_private=include_private,
+                private_whitelist=private_whitelist,
+                engine=engine,
+                reload=True,
+                formats=formats,
+            )
+        except Exception as e:
+            # Keep watching, the file is likely mid-edit.
+            logger.error("Failed to convert %s: %s", src_file, e)
+            continue
+
+        for output_format, text in outputs.items():
+            if writer.write(output_files[output_format], text):
+                updated.append(output_files[output_format])
+
+    return updated
+
+
+def watch(
+    input_path: Path,
+    output_path: Path,
+    include_private: bool = False,
+    private_whitelist: list[str] | None = None,
+    engine: str = "import",
+    exclude: list[str] | None = None,
+    include: list[str] | None = None,
+    use_gitignore: bool = False,
+    debounce: float = 0.2,
+    poll_interval: float = 0.5,
+    use_inotify: bool = True,
+    stop_event: threading.Event | None = None,
+    formats: tuple[str, ...] = ("md",),
+) -> None:
+    """Watch the input path, regenerating the output of changed modules.
+
+    Runs until interrupted, or until the stop event is set.
+
+    Parameters
+    ----------
+    input_path : Path
+        Path to the input file or directory containing files to parse
+    output_path : Path
+        Path to the output directory where markdown files are saved
+    include_private : bool, default=False
+        Whether to include private members (those starting with an underscore)
+    private_whitelist : list[str], optional
+        List of private member names to include even if include_private is False
+    engine : str, default="import"
+        Engine used to extract docstrings, "import" or "ast"
+    exclude : list[str], optional
+        Glob patterns of files and directories to skip, in addition to the defaults
+    include : list[str], optional
+        Glob patterns of files to keep. If given, files matching none are skipped.
+    use_gitignore : bool, default=False
+        Whether to skip files and directories ignored by .gitignore files
+    debounce : float, default=0.2
+        Time without further changes after which a burst of changes is rebuilt.
+    poll_interval : float, default=0.5
+        Time between two scans of the input path when polling, in seconds.
+    use_inotify : bool, default=True
+        Whether to use inotify if it is available.
+    stop_event : threading.Event, optional
+        Event which stops watching once set.
+    formats : tuple[str, ...], default=("md",)
+        Output formats to generate for each module, among "md", "json" and "html"
+    """
+
+    watcher = create_watcher(input_path, poll_interval, use_inotify)
+    targets = TargetFiles(
+        input_path,
+        include_private,
+        private_whitelist,
+        exclude=exclude,
+        include=include,
+        use_gitignore=use_gitignore,
+    )
+    logger.info(
+        "Watching %s for changes using %s...", input_path, type(watcher).__name__
+    )
+    try:
+        while stop_event is None or not stop_event.is_set():
+            changed = wait_for_changes(watcher, debounce)
+            if changed:
+                logger.debug("Detected changes to %d files", len(changed))
+                rebuild_changed(
+                    changed,
+                    input_path,
+                    output_path,
+                    include_private=include_private,
+                    private_whitelist=private_whitelist,
+                    engine=engine,
+                    exclude=exclude,
+                    include=include,
+                    use_gitignore=use_gitignore,
+                    formats=formats,
+                    targets=targets,
+                )
+    finally:
+        watcher.close()
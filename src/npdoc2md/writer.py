@@ -0,0 +1,342 @@
+"""Writer for generated markdown files.
+
+Output files whose content would not change are left untouched, so that their
+modification times stay the same and downstream tools (ex: static site generators,
+rsync) only process pages that actually changed. Files that do change are written
+atomically, through a temporary file renamed over the destination.
+
+Output files can also be streamed into a single zip or tar archive, for pipelines
+shipping the documentation as one artifact, without writing any of them to disk.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+from logging import getLogger
+from pathlib import Path
+from typing import IO, Literal
+
+from ._version import __version__
+from .cache import hash_file
+from .constants import ARCHIVE_FORMATS
+
+logger = getLogger("npdoc2md")
+
+
+def _current_umask() -> int:
+    """Get the process umask, which can only be read by setting it.
+
+    Returns
+    -------
+    int
+        The current umask.
+    """
+
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def _target_mode(path: Path) -> int:
+    """Get the permissions a file written atomically to a path should have.
+
+    mkstemp creates files readable by the owner only, use the permissions the file
+    already has, or would have had if created with open().
+
+    Parameters
+    ----------
+    path : Path
+        The path to the file to write.
+
+    Returns
+    -------
+    int
+        The permission bits of the file.
+    """
+
+    try:
+        return path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_current_umask()
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file atomically, through a temporary file in the same directory.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the file to write.
+    data : bytes
+        The content to write.
+    """
+
+    mode = _target_mode(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+class OutputWriter:
+    """Writes output files, skipping those whose content is unchanged.
+
+    Attributes
+    ----------
+    output_path : Path
+        Path to the output directory, which manifest entries are relative to.
+    written : int
+        Number of files written so far.
+    skipped : int
+        Number of files skipped so far because their content was unchanged.
+    hashes : dict[Path, tuple[str, bool]]
+        Mapping of handled output files to their content hash, and whether they
+        were written (as opposed to skipped).
+    """
+
+    def __init__(self, output_path: Path):
+        """Initialize the writer.
+
+        Parameters
+        ----------
+        output_path : Path
+            Path to the output directory.
+        """
+
+        self.output_path = output_path
+        self.written = 0
+        self.skipped = 0
+        self.hashes: dict[Path, tuple[str, bool]] = {}
+
+    def write(self, path: Path, text: str) -> bool:
+        """Write an output file, unless it already has the given content.
+
+        Parameters
+        ----------
+        path : Path
+            The path to the output file.
+        text : str
+            The content of the output file.
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was skipped.
+        """
+
+        data = text.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        try:
+            unchanged = (
+                path.stat().st_size == len(data) and hash_file(path) == content_hash
+            )
+        except FileNotFoundError:
+            unchanged = False
+
+        if unchanged:
+            logger.debug("Skipping %s, its content is unchanged.", path)
+            self.skipped += 1
+        else:
+            logger.info("Writing %s...", path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, data)
+            self.written += 1
+
+        self.hashes[path] = (content_hash, not unchanged)
+        return not unchanged
+
+    def save_manifest(self, manifest_path: Path) -> None:
+        """Write a JSON manifest of the content hashes of all handled output files.
+
+        Parameters
+        ----------
+        manifest_path : Path
+            The path to the manifest file. Output files are listed by their posix
+            path relative to the output directory, along with their sha256 hash and
+            whether they were changed by this run.
+        """
+
+        manifest = {
+            "version": __version__,
+            "files": {
+                path.relative_to(self.output_path).as_posix(): {
+                    "sha256": content_hash,
+                    "changed": changed,
+                }
+                for path, (content_hash, changed) in sorted(self.hashes.items())
+            },
+        }
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(
+            manifest_path,
+            (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8"),
+        )
+        logger.info("Wrote output manifest to %s", manifest_path)
+
+    def close(self) -> None:
+        """Finish writing. Output files are written as they come, nothing is left."""
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+# tarfile mode to write each tar format of ARCHIVE_FORMATS with.
+_TAR_MODES: dict[str, Literal["w:", "w:gz", "w:bz2", "w:xz"]] = {
+    "w:": "w:",
+    "w:gz": "w:gz",
+    "w:bz2": "w:bz2",
+    "w:xz": "w:xz",
+}
+
+# Zip archives cannot hold dates before 1980-01-01.
+_ZIP_EPOCH = 315532800
+
+
+def get_archive_format(path: Path) -> str:
+    """Get the format of an archive from its name.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the archive.
+
+    Returns
+    -------
+    str
+        "zip", or the tarfile mode to write the archive with.
+
+    Raises
+    ------
+    ValueError
+        If the name of the archive does not end with a suffix of ARCHIVE_FORMATS.
+    """
+
+    for suffix, archive_format in ARCHIVE_FORMATS.items():
+        if path.name.endswith(suffix):
+            return archive_format
+    raise ValueError(
+        f"Unknown archive format for '{path}', expected one of "
+        f"{', '.join(ARCHIVE_FORMATS)}."
+    )
+
+
+class ArchiveWriter(OutputWriter):
+    """Writes output files into a zip or tar archive, instead of a directory.
+
+    Files are compressed into the archive as they come, without being written to
+    disk. The archive is built in a temporary file renamed over the destination
+    once complete, and discarded if writing fails. Entries are timestamped with
+    SOURCE_DATE_EPOCH if set, for reproducible archives.
+
+    Attributes
+    ----------
+    archive_path : Path
+        Path to the archive.
+    """
+
+    def __init__(self, archive_path: Path, output_path: Path = Path(".")):
+        """Create the archive.
+
+        Parameters
+        ----------
+        archive_path : Path
+            Path to the archive, its format is given by its suffix (see
+            ARCHIVE_FORMATS).
+        output_path : Path, default=Path(".")
+            Path to the output directory the files would be saved in, which paths
+            in the archive are relative to.
+
+        Raises
+        ------
+        ValueError
+            If the format of the archive is unknown.
+        """
+
+        super().__init__(output_path)
+        self.archive_path = archive_path
+        self._format = get_archive_format(archive_path)
+        self._mtime = int(os.environ.get("SOURCE_DATE_EPOCH", time.time()))
+        self._mode = _target_mode(archive_path)
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_name = tempfile.mkstemp(
+            dir=archive_path.parent, prefix=f".{archive_path.name}."
+        )
+        self._file: IO[bytes] = os.fdopen(fd, "wb")
+        self._archive: zipfile.ZipFile | tarfile.TarFile
+        if self._format == "zip":
+            self._archive = zipfile.ZipFile(self._file, "w", zipfile.ZIP_DEFLATED)
+        else:
+            self._archive = tarfile.open(
+                fileobj=self._file, mode=_TAR_MODES[self._format]
+            )
+
+    def write(self, path: Path, text: str) -> bool:
+        """Add an output file to the archive.
+
+        Parameters
+        ----------
+        path : Path
+            The path to the output file, under the output directory.
+        text : str
+            The content of the output file.
+
+        Returns
+        -------
+        bool
+            Always True, archives are written from scratch.
+        """
+
+        data = text.encode("utf-8")
+        name = path.relative_to(self.output_path).as_posix()
+        logger.debug("Adding %s to %s", name, self.archive_path)
+        if isinstance(self._archive, zipfile.ZipFile):
+            info = zipfile.ZipInfo(name, time.gmtime(max(self._mtime, _ZIP_EPOCH))[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            self._archive.writestr(info, data)
+        else:
+            tar_info = tarfile.TarInfo(name)
+            tar_info.size = len(data)
+            tar_info.mtime = self._mtime
+            tar_info.mode = 0o644
+            self._archive.addfile(tar_info, io.BytesIO(data))
+
+        self.hashes[path] = (hashlib.sha256(data).hexdigest(), True)
+        self.written += 1
+        return True
+
+    def close(self) -> None:
+        """Complete the archive, and move it to its destination."""
+
+        self._archive.close()
+        self._file.close()
+        os.chmod(self._tmp_name, self._mode)
+        os.replace(self._tmp_name, self.archive_path)
+        logger.info("Wrote %d files to %s", self.written, self.archive_path)
+
+    def abort(self) -> None:
+        """Discard the archive, leaving any previous one in place."""
+
+        self._archive.close()
+        self._file.close()
+        os.unlink(self._tmp_name)
+
+    def __exit__(self, *exc_info: object) -> None:
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.abort()
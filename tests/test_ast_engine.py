@@ -0,0 +1,230 @@
+import ast
+import inspect
+import re
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+
+import pytest
+from docstring_parser import Docstring
+
+from npdoc2md.ast_engine import (
+    _build_name_table,
+    _make_annotator,
+    format_signature,
+    module_element_from_source,
+)
+from npdoc2md.memo import DEFAULT_MAX_ENTRIES
+from npdoc2md.npdoc2md import npdoc2md
+
+# What the ast engine cannot know without importing: default values computed at
+# runtime, and the modules defining names re-exported by another module. Each gap
+# rewrites the ast engine's rendering into the import engine's.
+KNOWN_GAPS = [
+    (r"= DEFAULT_MAX_ENTRIES\b", f"= {DEFAULT_MAX_ENTRIES}"),
+    (r"= Path\('\.'\)", f"= {Path('.')!r}"),
+    (r"\bimportlib\.machinery\.ModuleSpec\b", f"{ModuleSpec.__module__}.ModuleSpec"),
+    (r"\bdocstring_parser\.(Docstring\w*)", rf"{Docstring.__module__}.\1"),
+]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "def f(): pass",
+        "def f(a, b=1, *args, c, d='x', **kwargs): pass",
+        "def f(a, /, b, *, c=None): pass",
+        "def f(a: int, b: str = 'x', *args: int, **kwargs: float) -> None: pass",
+        "def f(a: list[dict[str, int]] | None = None) -> tuple[int, ...]: pass",
+        "async def f(a: bytes = b'', b: float = -1.5, c=(1, 2)) -> bool: pass",
+        "def f(a: 'int', *, b: type = None) -> 'str': pass",
+    ],
+)
+def test_format_signature_matches_inspect(source):
+    namespace: dict = {}
+    exec(source, namespace)
+    node = ast.parse(source).body[0]
+    assert isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+
+    annotate = _make_annotator({}, postponed=False)
+    assert format_signature(node, annotate) == str(inspect.signature(namespace["f"]))
+
+
+def test_format_signature_resolves_imported_names():
+    source = """
+from pathlib import Path
+from types import ModuleType
+from typing import Optional
+import collections.abc
+import numpy as np
+
+def f(path: Path, module: ModuleType, arr: np.ndarray) -> Optional[Path]: pass
+def g(func: collections.abc.Callable) -> None: pass
+"""
+    tree = ast.parse(source)
+    annotate = _make_annotator(
+        _build_name_table(tree.body, "pkg.mod", "pkg"), postponed=False
+    )
+    f, g = (node for node in tree.body if isinstance(node, ast.FunctionDef))
+    assert (
+        format_signature(f, annotate)
+        == "(path: pathlib.Path, module: module, arr: numpy.ndarray)"
+        " -> Optional[pathlib.Path]"
+    )
+    assert format_signature(g, annotate) == "(func: collections.abc.Callable) -> None"
+
+
+def test_module_element_from_source_members(tmp_path: Path):
+    src_file = tmp_path / "mod.py"
+    src_file.write_text(
+        '''"""Module docstring."""
+
+class Zeta:
+    def visible(self, x: int) -> int:
+        """Visible method."""
+
+    def _hidden(self): ...
+
+    @property
+    def prop(self): ...
+
+    @staticmethod
+    def static(): ...
+
+
+class Alpha(Zeta):
+    """Alpha class."""
+
+
+def beta(): ...
+
+
+def _private(): ...
+'''
+    )
+
+    element = module_element_from_source(src_file, "pkg.mod", "pkg")
+    assert element.name == "pkg.mod"
+    assert element.docstring.short_description == "Module docstring."
+    assert [cls.name for cls in element.classes] == ["Alpha", "Zeta"]
+    assert element.classes[0].signature == "class Alpha(Zeta)"
+    assert element.classes[1].signature == "class Zeta(object)"
+    assert [method.name for method in element.classes[1].methods] == ["visible"]
+    assert element.classes[1].methods[0].signature == "def visible(self, x: int) -> int"
+    assert [func.name for func in element.functions] == ["beta"]
+
+    element = module_element_from_source(
+        src_file, "pkg.mod", "pkg", private_whitelist=["_hidden"]
+    )
+    assert [method.name for method in element.classes[1].methods] == [
+        "visible",
+        "_hidden",
+    ]
+
+
+def test_ast_engine_matches_expected_output():
+    output = npdoc2md(Path("src/npdoc2md/utils.py"), Path("docs"), engine="ast")
+    with open("tests/expected_output/utils.md") as fp:
+        assert output[Path("docs/utils.md")] == fp.read()
+
+
+def test_ast_engine_matches_import_engine_on_package():
+    src = Path("src/npdoc2md")
+    # Imported in worker subprocesses, so that the modules of this process are
+    # not reloaded.
+    expected = npdoc2md(
+        src, Path("docs"), private_whitelist=["__init__"], isolated=True
+    )
+    output = npdoc2md(src, Path("docs"), private_whitelist=["__init__"], engine="ast")
+
+    assert list(output) == list(expected)
+    for output_file, text in output.items():
+        lines = text.splitlines()
+        for index, line in enumerate(lines):
+            if line.startswith("def "):
+                for pattern, replacement in KNOWN_GAPS:
+                    lines[index] = re.sub(pattern, replacement, lines[index])
+        assert lines == expected[output_file].splitlines(), output_file
+
+
+def test_ast_engine_aliases_bases_and_typing(tmp_path: Path):
+    src_file = tmp_path / "mod.py"
+    src_file.write_text(
+        """from types import ModuleType
+from typing import Any, Optional, Protocol
+import collections.abc as abc
+
+Handler = abc.Callable[[Any], None]
+
+
+class Loader(ModuleType):
+    def load(self, data: dict[str, Any]) -> Optional[Any]: ...
+
+    reload = load
+
+
+class Named(Protocol):
+    name: str
+
+
+def handle(handler: Handler) -> Any: ...
+
+
+LegacyLoader = Loader
+process = handle
+"""
+    )
+
+    element = module_element_from_source(
+        src_file, "mod", "", private_whitelist=["__init__"]
+    )
+
+    assert [cls.name for cls in element.classes] == ["Loader", "Loader", "Named"]
+    assert element.classes[0].signature == "class Loader(module)"
+    assert [method.signature for method in element.classes[0].methods] == [
+        "def load(self, data: dict[str, typing.Any]) -> Optional[Any]",
+        "def reload(self, data: dict[str, typing.Any]) -> Optional[Any]",
+    ]
+    assert [method.signature for method in element.classes[2].methods] == [
+        "def __init__(self, *args, **kwargs)"
+    ]
+    assert [func.signature for func in element.functions] == [
+        "def handle(handler: collections.abc.Callable[[typing.Any], None]) -> Any",
+        "def process(handler: collections.abc.Callable[[typing.Any], None]) -> Any",
+    ]
+
+
+def test_ast_engine_skips_type_checking_blocks(tmp_path: Path):
+    src_file = tmp_path / "mod.py"
+    src_file.write_text(
+        """import typing
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections import OrderedDict as Mapping
+
+    class Stub: ...
+
+    def stub(): ...
+
+else:
+    Mapping = dict
+
+if typing.TYPE_CHECKING:
+    def typed_stub(): ...
+
+if True:
+    def runtime(data: Mapping) -> None: ...
+"""
+    )
+
+    element = module_element_from_source(src_file, "mod", "")
+
+    assert element.classes == []
+    assert [func.signature for func in element.functions] == [
+        "def runtime(data: Mapping) -> None"
+    ]
+
+
+def test_npdoc2md_unknown_engine():
+    with pytest.raises(ValueError):
+        npdoc2md(Path("src/npdoc2md/utils.py"), Path("docs"), engine="unknown")
@@ -0,0 +1,139 @@
+import os
+import sys
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from npdoc2md.__main__ import main
+from npdoc2md.cache import (
+    DEFAULT_CACHE_DIR_NAME,
+    MANIFEST_FILE_NAME,
+    BuildManifest,
+    hash_file,
+)
+from npdoc2md.memo import DOCSTRING_STORE_FILE_NAME
+from npdoc2md.npdoc2md import (
+    configure_docstring_cache,
+    get_docstring_cache,
+    iter_npdoc2md,
+    npdoc2md,
+)
+
+
+def test_build_manifest_roundtrip(tmp_path: Path):
+    output_file = tmp_path / "module.md"
+    output_file.touch()
+
+    manifest = BuildManifest(tmp_path, options={"engine": "ast"})
+    assert not manifest.is_up_to_date("module.py", "abc", output_file)
+    manifest.record("module.py", "abc", output_file)
+    manifest.record("removed.py", "def", tmp_path / "removed.md")
+    manifest.save(["module.py"])
+    assert (tmp_path / MANIFEST_FILE_NAME).is_file()
+
+    reloaded = BuildManifest(tmp_path, options={"engine": "ast"})
+    assert reloaded.is_up_to_date("module.py", "abc", output_file)
+    assert not reloaded.is_up_to_date("module.py", "changed", output_file)
+    assert "removed.py" not in reloaded.entries
+
+    # Missing outputs must be regenerated
+    output_file.unlink()
+    assert not reloaded.is_up_to_date("module.py", "abc", output_file)
+
+
+def test_build_manifest_discarded_on_option_change(tmp_path: Path):
+    manifest = BuildManifest(tmp_path, options={"engine": "ast"})
+    manifest.record("module.py", "abc", tmp_path / "module.md")
+    manifest.save(["module.py"])
+
+    assert BuildManifest(tmp_path, options={"engine": "import"}).entries == {}
+
+
+def test_build_manifest_ignores_corrupt_file(tmp_path: Path):
+    (tmp_path / MANIFEST_FILE_NAME).write_text("{not json")
+    assert BuildManifest(tmp_path, options={}).entries == {}
+
+
+def test_npdoc2md_incremental(tmp_path: Path):
+    input_path = tmp_path / "pkg"
+    output_path = tmp_path / "docs"
+    input_path.mkdir()
+    output_path.mkdir()
+    (input_path / "first.py").write_text('"""First module."""\n')
+    (input_path / "second.py").write_text('"""Second module."""\n')
+
+    def run() -> dict[Path, str]:
+        outputs = npdoc2md(input_path, output_path, engine="ast", cache_dir=output_path)
+        for output_file, text in outputs.items():
+            output_file.write_text(text)
+        return outputs
+
+    assert set(run()) == {output_path / "first.md", output_path / "second.md"}
+    assert run() == {}
+
+    (input_path / "second.py").write_text('"""Second module, edited."""\n')
+    assert set(run()) == {output_path / "second.md"}
+
+    (output_path / "first.md").unlink()
+    assert set(run()) == {output_path / "first.md"}
+
+
+def test_hash_file(tmp_path: Path):
+    file = tmp_path / "file.py"
+    file.write_text("x = 1\n")
+    first = hash_file(file)
+    assert first == hash_file(file)
+    file.write_text("x = 2\n")
+    assert hash_file(file) != first
+
+
+def test_iter_npdoc2md_records_only_consumed_files(tmp_path: Path):
+    input_path = tmp_path / "pkg"
+    input_path.mkdir()
+    (input_path / "first.py").write_text('"""First module."""\n')
+    (input_path / "second.py").write_text('"""Second module."""\n')
+
+    generator = iter_npdoc2md(input_path, tmp_path, engine="ast", cache_dir=tmp_path)
+    output_file, text = next(generator)
+    output_file.write_text(text)
+    next(generator)  # Resuming records the first file, the second is never written
+    generator.close()
+
+    assert set(BuildManifest(tmp_path, options={}).entries) == set()
+    manifest = BuildManifest(
+        tmp_path,
+        options={
+            "include_private": False,
+            "private_whitelist": None,
+            "engine": "ast",
+            "formats": ["md"],
+            "type_replacements": {},
+        },
+    )
+    assert set(manifest.entries) == {"first.py"}
+
+
+def test_cli_incremental_keeps_cache_out_of_output(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+):
+    input_path = tmp_path / "pkg"
+    output_path = tmp_path / "docs"
+    input_path.mkdir()
+    (input_path / "first.py").write_text('"""First module."""\n')
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["npdoc2md", "--incremental", "--engine", "ast", str(input_path)]
+        + [str(output_path)],
+    )
+    try:
+        main()
+    finally:
+        get_docstring_cache().close()
+        configure_docstring_cache()
+
+    assert os.listdir(output_path) == ["first.md"]
+    cache_dir = input_path / DEFAULT_CACHE_DIR_NAME
+    assert (cache_dir / MANIFEST_FILE_NAME).is_file()
+    assert (cache_dir / DOCSTRING_STORE_FILE_NAME).is_file()
+    assert (cache_dir / ".gitignore").read_text().endswith("*\n")
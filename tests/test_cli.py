@@ -1,3 +1,5 @@
+import ast
+import json
 import logging
 import subprocess
 import sys
@@ -5,10 +7,17 @@ from io import StringIO
 from pathlib import Path
 
 import pytest
-from pytest import LogCaptureFixture, MonkeyPatch
+from pytest import CaptureFixture, LogCaptureFixture, MonkeyPatch
 
 from npdoc2md.__main__ import main
-from npdoc2md._log import COLOR_MAP, ColorFormatter, handler, logger
+from npdoc2md._log import (
+    COLOR_MAP,
+    RESET,
+    ColorFormatter,
+    handler,
+    json_handler,
+    logger,
+)
 from npdoc2md._version import __version__
 
 
@@ -118,3 +127,92 @@ def test_log_levels_in_color(monkeypatch: MonkeyPatch, tmp_path: Path):
     assert (
         f"{COLOR_MAP[logging.WARNING]}WARNING" in output
     )  # WARNING should be bright yellow
+
+
+def test_color_formatter_leaves_record_unchanged():
+    fmt = "%(levelname)-8s | %(message)s"
+    record = logging.LogRecord("npdoc2md", logging.INFO, "", 0, "%d files", (3,), None)
+
+    colored = ColorFormatter(fmt, use_color=True).format(record)
+    plain = ColorFormatter(fmt, use_color=False).format(record)
+
+    assert colored == f"{COLOR_MAP[logging.INFO]}INFO    {RESET} | 3 files"
+    assert plain == "INFO     | 3 files"
+    assert record.levelname == "INFO"
+
+
+def test_log_format_json(monkeypatch: MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["npdoc2md", "--verbose", "--log-format", "json", "src/npdoc2md/utils.py"]
+        + [str(tmp_path)],
+    )
+    captured = StringIO()
+    monkeypatch.setattr(json_handler, "stream", captured)
+
+    main()
+
+    # The queued records are written out by the time main() returns.
+    entries = [json.loads(line) for line in captured.getvalue().splitlines()]
+    assert {entry["level"] for entry in entries} == {"DEBUG", "INFO"}
+    assert {entry["logger"] for entry in entries} == {"npdoc2md"}
+    assert "Processing file src/npdoc2md/utils.py as module utils" in [
+        entry["message"] for entry in entries
+    ]
+
+
+def test_log_calls_are_lazy():
+    # Messages are only formatted if their level is enabled, not by f-strings.
+    eager = [
+        f"{src_file}:{node.lineno}"
+        for src_file in sorted(Path("src/npdoc2md").glob("*.py"))
+        for node in ast.walk(ast.parse(src_file.read_text(encoding="utf-8")))
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "logger"
+        and any(isinstance(arg, ast.JoinedStr) for arg in node.args)
+    ]
+    assert eager == []
+
+
+def test_generate_md_with_ast_engine(tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["npdoc2md", "--engine", "ast", "src/npdoc2md/utils.py", str(tmp_path)],
+    )
+    main()
+
+    with open("tests/expected_output/utils.md") as fp:
+        expected_md = fp.read()
+
+    assert (tmp_path / "utils.md").read_text() == expected_md
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2"])
+def test_invalid_jobs(
+    jobs: str, tmp_path: Path, monkeypatch: MonkeyPatch, capsys: CaptureFixture[str]
+):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["npdoc2md", "--jobs", jobs, "src/npdoc2md/utils.py", str(tmp_path)],
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+
+    assert excinfo.value.code == 2
+    assert "--jobs must be >= 1" in capsys.readouterr().err
+
+
+def test_input_path_named_like_a_subcommand(tmp_path: Path, monkeypatch: MonkeyPatch):
+    (tmp_path / "serve").mkdir()
+    (tmp_path / "serve" / "module.py").write_text('"""Served module."""\n')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["npdoc2md", "--engine", "ast", "./serve", "docs"])
+    main()
+
+    assert (tmp_path / "docs" / "module.md").exists()
@@ -0,0 +1,128 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from npdoc2md.discovery import GitIgnore, iter_python_files
+
+
+@pytest.fixture
+def source_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "project"
+    for file in [
+        "pkg/__init__.py",
+        "pkg/module.py",
+        "pkg/sub/nested.py",
+        "pkg/_vendor/lib.py",
+        "pkg/generated_pb2.py",
+        "pkg/notes.txt",
+        ".venv/lib/site.py",
+        "build/lib/pkg/module.py",
+        "node_modules/dep/tool.py",
+        "pkg/__pycache__/module.py",
+        "pkg.egg-info/setup.py",
+    ]:
+        (root / file).parent.mkdir(parents=True, exist_ok=True)
+        (root / file).touch()
+    return root
+
+
+def relative_files(root: Path, **kwargs) -> list[str]:
+    return [
+        path.relative_to(root).as_posix() for path in iter_python_files(root, **kwargs)
+    ]
+
+
+def test_default_excludes(source_tree: Path):
+    assert relative_files(source_tree) == [
+        "pkg/__init__.py",
+        "pkg/_vendor/lib.py",
+        "pkg/generated_pb2.py",
+        "pkg/module.py",
+        "pkg/sub/nested.py",
+    ]
+
+
+def test_exclude_and_include_patterns(source_tree: Path):
+    assert relative_files(source_tree, exclude=["_vendor", "*_pb2.py"]) == [
+        "pkg/__init__.py",
+        "pkg/module.py",
+        "pkg/sub/nested.py",
+    ]
+    assert relative_files(source_tree, include=["pkg/sub/*"]) == ["pkg/sub/nested.py"]
+    module = source_tree / "pkg" / "module.py"
+    assert list(iter_python_files(module)) == [module]
+
+
+def test_symlinked_directories_are_not_followed(source_tree: Path):
+    (source_tree / "pkg" / "loop").symlink_to("..", target_is_directory=True)
+    (source_tree / "pkg" / "dangling.py").symlink_to("missing.py")
+    (source_tree / "pkg" / "linked.py").symlink_to("module.py")
+    assert relative_files(source_tree) == [
+        "pkg/__init__.py",
+        "pkg/_vendor/lib.py",
+        "pkg/generated_pb2.py",
+        "pkg/linked.py",
+        "pkg/module.py",
+        "pkg/sub/nested.py",
+    ]
+
+
+def test_excluded_directories_are_pruned(source_tree: Path, monkeypatch):
+    scanned = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        scanned.append(Path(path).relative_to(source_tree).as_posix())
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    list(iter_python_files(source_tree, exclude=["_vendor"]))
+    assert sorted(scanned) == [".", "pkg", "pkg/sub"]
+
+
+def test_gitignore(source_tree: Path):
+    (source_tree / ".git").mkdir()
+    (source_tree / ".gitignore").write_text("# comment\n*_pb2.py\nsub/\n")
+    (source_tree / "pkg" / ".gitignore").write_text("_vendor/*\n!_vendor/lib.py\n")
+
+    assert relative_files(source_tree) == [
+        "pkg/__init__.py",
+        "pkg/_vendor/lib.py",
+        "pkg/generated_pb2.py",
+        "pkg/module.py",
+        "pkg/sub/nested.py",
+    ]
+    assert relative_files(source_tree, use_gitignore=True) == [
+        "pkg/__init__.py",
+        "pkg/_vendor/lib.py",
+        "pkg/module.py",
+    ]
+    # .gitignore files of parent directories apply when documenting a subdirectory
+    assert relative_files(source_tree / "pkg", use_gitignore=True) == [
+        "__init__.py",
+        "_vendor/lib.py",
+        "module.py",
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.py", "a/b/c.py", False, True),
+        ("/c.py", "a/c.py", False, None),
+        ("a/*.py", "a/c.py", False, True),
+        ("a/*.py", "a/b/c.py", False, None),
+        ("a/**/c.py", "a/b/d/c.py", False, True),
+        ("**/b", "a/b", True, True),
+        ("b/", "a/b", False, None),
+        ("b/", "a/b", True, True),
+        ("c[0-9].py", "c1.py", False, True),
+        ("!c.py", "c.py", False, False),
+    ],
+)
+def test_gitignore_patterns(
+    tmp_path: Path, pattern: str, path: str, is_dir: bool, expected: bool | None
+):
+    gitignore = GitIgnore(tmp_path, [pattern])
+    assert gitignore.match(tmp_path / path, is_dir) is expected
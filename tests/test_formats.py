@@ -0,0 +1,182 @@
+import json
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from npdoc2md.__main__ import main
+from npdoc2md.formats import (
+    IR_FORMAT,
+    JSON_SCHEMA_VERSION,
+    render_html,
+    validate_formats,
+)
+from npdoc2md.npdoc2md import (
+    convert_source_file,
+    convert_source_file_to_formats,
+    iter_npdoc2md,
+)
+from npdoc2md.profiling import profiling
+
+UTILS = Path("src/npdoc2md/utils.py")
+
+
+class _Headings(HTMLParser):
+    """Collect the ids of the headings of an html page."""
+
+    def __init__(self):
+        super().__init__()
+        self.ids: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]):
+        if tag[0] == "h" and tag[1:].isdigit():
+            self.ids.extend(value for name, value in attrs if name == "id" and value)
+
+
+@pytest.mark.parametrize("engine", ["import", "ast"])
+def test_formats_share_one_import_and_render(engine: str):
+    with profiling() as profiler:
+        outputs = convert_source_file_to_formats(
+            UTILS, UTILS, engine=engine, formats=("md", "json", "html")
+        )
+
+    assert list(outputs) == ["md", "json", "html"]
+    assert outputs["md"] == convert_source_file(UTILS, UTILS, engine=engine)
+    if engine == "import":
+        assert profiler.phases["import"][1] == 1
+    # One render phase for all the formats
+    assert profiler.phases["render"][1] == 1
+
+
+def test_json_schema():
+    data = json.loads(
+        convert_source_file_to_formats(UTILS, UTILS, formats=["json"])["json"]
+    )
+
+    assert data["schema_version"] == JSON_SCHEMA_VERSION
+    assert data["kind"] == "module"
+    assert data["name"] == "npdoc2md.utils"
+    assert data["classes"] == []
+    function = next(
+        function
+        for function in data["functions"]
+        if function["name"] == "get_target_output_file_path"
+    )
+    assert function["kind"] == "function"
+    assert function["level"] == 2
+    assert function["signature"].startswith("def get_target_output_file_path(")
+    assert function["docstring"]["params"][-1] == {
+        "arg_name": "suffix",
+        "type_name": "str",
+        "is_optional": True,
+        "default": '".md"',
+        "description": "Suffix of the output file, for output formats other than "
+        "markdown.",
+    }
+    assert function["docstring"]["returns"]["type_name"] == "Path"
+
+
+def test_html_page():
+    outputs = convert_source_file_to_formats(UTILS, UTILS, formats=["json", "html"])
+    data = json.loads(outputs["json"])
+    assert render_html(data) == outputs["html"]
+
+    headings = _Headings()
+    headings.feed(outputs["html"])
+    assert headings.ids == [
+        "npdoc2md.utils",
+        *(function["name"] for function in data["functions"]),
+    ]
+    assert '<a href="#sanitize_signature">sanitize_signature</a>' in outputs["html"]
+
+
+def test_html_is_escaped():
+    data = {
+        "kind": "module",
+        "name": "mod",
+        "signature": None,
+        "level": 1,
+        "docstring": {
+            "short_description": "A <b>bold</b> claim.",
+            "description": "A <b>bold</b> claim.",
+            "params": [],
+            "returns": None,
+            "raises": [],
+            "examples": [{"snippet": ">>> 1 < 2", "description": "True"}],
+        },
+        "classes": [],
+        "functions": [],
+    }
+    page = render_html(data)
+    assert "<b>" not in page
+    assert "&lt;b&gt;bold&lt;/b&gt;" in page
+    assert "&gt;&gt;&gt; 1 &lt; 2" in page
+
+
+def test_iter_npdoc2md_yields_every_format(tmp_path: Path):
+    outputs = list(
+        iter_npdoc2md(
+            Path("src/npdoc2md"),
+            tmp_path,
+            engine="ast",
+            include=["utils.py", "writer.py"],
+            formats=["html", "md"],
+        )
+    )
+    assert [output_file for output_file, _ in outputs] == [
+        tmp_path / "utils.html",
+        tmp_path / "utils.md",
+        tmp_path / "writer.html",
+        tmp_path / "writer.md",
+    ]
+
+
+def test_ir_format_matches_json(tmp_path: Path):
+    outputs = dict(
+        iter_npdoc2md(UTILS, tmp_path, engine="ast", formats=["json", IR_FORMAT])
+    )
+    data = json.loads(outputs[tmp_path / "utils.json"])
+    del data["schema_version"]
+    assert "\n" not in outputs[tmp_path / "utils.ir"]
+    assert json.loads(outputs[tmp_path / "utils.ir"]) == data
+
+
+@pytest.mark.parametrize("formats", [[], ["md", "pdf"], ["md", "ir"]])
+def test_invalid_formats(formats: list[str]):
+    with pytest.raises(ValueError):
+        validate_formats(formats)
+
+
+def test_cli_formats(tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "npdoc2md",
+            "--format",
+            "md,json",
+            "--format",
+            "html,md",
+            str(UTILS),
+            str(tmp_path),
+        ],
+    )
+    main()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "utils.html",
+        "utils.json",
+        "utils.md",
+    ]
+    expected_md = Path("tests/expected_output/utils.md").read_text()
+    assert (tmp_path / "utils.md").read_text() == expected_md
+
+
+def test_cli_rejects_unknown_format(tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(
+        sys, "argv", ["npdoc2md", "--format", "pdf", str(UTILS), str(tmp_path)]
+    )
+    with pytest.raises(SystemExit):
+        main()
@@ -0,0 +1,143 @@
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from npdoc2md.__main__ import main
+from npdoc2md.formats import IR_FORMAT, render_ir_module
+from npdoc2md.ir import IR_VERSION, IRWriter, element_from_dict, iter_ir, render_ir
+from npdoc2md.npdoc2md import iter_npdoc2md
+
+SRC = Path("src/npdoc2md")
+FORMATS = ("md", "json", "html")
+
+
+def _write_ir(ir_path: Path, output_path: Path) -> dict[Path, str]:
+    """Convert a few modules, writing their IR, and return the converted files."""
+
+    outputs = {}
+    with IRWriter(ir_path) as ir_writer:
+        for output_file, text in iter_npdoc2md(
+            SRC,
+            output_path,
+            engine="ast",
+            include=["utils.py", "writer.py", "profiling.py"],
+            formats=(*FORMATS, IR_FORMAT),
+        ):
+            if output_file.suffix == ".ir":
+                relative_path = output_file.relative_to(output_path).with_suffix("")
+                ir_writer.add_rendered(relative_path.as_posix(), text)
+            else:
+                outputs[output_file] = text
+    return outputs
+
+
+@pytest.mark.parametrize("ir_name", ["docs.ir.jsonl", "docs.ir.jsonl.gz"])
+def test_render_from_ir_matches_conversion(tmp_path: Path, ir_name: str):
+    ir_path = tmp_path / ir_name
+    outputs = _write_ir(ir_path, tmp_path / "docs")
+
+    assert dict(render_ir(ir_path, tmp_path / "docs", FORMATS)) == outputs
+    if ir_name.endswith(".gz"):
+        with gzip.open(ir_path, "rt") as f:
+            assert json.loads(f.readline())["ir_version"] == IR_VERSION
+    assert [path for path, _ in iter_ir(ir_path)] == ["profiling", "utils", "writer"]
+
+
+def test_add_rendered_matches_add(tmp_path: Path):
+    data = {"kind": "module", "name": "caf\u00e9", "classes": []}
+    with IRWriter(tmp_path / "added.ir") as ir_writer:
+        ir_writer.add("pkg/module", data)
+    with IRWriter(tmp_path / "rendered.ir") as ir_writer:
+        ir_writer.add_rendered("pkg/module", render_ir_module(data))
+    assert (tmp_path / "added.ir").read_text() == (tmp_path / "rendered.ir").read_text()
+    assert list(iter_ir(tmp_path / "rendered.ir")) == [("pkg/module", data)]
+
+
+def test_element_from_dict_roundtrip(tmp_path: Path):
+    _write_ir(tmp_path / "docs.ir", tmp_path)
+    modules = [data for _, data in iter_ir(tmp_path / "docs.ir")]
+    assert modules
+    for data in modules:
+        assert element_from_dict(data).to_dict() == data
+
+    with pytest.raises(ValueError, match="Unknown element kind"):
+        element_from_dict({**modules[0], "kind": "variable"})
+
+
+def test_invalid_ir_files(tmp_path: Path):
+    not_ir = tmp_path / "not.ir"
+    not_ir.write_text("# Not an IR file\n")
+    with pytest.raises(ValueError, match="not an npdoc2md IR file"):
+        list(iter_ir(not_ir))
+
+    future = tmp_path / "future.ir"
+    future.write_text(json.dumps({"ir_version": IR_VERSION + 1}) + "\n")
+    with pytest.raises(ValueError, match="IR version"):
+        list(iter_ir(future))
+
+    escaping = tmp_path / "escaping.ir"
+    with IRWriter(escaping) as ir_writer:
+        ir_writer.add("../outside", {})
+    with pytest.raises(ValueError, match="Invalid output path"):
+        list(render_ir(escaping, tmp_path / "docs"))
+
+
+def test_cli_output_ir_and_render(tmp_path: Path, monkeypatch: MonkeyPatch):
+    ir_path = tmp_path / "docs.ir.gz"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "npdoc2md",
+            "--output-ir",
+            str(ir_path),
+            str(SRC / "utils.py"),
+            str(tmp_path / "built"),
+        ],
+    )
+    main()
+    # The json output backing the IR is only written if requested
+    assert sorted(path.name for path in (tmp_path / "built").iterdir()) == ["utils.md"]
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "npdoc2md",
+            "render",
+            "--from-ir",
+            str(ir_path),
+            "--format",
+            "md,html",
+            str(tmp_path / "rendered"),
+        ],
+    )
+    main()
+    assert sorted(path.name for path in (tmp_path / "rendered").iterdir()) == [
+        "utils.html",
+        "utils.md",
+    ]
+    assert (tmp_path / "rendered" / "utils.md").read_text() == Path(
+        "tests/expected_output/utils.md"
+    ).read_text()
+
+
+def test_cli_output_ir_rejects_incremental(tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "npdoc2md",
+            "--incremental",
+            "--output-ir",
+            str(tmp_path / "docs.ir"),
+            str(SRC / "utils.py"),
+            str(tmp_path),
+        ],
+    )
+    with pytest.raises(SystemExit):
+        main()
@@ -0,0 +1,133 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pytest import LogCaptureFixture, MonkeyPatch
+
+from npdoc2md.__main__ import main
+from npdoc2md.isolation import IsolatedWorkerPool
+from npdoc2md.npdoc2md import ConversionError, iter_npdoc2md
+
+
+@pytest.fixture
+def package(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    package_dir = tmp_path / "src" / "isolatedpkg"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "fine.py").write_text(
+        'import sys\n\n\ndef func():\n    """Imported in a worker."""\n'
+    )
+    (package_dir / "hangs.py").write_text("import time\n\ntime.sleep(60)\n")
+    (package_dir / "raises.py").write_text("raise RuntimeError('import failed')\n")
+    (package_dir / "zlast.py").write_text('def other():\n    """Last module."""\n')
+    monkeypatch.syspath_prepend(str(package_dir.parent))
+    return package_dir
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_timeouts_and_failures_are_reported(
+    package: Path, tmp_path: Path, jobs: int, caplog: LogCaptureFixture
+):
+    result = {}
+    with pytest.raises(ConversionError) as excinfo:
+        for output_file, text in iter_npdoc2md(
+            package, tmp_path / "docs", jobs=jobs, import_timeout=2
+        ):
+            result[output_file] = text
+
+    assert list(result) == [
+        tmp_path / "docs" / "fine.md",
+        tmp_path / "docs" / "zlast.md",
+    ]
+    assert "Imported in a worker." in result[tmp_path / "docs" / "fine.md"]
+    assert "isolatedpkg.fine" not in sys.modules
+    assert f"Timed out converting {package / 'hangs.py'}" in caplog.text
+    assert "RuntimeError: import failed" in caplog.text
+    assert excinfo.value.failed == {
+        package / "hangs.py": "timed out after 2 seconds",
+        package / "raises.py": "RuntimeError: import failed",
+    }
+
+
+def test_dropped_modules_fail_the_cli(
+    package: Path, tmp_path: Path, monkeypatch: MonkeyPatch
+):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["npdoc2md", "--import-timeout", "2", str(package), str(tmp_path / "docs")],
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+
+    assert excinfo.value.code == 1
+    # The modules that could be converted are still written.
+    assert (tmp_path / "docs" / "zlast.md").exists()
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--import-timeout", "0"],
+        ["--import-timeout", "-1"],
+        ["--max-modules-per-worker", "0"],
+        ["--max-worker-rss", "0"],
+    ],
+)
+def test_invalid_worker_limits(
+    option: list[str], tmp_path: Path, monkeypatch: MonkeyPatch
+):
+    monkeypatch.setattr(
+        sys, "argv", ["npdoc2md", *option, "src/npdoc2md/utils.py", str(tmp_path)]
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+
+    assert excinfo.value.code == 2
+
+
+def test_workers_log_like_the_cli(package: Path, tmp_path: Path):
+    result = subprocess.run(
+        ["npdoc2md", "--isolated", "--verbose", "--exclude", "hangs.py"]
+        + ["--exclude", "raises.py", str(package), str(tmp_path / "docs")],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(package.parent)},
+    )
+
+    assert result.returncode == 0
+    # Logged in the worker subprocesses, below the WARNING level of lastResort.
+    assert f"Processing file {package / 'fine.py'}" in result.stderr
+    assert "Importing module fine" in result.stderr
+
+
+def test_workers_are_recycled(package: Path):
+    src_files = [package / "fine.py", package / "zlast.py", package / "fine.py"]
+    pool = IsolatedWorkerPool({"input_path": package}, jobs=1, max_modules_per_worker=2)
+    try:
+        pids = []
+        md_texts = []
+        for md_text in pool.map(src_files):
+            md_texts.append(md_text)
+            pids.append({worker.process.pid for worker in pool._workers})
+    finally:
+        pool.close()
+
+    assert all(md_text is not None for md_text in md_texts)
+    assert not pool.timed_out and not pool.failed
+    # The first worker is replaced after its second module
+    assert pids[0] != pids[2]
+
+
+def test_workers_are_recycled_above_rss_ceiling(package: Path):
+    pool = IsolatedWorkerPool({"input_path": package}, jobs=1, max_worker_rss=1)
+    try:
+        md_texts = list(pool.map([package / "fine.py", package / "zlast.py"]))
+        assert pool._workers == []
+    finally:
+        pool.close()
+    assert all(md_text is not None for md_text in md_texts)
@@ -0,0 +1,218 @@
+import logging
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pytest import LogCaptureFixture, MonkeyPatch
+
+from npdoc2md import memo
+from npdoc2md.memo import DOCSTRING_STORE_FILE_NAME, DocstringCache
+from npdoc2md.npdoc2md import (
+    FunctionElement,
+    RenderedDocstring,
+    configure_docstring_cache,
+    get_docstring_cache,
+    iter_npdoc2md,
+    npdoc2md,
+    parse_docstring,
+    render_docstring,
+)
+
+DOCSTRING = """Add two numbers.
+
+Parameters
+----------
+x : int
+    The first number.
+y : int, default=2
+    The second number.
+
+Returns
+-------
+total : int
+    The sum.
+
+Raises
+------
+ValueError
+    If the numbers are too large.
+
+Examples
+--------
+>>> add(1, 2)
+3
+"""
+
+
+@pytest.fixture(autouse=True)
+def default_docstring_cache() -> Iterator[None]:
+    yield
+    get_docstring_cache().close()
+    configure_docstring_cache()
+
+
+def _store(cache_dir: Path) -> DocstringCache[RenderedDocstring]:
+    return DocstringCache(
+        cache_dir=cache_dir,
+        encode=RenderedDocstring.to_dict,
+        decode=RenderedDocstring.from_dict,
+    )
+
+
+def _render(docstring: RenderedDocstring) -> str:
+    return repr(FunctionElement(name="add", docstring=docstring, level=2))
+
+
+def test_lru_eviction():
+    cache: DocstringCache[str] = DocstringCache(max_entries=2)
+    calls: list[str] = []
+
+    def compute(text: str) -> str:
+        calls.append(text)
+        return text.upper()
+
+    assert cache.get("a", compute) == "A"
+    assert cache.get("b", compute) == "B"
+    assert cache.get("a", compute) == "A"
+    # "b" is the least recently used, and makes room for "c"
+    assert cache.get("c", compute) == "C"
+    assert cache.get("a", compute) == "A"
+    assert cache.get("b", compute) == "B"
+    assert calls == ["a", "b", "c", "b"]
+    assert (cache.hits, cache.disk_hits, cache.misses) == (2, 0, 4)
+    assert cache.hit_rate == pytest.approx(2 / 6)
+
+    cache.reset_stats()
+    assert cache.lookups == 0
+    assert cache.hit_rate == 0.0
+
+
+def test_disabled_memory_tier():
+    cache: DocstringCache[str] = DocstringCache(max_entries=0)
+    assert cache.get("a", str.upper) == "A"
+    assert cache.get("a", str.upper) == "A"
+    assert cache.misses == 2
+
+
+def test_invalid_cache_configuration(tmp_path: Path):
+    with pytest.raises(ValueError, match="negative"):
+        DocstringCache(max_entries=-1)
+    with pytest.raises(ValueError, match="encode and decode"):
+        DocstringCache(cache_dir=tmp_path)
+
+
+def test_rendered_docstring_dict_roundtrip():
+    rendered = RenderedDocstring.from_docstring(parse_docstring(DOCSTRING))
+    roundtrip = RenderedDocstring.from_dict(rendered.to_dict())
+    assert roundtrip.to_dict() == rendered.to_dict()
+    assert _render(roundtrip) == _render(rendered)
+
+
+def test_disk_store_shared_across_caches(tmp_path: Path):
+    first = _store(tmp_path)
+    rendered = first.get(DOCSTRING, render_docstring)
+    first.close()
+    assert (tmp_path / DOCSTRING_STORE_FILE_NAME).is_file()
+
+    second = _store(tmp_path)
+
+    def fail(text: str) -> RenderedDocstring:
+        raise AssertionError("Docstring should have been read from disk")
+
+    stored = second.get(DOCSTRING, fail)
+    assert _render(stored) == _render(rendered)
+    assert second.get(DOCSTRING, fail) is stored
+    assert (second.hits, second.disk_hits, second.misses) == (1, 1, 0)
+    second.close()
+
+
+def test_disk_store_cleared_on_version_change(tmp_path: Path, monkeypatch: MonkeyPatch):
+    cache = _store(tmp_path)
+    cache.get(DOCSTRING, render_docstring)
+    cache.close()
+
+    monkeypatch.setattr(memo, "_store_version", lambda: "npdoc2md 0.0.0")
+    cache = _store(tmp_path)
+    cache.get(DOCSTRING, render_docstring)
+    assert cache.misses == 1
+    cache.close()
+
+
+def test_unusable_disk_store(tmp_path: Path, caplog: LogCaptureFixture):
+    (tmp_path / DOCSTRING_STORE_FILE_NAME).write_text("not a database")
+    cache = _store(tmp_path)
+    with caplog.at_level(logging.WARNING, logger="npdoc2md"):
+        rendered = cache.get(DOCSTRING, render_docstring)
+    assert _render(rendered) == _render(render_docstring(DOCSTRING))
+    assert cache.path is None
+    assert "Disabling docstring store" in caplog.text
+    cache.close()
+
+
+def test_unreadable_disk_store_entry(tmp_path: Path):
+    cache = _store(tmp_path)
+    cache.get(DOCSTRING, render_docstring)
+    cache.close()
+    with sqlite3.connect(tmp_path / DOCSTRING_STORE_FILE_NAME) as connection:
+        connection.execute("UPDATE docstrings SET value = '{}'")
+    connection.close()
+
+    cache = _store(tmp_path)
+    cache.get(DOCSTRING, render_docstring)
+    assert cache.misses == 1
+    cache.close()
+
+
+def test_repeated_docstrings_are_shared(tmp_path: Path):
+    src_file = tmp_path / "repeated.py"
+    src_file.write_text(
+        '"""Module."""\n\n\n'
+        + "".join(
+            f'def function_{i}(x):\n    """{DOCSTRING}"""\n\n\n' for i in range(3)
+        )
+    )
+    # A fresh cache, since the configuration changes
+    configure_docstring_cache(max_entries=16)
+
+    elements = [render_docstring(DOCSTRING) for _ in range(3)]
+    assert elements[0] is elements[1] is elements[2]
+    assert (get_docstring_cache().hits, get_docstring_cache().misses) == (2, 1)
+
+    uncached = npdoc2md(src_file, tmp_path, engine="ast", docstring_cache_size=0)
+    cached = npdoc2md(src_file, tmp_path, engine="ast")
+    assert cached == uncached
+
+
+def test_iter_npdoc2md_logs_hit_rate(tmp_path: Path, caplog: LogCaptureFixture):
+    src_file = tmp_path / "repeated.py"
+    src_file.write_text(
+        '"""Module."""\n\n\n'
+        + "".join(f'def function_{i}(x):\n    """Same."""\n\n\n' for i in range(4))
+    )
+    cache_dir = tmp_path / "cache"
+    with caplog.at_level(logging.DEBUG, logger="npdoc2md"):
+        list(iter_npdoc2md(src_file, tmp_path, engine="ast", cache_dir=cache_dir))
+    # The module docstring and the first function docstring are parsed
+    assert "3 hits in memory, 0 on disk, 2 misses" in caplog.text
+    assert (cache_dir / DOCSTRING_STORE_FILE_NAME).is_file()
+
+    # Without the memory tier, as in a new process, docstrings are read from disk
+    caplog.clear()
+    src_file.write_text(src_file.read_text() + '"""Edited."""\n')
+    with caplog.at_level(logging.DEBUG, logger="npdoc2md"):
+        list(
+            iter_npdoc2md(
+                src_file,
+                tmp_path,
+                engine="ast",
+                cache_dir=cache_dir,
+                docstring_cache_size=0,
+            )
+        )
+    assert "0 hits in memory, 5 on disk, 0 misses" in caplog.text
+
+
+def test_iter_npdoc2md_rejects_negative_cache_size(tmp_path: Path):
+    with pytest.raises(ValueError, match="negative"):
+        list(iter_npdoc2md(tmp_path, tmp_path, docstring_cache_size=-1))
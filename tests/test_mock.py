@@ -0,0 +1,89 @@
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from npdoc2md.mock import MockImportFinder, MockModule, mocked_imports
+from npdoc2md.npdoc2md import npdoc2md
+
+MODULE_SOURCE = '''"""Module depending on heavy packages."""
+
+import heavydep
+import heavydep.nn.functional as F
+from heavy_ext.core import Handle
+from heavydep.nn import Module
+
+
+class Net(Module):
+    """Network deriving from a mocked base."""
+
+    def forward(self, x: heavydep.Tensor, device=heavydep.device("cpu")) -> Handle:
+        """Run the network."""
+        return F.relu(x)
+
+
+class Layer(heavydep.nn.Linear, heavydep.jit.ScriptModule):
+    """Layer with several mocked bases."""
+
+
+@heavydep.jit.script
+def scripted(x: int) -> int:
+    """Function decorated with a mocked decorator."""
+    return x
+'''
+
+
+@pytest.fixture
+def package(tmp_path: Path, monkeypatch: MonkeyPatch) -> Iterator[Path]:
+    package_dir = tmp_path / "src" / "mockedpkg"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("")
+    (package_dir / "model.py").write_text(MODULE_SOURCE)
+    monkeypatch.syspath_prepend(str(package_dir.parent))
+    yield package_dir
+    for name in [name for name in sys.modules if name.startswith("mockedpkg")]:
+        del sys.modules[name]
+
+
+def test_finder_matches_patterns():
+    finder = MockImportFinder(["torch", "google.cloud.*", "heavy*"])
+    assert finder.matches("torch")
+    assert finder.matches("torch.nn.functional")
+    assert finder.matches("google.cloud.storage")
+    assert finder.matches("heavy_ext.core")
+    assert not finder.matches("google")
+    assert not finder.matches("torchvision")
+
+
+def test_mocked_imports_are_removed_on_exit():
+    with mocked_imports(["heavydep"]):
+        import heavydep.nn
+
+        assert isinstance(heavydep.nn, MockModule)
+        assert repr(heavydep.nn.Module) == "heavydep.nn.Module"
+    assert "heavydep" not in sys.modules
+    assert "heavydep.nn" not in sys.modules
+    with pytest.raises(ImportError):
+        import heavydep  # noqa: F401
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_npdoc2md_with_mocked_imports(package: Path, tmp_path: Path, jobs: int):
+    result = npdoc2md(
+        package,
+        tmp_path / "docs",
+        jobs=jobs,
+        mock_imports=["heavydep", "heavy_ext"],
+    )
+    md_text = result[tmp_path / "docs" / "model.md"]
+
+    assert "class Net(Module)" in md_text
+    assert "class Layer(Linear, ScriptModule)" in md_text
+    assert (
+        "def forward(self, x: heavydep.Tensor, device=heavydep.device) -> "
+        "heavy_ext.core.Handle" in md_text
+    )
+    assert "def scripted(x: int) -> int" in md_text
+    assert "Function decorated with a mocked decorator." in md_text
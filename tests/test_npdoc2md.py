@@ -1,3 +1,10 @@
+import inspect
+import sys
+from collections import Counter
+from collections.abc import Iterator
+from io import StringIO
+from pathlib import Path
+
 import pytest
 from docstring_parser import Docstring, Style, parse
 from docstring_parser.common import (
@@ -12,8 +19,15 @@ from docstring_parser.common import (
 from npdoc2md.npdoc2md import (
     ClassElement,
     DocToMarkdownElement,
+    ModuleElement,
+    RenderedDocstring,
+    configure_docstring_cache,
     docstring_metas_to_md_table,
+    format_function_signature,
     get_target_python_files,
+    iter_npdoc2md,
+    npdoc2md,
+    write_docstring_metas_md_table,
 )
 
 
@@ -229,18 +243,21 @@ Base class for elements that can be included in the markdown docs.
 Attribute | Type | Optional | Default | Description
 --- | --- | --- | --- | ---
 name | str | False | N/A | Name of the element (ex: function name, class name)
-docstring | Docstring | False | N/A | Parsed docstring object for the element
+docstring | RenderedDocstring | False | N/A | Rendered fields of the parsed docstring for the element
 signature | str | False | N/A | Signature of the element (ex: function signature)
 level | int | False | N/A | Heading level for the element in the markdown documentation. For example, 1 for module, 2 for class, 3 for method.
 ### Methods
 Method | Description
 --- | ---
 [__init__](#__init__) | Initialize the element with its name, docstring, signature, and heading.
+[render_to](#render_to) | Write the markdown representation of the element to a text stream.
+[render_summary_to](#render_summary_to) | Write the element's own markdown, up to the tables of its sub-elements.
+[to_dict](#to_dict) | Convert the element, and its sub-elements, to JSON serializable data.
 [__repr__](#__repr__) | String representation of the element in markdown format.
 
 ### __init__
 ```Python
-def __init__(self, name: str, docstring: docstring_parser.common.Docstring, level: int, signature: str | None = None)
+def __init__(self, name: str, docstring: 'Docstring | RenderedDocstring', level: int, signature: str | None = None)
 ```
 Initialize the element with its name, docstring, signature, and heading.
 
@@ -249,9 +266,44 @@ Parameter | Type | Optional | Default | Description
 --- | --- | --- | --- | ---
 name | str | False | N/A | Name of the element (ex: function name, class name)
 signature | str | True | None | Signature of the element (ex: function signature)
-docstring | Docstring | False | N/A | Parsed docstring object for the element
+docstring | Docstring or RenderedDocstring | False | N/A | Parsed docstring object for the element, only its rendered fields are kept
 level | int | False | N/A | Heading level for the element in the markdown documentation. For example, 1 for module, 2 for class, 3 for method.
 
+### render_to
+```Python
+def render_to(self, stream: IO[str]) -> None
+```
+Write the markdown representation of the element to a text stream.
+
+Sub-elements are written to the same stream, so the cost of rendering
+grows linearly with the number of members.
+#### Parameters
+Parameter | Type | Optional | Default | Description
+--- | --- | --- | --- | ---
+stream | IO[str] | False | N/A | Text stream to write to (ex: io.StringIO, or an open file).
+
+### render_summary_to
+```Python
+def render_summary_to(self, stream: IO[str]) -> None
+```
+Write the element's own markdown, up to the tables of its sub-elements.
+
+#### Parameters
+Parameter | Type | Optional | Default | Description
+--- | --- | --- | --- | ---
+stream | IO[str] | False | N/A | Text stream to write to (ex: io.StringIO, or an open file).
+
+### to_dict
+```Python
+def to_dict(self) -> dict[str, typing.Any]
+```
+Convert the element, and its sub-elements, to JSON serializable data.
+
+#### Returns
+Type | Variable Name | Is Generator | Description
+--- | --- | --- | ---
+dict[str, Any] | N/A | False | The kind, name, signature, heading level and rendered docstring of the element, with its sub-elements under classes, functions or methods.
+
 ### __repr__
 ```Python
 def __repr__(self) -> str
@@ -264,3 +316,148 @@ Type | Variable Name | Is Generator | Description
 str | N/A | False | Markdown representation of the element.
 """  # noqa: E501
     assert element.__repr__() == expected_repr
+
+
+@pytest.mark.parametrize("engine", ["import", "ast"])
+def test_npdoc2md_parallel_matches_sequential(engine):
+    sequential = npdoc2md(Path("src/npdoc2md"), Path("docs"), engine=engine)
+    parallel = npdoc2md(Path("src/npdoc2md"), Path("docs"), engine=engine, jobs=2)
+    assert list(parallel.items()) == list(sequential.items())
+
+
+def test_npdoc2md_invalid_jobs():
+    with pytest.raises(ValueError):
+        npdoc2md(Path("src/npdoc2md/utils.py"), Path("docs"), jobs=0)
+
+
+def test_iter_npdoc2md_matches_npdoc2md():
+    generator = iter_npdoc2md(Path("src/npdoc2md"), Path("docs"), engine="ast")
+    assert isinstance(generator, Iterator)
+    first_path, first_text = next(generator)
+    items = [(first_path, first_text), *generator]
+    assert items == list(
+        npdoc2md(Path("src/npdoc2md"), Path("docs"), engine="ast").items()
+    )
+
+
+def test_render_to_matches_repr():
+    element = ClassElement(ClassElement, include_private=True)
+    stream = StringIO()
+    element.render_to(stream)
+    assert stream.getvalue() == element.__repr__()
+
+
+def test_write_docstring_metas_md_table_to_stream():
+    stream = StringIO()
+    stream.write("preamble\n")
+    write_docstring_metas_md_table(
+        stream, "Raises", 2, [DocstringRaises([], "Bad value", "ValueError")]
+    )
+    assert stream.getvalue() == "preamble\n" + docstring_metas_to_md_table(
+        "Raises", 2, [DocstringRaises([], "Bad value", "ValueError")]
+    )
+
+
+def test_elements_keep_compact_docstrings():
+    element = ClassElement(ClassElement, include_private=True)
+    assert not hasattr(element, "__dict__")
+    assert all(not hasattr(method, "__dict__") for method in element.methods)
+    assert isinstance(element.docstring, RenderedDocstring)
+
+    init = next(method for method in element.methods if method.name == "__init__")
+    assert init.docstring.returns is None
+    assert init.docstring.raises == ()
+    type_names = [param.type_name for param in init.docstring.params]
+    assert type_names == ["type", "bool", "list[str]"]
+    assert type_names[-1] is sys.intern("list[str]")
+    assert all(param.args == [] for param in init.docstring.params)
+
+
+def test_rendered_docstring_matches_docstring():
+    docstring = parse(docstring_metas_to_md_table.__doc__, style=Style.NUMPYDOC)
+    rendered = RenderedDocstring.from_docstring(docstring)
+    assert rendered.short_description == docstring.short_description
+    assert rendered.description == docstring.description
+    assert [vars(param) | {"args": []} for param in rendered.params] == [
+        vars(param) | {"args": []} for param in docstring.params
+    ]
+    assert docstring.returns is not None and rendered.returns is not None
+    assert rendered.returns is not docstring.returns
+    assert vars(rendered.returns) | {"args": []} == vars(docstring.returns) | {
+        "args": []
+    }
+    # The parsed docstring may be shared, its metas are left untouched.
+    assert all(param.args != [] for param in docstring.params)
+
+    element = DocToMarkdownElement(name="f", docstring=docstring, level=2)
+    assert element.docstring.description == docstring.description
+    assert DocToMarkdownElement(name="f", docstring=rendered, level=2).docstring is (
+        rendered
+    )
+
+
+@pytest.mark.parametrize("include_private", [False, True])
+def test_stream_to_matches_module_element(include_private: bool):
+    module = sys.modules[ClassElement.__module__]
+    stream = StringIO()
+    ModuleElement.stream_to(module, stream, include_private=include_private)
+    assert stream.getvalue() == repr(
+        ModuleElement(module, include_private=include_private)
+    )
+
+
+def test_stream_to_parses_class_docstrings_once(monkeypatch: pytest.MonkeyPatch):
+    module = sys.modules[ClassElement.__module__]
+    parsed: Counter[str] = Counter()
+    parse_numpydoc = module._parse_numpydoc
+
+    def counting_parse(text: str) -> Docstring:
+        parsed[text] += 1
+        return parse_numpydoc(text)
+
+    monkeypatch.setattr(module, "_parse_numpydoc", counting_parse)
+    configure_docstring_cache(max_entries=0)
+    try:
+        ModuleElement.stream_to(module, StringIO())
+    finally:
+        configure_docstring_cache()
+    for cls in (ClassElement, ModuleElement):
+        summary = inspect.cleandoc(cls.__doc__ or "").splitlines()[0]
+        assert sum(count for text, count in parsed.items() if summary in text) == 1
+
+
+def test_signatures_are_inspected_once(monkeypatch: pytest.MonkeyPatch):
+    calls = []
+    signature = inspect.signature
+
+    def counting_signature(func):
+        calls.append(func)
+        return signature(func)
+
+    def add(x: int, y: int = 2) -> int:
+        return x + y
+
+    class Calculator:
+        plus = add
+        total = add
+
+    monkeypatch.setattr(inspect, "signature", counting_signature)
+    element = ClassElement(Calculator)
+    assert [method.signature for method in element.methods] == [
+        "def plus(x: int, y: int = 2) -> int",
+        "def total(x: int, y: int = 2) -> int",
+    ]
+    assert format_function_signature(add) == "(x: int, y: int = 2) -> int"
+    assert calls == [add]
+
+    class Scale:
+        __slots__ = ()
+
+        def __call__(self, x: float) -> float:
+            return 2 * x
+
+    # Callables which cannot be weakly referenced are inspected every time
+    scale = Scale()
+    assert format_function_signature(scale) == "(x: float) -> float"
+    assert format_function_signature(scale) == "(x: float) -> float"
+    assert calls == [add, scale, scale]
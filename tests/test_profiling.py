@@ -0,0 +1,78 @@
+import json
+import sys
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from npdoc2md.__main__ import main
+from npdoc2md.profiling import (
+    Profiler,
+    get_active_profiler,
+    profile_phase,
+    profiling,
+    record_class,
+    record_module,
+)
+
+
+def test_profile_phase_disabled_is_noop():
+    assert get_active_profiler() is None
+    with profile_phase("parse"):
+        pass
+    record_module("module", 1.0)
+    record_class("module.Class", 1.0)
+    assert get_active_profiler() is None
+
+
+def test_profiling_collects_phases_modules_and_classes():
+    with profiling() as profiler:
+        assert get_active_profiler() is profiler
+        for _ in range(3):
+            with profile_phase("parse"):
+                pass
+        record_module("pkg.slow", 2.0)
+        record_module("pkg.fast", 1.0)
+        record_class("pkg.slow.Class", 0.5)
+    assert get_active_profiler() is None
+
+    report = profiler.report(top=1)
+    assert report["phases"]["parse"]["calls"] == 3
+    assert report["modules"] == {"pkg.fast": 1.0, "pkg.slow": 2.0}
+    assert report["slowest_modules"] == [{"name": "pkg.slow", "seconds": 2.0}]
+    assert report["slowest_classes"] == [{"name": "pkg.slow.Class", "seconds": 0.5}]
+
+
+def test_profiler_merge():
+    worker = Profiler()
+    with worker.phase("import"):
+        pass
+    worker.modules["pkg.module"] = 1.0
+
+    profiler = Profiler()
+    with profiler.phase("import"):
+        pass
+    profiler.merge(json.loads(json.dumps(worker.snapshot())))
+    assert profiler.phases["import"][1] == 2
+    assert profiler.modules == {"pkg.module": 1.0}
+
+
+def test_cli_profile_report(tmp_path: Path, monkeypatch: MonkeyPatch):
+    report_path = tmp_path / "profile.json"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "npdoc2md",
+            f"--profile={report_path}",
+            "src/npdoc2md/utils.py",
+            str(tmp_path),
+        ],
+    )
+    main()
+
+    report = json.loads(report_path.read_text())
+    assert {"discovery", "import", "parse", "signature", "render", "write"} <= set(
+        report["phases"]
+    )
+    assert list(report["modules"]) == ["npdoc2md.utils"]
+    assert report["slowest_modules"][0]["name"] == "npdoc2md.utils"
@@ -0,0 +1,242 @@
+import argparse
+import ast
+import importlib
+import inspect
+import json
+import pathlib
+import textwrap
+from typing import Any
+
+import docstring_parser
+import docstring_parser.numpydoc
+import pytest
+from docstring_parser import Docstring, Style, parse
+from pytest import MonkeyPatch
+
+from npdoc2md import scanner
+from npdoc2md.npdoc2md import FunctionElement, parse_docstring
+from npdoc2md.scanner import scan_docstring
+
+EDGE_CASES = [
+    "",
+    "Summary.",
+    "   Summary with leading spaces.   ",
+    "\n    Summary on the second line.\n\n    Long description.\n    ",
+    "Summary spanning\n    two lines, indented.\n",
+    "Summary.\n\nLong description.\n\n\n",
+    "Summary.\nLong description without a blank line.",
+    """Summary.
+
+    Parameters
+    ----------
+    x : int
+        The first input.
+    y : str, optional
+        The second input, by default "y".
+    z : float, default=1.0
+        The third input.
+    w : bool, default: True
+    v : list[int] (optional)
+        Deeper
+            indented, then back.
+    u
+        No type at all.
+    a, b : int
+        Two at once.
+    c :
+        Empty type.
+    d : int, default 5
+    e: int
+        Defaults to 'quoted'.
+    f : int
+        Default is 3.
+
+        Second paragraph.
+    """,
+    """Returns
+    -------
+    Section first, without any summary.
+    """,
+    """Summary.
+
+    Returns
+    -------
+    count : int
+        Named return.
+    str
+        Second return.
+
+    Yields
+    ------
+    int
+        A generator.
+    """,
+    """Summary.
+
+    Raises
+    ------
+    ValueError
+        If bad.
+    TypeError
+    Warns
+    -----
+    UserWarning
+        Sometimes.
+    """,
+    """Summary.
+
+    Examples
+    --------
+    >>> add(1, 2)
+    3
+    >>> add(
+    ...     1, 2)
+    Some description.
+    """,
+    """Summary.
+
+    .. deprecated:: 1.2
+        Use something else.
+
+    Notes
+    -----
+    Some notes.
+
+    See Also
+    --------
+    other_function
+    """,
+    """Summary.
+
+    Parameters
+    ----------
+
+    x : int
+
+        Blank lines around.
+
+    Other Parameters
+    ----------------
+    y : int
+    Receives
+    --------
+    z : int
+    """,
+    # Headers that are not quite headers
+    """Summary.
+
+    Parameters
+    ---------
+    x : int
+        Too few dashes.
+
+    Parameters
+    -----------
+    y : int
+        Too many dashes.
+
+      Parameters
+      ----------
+    Indented.
+    """,
+    # Trailing whitespace, and blank lines between the title and its dashes
+    "Summary.\n\nParameters  \n\n----------   \n\n\nx : int  \n    Trailing.  \n",
+    "Summary.\r\n\r\nParameters\r\n----------\r\nx : int\r\n    Windows lines.\r\n",
+    "Summary.\n\n\tParameters\n\t----------\n\tx : int\n\t\tTabs.\n",
+    "Summary.\n\nParameters\n----------\nx\xa0: int\n    Non-breaking space.\n",
+    "Summary.\n\nParameters\n----------\n x : int\n    Em space.\n",
+    "..\n\n... not a directive\n\n.. note:: not deprecated",
+    "Attributes\n----------\nname : str\n\n\n",
+    "Summary.\n\nArgs\n----\nx : int\nReturn\n------\nint\n",
+]
+
+
+def _iter_docstrings(module: Any) -> list[str]:
+    """Collect the docstrings of a module, its classes, and their members."""
+
+    docstrings = [module.__doc__]
+    for _, obj in inspect.getmembers(module):
+        if inspect.isclass(obj) or inspect.isroutine(obj):
+            docstrings.append(obj.__doc__)
+        if inspect.isclass(obj):
+            docstrings.extend(member.__doc__ for member in vars(obj).values())
+    return [text for text in docstrings if isinstance(text, str)]
+
+
+# Docstrings of npdoc2md itself, of docstring_parser, and of a few standard library
+# modules (which are not numpy-style, and make for unusual inputs).
+CORPUS_MODULES = [
+    "npdoc2md.npdoc2md",
+    "npdoc2md.utils",
+    "npdoc2md.isolation",
+    "npdoc2md.server",
+    "npdoc2md.watch",
+    "npdoc2md.scanner",
+    docstring_parser.numpydoc,
+    docstring_parser,
+    argparse,
+    ast,
+    inspect,
+    json,
+    pathlib,
+    textwrap,
+]
+
+
+def _corpus() -> list[str]:
+    docstrings = list(EDGE_CASES)
+    for module in CORPUS_MODULES:
+        if isinstance(module, str):
+            module = importlib.import_module(module)
+        docstrings.extend(_iter_docstrings(module))
+    return docstrings
+
+
+def _fields(docstring: Docstring) -> dict[str, Any]:
+    fields = dict(vars(docstring))
+    fields["meta"] = [(type(meta), vars(meta)) for meta in docstring.meta]
+    return fields
+
+
+def _render(docstring: Docstring) -> str:
+    return repr(FunctionElement(name="f", docstring=docstring, level=2))
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_scan_edge_cases(text: str):
+    scanned = scan_docstring(text)
+    assert scanned is not None
+    expected = parse(text, style=Style.NUMPYDOC)
+    assert _fields(scanned) == _fields(expected)
+    assert _render(scanned) == _render(expected)
+
+
+def test_scan_matches_docstring_parser_on_corpus():
+    corpus = _corpus()
+    assert len(corpus) > 500
+    for text in corpus:
+        scanned = scan_docstring(text)
+        assert scanned is not None
+        expected = parse(text, style=Style.NUMPYDOC)
+        assert _fields(scanned) == _fields(expected), text
+        assert _render(scanned) == _render(expected), text
+
+
+def test_scan_falls_back_on_unknown_sections(monkeypatch: MonkeyPatch):
+    monkeypatch.delitem(
+        scanner._SECTION_SCANNERS, docstring_parser.numpydoc.YieldsSection
+    )
+    text = "Summary.\n\nYields\n------\nint\n    Values."
+    assert scan_docstring(text) is None
+    assert scan_docstring("Summary.\n\nNotes\n-----\nFine.") is not None
+    assert _fields(parse_docstring(text)) == _fields(parse(text, Style.NUMPYDOC))
+
+
+def test_package_output_unchanged(tmp_path: pathlib.Path, monkeypatch: MonkeyPatch):
+    converter = importlib.import_module("npdoc2md.npdoc2md")
+    assert converter.__file__ is not None
+    src_file = pathlib.Path(converter.__file__).with_name("npdoc2md.py")
+    scanned = converter.npdoc2md(src_file, tmp_path, include_private=True)
+    scanner = importlib.import_module("npdoc2md.scanner")
+    monkeypatch.setattr(scanner, "scan_docstring", lambda text: None)
+    assert converter.npdoc2md(src_file, tmp_path, include_private=True) == scanned
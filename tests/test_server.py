@@ -0,0 +1,189 @@
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from npdoc2md.__main__ import main
+from npdoc2md.server import (
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    DocServer,
+    send_request,
+)
+
+MODULE_TEMPLATE = '''"""Module docstring."""
+
+
+def func() -> int:
+    """{summary}"""
+    return 1
+'''
+
+
+def write_module(path: Path, summary: str) -> None:
+    path.write_text(MODULE_TEMPLATE.format(summary=summary), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def package(tmp_path: Path) -> Path:
+    package_dir = tmp_path / "src" / "servedpkg"
+    package_dir.mkdir(parents=True)
+    write_module(package_dir / "first.py", "First summary.")
+    write_module(package_dir / "second.py", "Second summary.")
+    return package_dir
+
+
+def call(server: DocServer, method: str, **params) -> dict:
+    request = {"jsonrpc": "2.0", "id": 7, "method": method, "params": params}
+    line = server.handle_line(json.dumps(request))
+    assert line is not None
+    response = json.loads(line)
+    assert response["id"] == 7
+    return response
+
+
+def test_render_module(package: Path):
+    server = DocServer(package, engine="ast")
+    assert call(server, "list_modules")["result"] == [
+        {"module": "servedpkg.first", "path": str(package / "first.py")},
+        {"module": "servedpkg.second", "path": str(package / "second.py")},
+    ]
+
+    result = call(server, "render", module="servedpkg.first")["result"]
+    assert result["module"] == "servedpkg.first"
+    assert "First summary." in result["markdown"]
+
+    write_module(package / "first.py", "Updated summary.")
+    result = call(server, "render", path=str(package / "first.py"))["result"]
+    assert "Updated summary." in result["markdown"]
+
+
+def test_render_path_is_resolved(package: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.chdir(package.parent)
+    server = DocServer(Path("servedpkg"), engine="ast")
+    for path in [package / "first.py", "./servedpkg/first.py"]:
+        result = call(server, "render", path=str(path))["result"]
+        assert result["module"] == "servedpkg.first"
+    response = call(server, "render", path=str(package / "missing.py"))
+    assert response["error"]["code"] == INVALID_PARAMS
+
+
+def test_render_changed(package: Path):
+    server = DocServer(package, engine="ast")
+    result = call(server, "render_changed")["result"]
+    assert [module["module"] for module in result["modules"]] == [
+        "servedpkg.first",
+        "servedpkg.second",
+    ]
+    assert call(server, "render_changed")["result"] == {
+        "modules": [],
+        "errors": [],
+        "removed": [],
+    }
+
+    write_module(package / "second.py", "Changed summary.")
+    (package / "first.py").unlink()
+    write_module(package / "third.py", "Third summary.")
+    result = call(server, "render_changed")["result"]
+    assert [module["module"] for module in result["modules"]] == [
+        "servedpkg.second",
+        "servedpkg.third",
+    ]
+    assert "Changed summary." in result["modules"][0]["markdown"]
+    assert result["removed"] == [str(package / "first.py")]
+
+    (package / "second.py").write_text("def broken(:\n")
+    result = call(server, "render_changed")["result"]
+    assert result["modules"] == []
+    assert result["errors"][0]["path"] == str(package / "second.py")
+
+
+def test_render_reloads_imported_module(package: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.syspath_prepend(str(package.parent))
+    server = DocServer(package)
+    try:
+        result = call(server, "render", module="servedpkg.first")["result"]
+        assert "First summary." in result["markdown"]
+        write_module(package / "first.py", "Reloaded summary.")
+        result = call(server, "render", module="servedpkg.first")["result"]
+        assert "Reloaded summary." in result["markdown"]
+    finally:
+        for name in [name for name in sys.modules if name.startswith("servedpkg")]:
+            del sys.modules[name]
+
+
+def test_errors(package: Path):
+    server = DocServer(package, engine="ast")
+    assert call(server, "unknown")["error"]["code"] == METHOD_NOT_FOUND
+    assert call(server, "render")["error"]["code"] == INVALID_PARAMS
+    assert call(server, "render", module="missing")["error"]["code"] == INVALID_PARAMS
+    assert call(server, "render", bad=1)["error"]["code"] == INVALID_PARAMS
+    line = server.handle_line("{not json")
+    assert line is not None
+    response = json.loads(line)
+    assert response["error"]["code"] == PARSE_ERROR
+    # Notifications, without an id, are not answered
+    assert server.handle_line('{"jsonrpc": "2.0", "method": "list_modules"}') is None
+
+
+def test_cli_serve_stdin(package: Path, monkeypatch: MonkeyPatch, capsys):
+    requests = [
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "render",
+            "params": {"module": "servedpkg.first"},
+        },
+        {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+        {"jsonrpc": "2.0", "id": 3, "method": "list_modules"},
+    ]
+    stdin = io.StringIO("".join(json.dumps(request) + "\n" for request in requests))
+    monkeypatch.setattr(sys, "stdin", stdin)
+    monkeypatch.setattr(
+        sys, "argv", ["npdoc2md", "serve", "--engine", "ast", str(package)]
+    )
+    main()
+
+    responses = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [response["id"] for response in responses] == [1, 2]
+    assert "First summary." in responses[0]["result"]["markdown"]
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+)
+def test_serve_socket(package: Path, tmp_path: Path):
+    socket_path = tmp_path / "npdoc2md.sock"
+    server = DocServer(package, engine="ast")
+    thread = threading.Thread(target=server.serve_socket, args=(socket_path,))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        modules = send_request(socket_path, "list_modules")
+        assert [module["module"] for module in modules] == [
+            "servedpkg.first",
+            "servedpkg.second",
+        ]
+        result = send_request(socket_path, "render", module="servedpkg.second")
+        assert "Second summary." in result["markdown"]
+        with pytest.raises(RuntimeError, match="Unknown module"):
+            send_request(socket_path, "render", module="missing")
+    finally:
+        send_request(socket_path, "shutdown")
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert not socket_path.exists()
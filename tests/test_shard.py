@@ -0,0 +1,135 @@
+import sys
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from npdoc2md.__main__ import main
+from npdoc2md.ir import iter_ir
+from npdoc2md.npdoc2md import get_target_python_files, npdoc2md
+from npdoc2md.shard import iter_shard_outputs, parse_shard, select_shard
+
+SRC = Path("src/npdoc2md")
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for value in ["2", "a/4", "0/4", "5/4", "1/0"]:
+        with pytest.raises(ValueError, match="Invalid shard"):
+            parse_shard(value)
+
+
+def test_shards_partition_files():
+    src_files = get_target_python_files(SRC, False, None)
+    shards = [select_shard(src_files, SRC, (i, 3)) for i in range(1, 4)]
+
+    # Each file is in exactly one shard, in the original order
+    assert sorted(sum(shards, [])) == sorted(src_files)
+    for shard in shards:
+        assert shard == [src_file for src_file in src_files if src_file in shard]
+    # Shards are balanced by size: none holds more than the largest file over the
+    # average size of a shard
+    sizes = [sum(src_file.stat().st_size for src_file in shard) for shard in shards]
+    largest = max(src_file.stat().st_size for src_file in src_files)
+    assert max(sizes) <= sum(sizes) / 3 + largest
+
+    assert select_shard(src_files, SRC, (1, 1)) == src_files
+
+
+def test_shards_are_independent_of_location(tmp_path: Path):
+    copy = tmp_path / "copy"
+    copy.mkdir()
+    for src_file in SRC.glob("*.py"):
+        (copy / src_file.name).write_bytes(src_file.read_bytes())
+
+    for i in range(1, 4):
+        names = [
+            f.name
+            for f in select_shard(
+                get_target_python_files(SRC, False, None), SRC, (i, 3)
+            )
+        ]
+        copied = select_shard(get_target_python_files(copy, False, None), copy, (i, 3))
+        assert [f.name for f in copied] == names
+
+
+def test_merged_shards_match_unsharded_build(tmp_path: Path):
+    full = npdoc2md(SRC, tmp_path, engine="ast")
+    merged: dict[Path, str] = {}
+    for i in range(1, 4):
+        shard = npdoc2md(SRC, tmp_path, engine="ast", shard=(i, 3))
+        assert not merged.keys() & shard.keys()
+        merged.update(shard)
+    assert merged == full
+
+    with pytest.raises(ValueError, match="Invalid shard"):
+        npdoc2md(SRC, tmp_path, engine="ast", shard=(4, 3))
+
+
+def test_conflicting_shards(tmp_path: Path):
+    for name, text in [("a", "same"), ("b", "same"), ("c", "other")]:
+        (tmp_path / name / ".npdoc2md-manifest.json").parent.mkdir()
+        (tmp_path / name / ".npdoc2md-manifest.json").write_text(name)
+        (tmp_path / name / "module.md").write_text(text)
+
+    # Identical files are merged once, hidden files are not merged
+    assert list(iter_shard_outputs([tmp_path / "a", tmp_path / "b"])) == [
+        ("module.md", "same")
+    ]
+    with pytest.raises(ValueError, match="Conflicting content for module.md"):
+        list(iter_shard_outputs([tmp_path / "a", tmp_path / "c"]))
+
+
+def test_cli_shard_and_merge(tmp_path: Path, monkeypatch: MonkeyPatch):
+    for i in range(1, 3):
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "npdoc2md",
+                "--engine",
+                "ast",
+                "--shard",
+                f"{i}/2",
+                "--output-ir",
+                str(tmp_path / f"shard{i}.ir"),
+                str(SRC),
+                str(tmp_path / f"shard{i}"),
+            ],
+        )
+        main()
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "npdoc2md",
+            "merge",
+            "--ir",
+            str(tmp_path / "shard1.ir"),
+            "--ir",
+            str(tmp_path / "shard2.ir"),
+            "--output-ir",
+            str(tmp_path / "merged.ir"),
+            "--output-manifest",
+            str(tmp_path / "manifest.json"),
+            str(tmp_path / "merged"),
+            str(tmp_path / "shard1"),
+            str(tmp_path / "shard2"),
+        ],
+    )
+    main()
+
+    expected = {path.name for path in npdoc2md(SRC, tmp_path, engine="ast")}
+    merged = {path.name for path in (tmp_path / "merged").iterdir()}
+    assert merged == expected
+    assert {path + ".md" for path, _ in iter_ir(tmp_path / "merged.ir")} == expected
+    assert (tmp_path / "manifest.json").is_file()
+
+
+def test_cli_rejects_invalid_shard(tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(
+        sys, "argv", ["npdoc2md", "--shard", "3/2", str(SRC), str(tmp_path)]
+    )
+    with pytest.raises(SystemExit):
+        main()
@@ -0,0 +1,96 @@
+import subprocess
+import sys
+
+import pytest
+
+# Modules only needed once a conversion runs.
+CONVERSION_MODULES = {
+    "concurrent.futures",
+    "docstring_parser",
+    "importlib.metadata",
+    "inspect",
+    "npdoc2md.server",
+    "npdoc2md.watch",
+    "sqlite3",
+    "tarfile",
+}
+
+RUN_CLI = (
+    "import sys; from npdoc2md.__main__ import main; sys.argv[0] = 'npdoc2md'; main()"
+)
+
+
+def _importtime(cli_args: list[str]) -> dict[str, int]:
+    """Get the cumulative import time of each module imported by a CLI run, in us."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_CLI, *cli_args],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            _, cumulative_us, name = line[len("import time:") :].split("|")
+            modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+@pytest.mark.parametrize("cli_args", [["--version"], ["--help"], ["render", "--help"]])
+def test_startup_skips_conversion_modules(cli_args: list[str]):
+    modules = _importtime(cli_args)
+    assert "npdoc2md.__main__" in modules
+    assert not CONVERSION_MODULES & modules.keys()
+
+
+def test_cli_import_skips_conversion_modules():
+    # Checked in a fresh interpreter, rather than with a wall clock budget.
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, npdoc2md.__main__; print(*sorted(sys.modules), sep='\\n')",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+    assert not CONVERSION_MODULES & set(result.stdout.split())
+
+
+def test_import_leaves_logging_unconfigured():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import logging, npdoc2md; npdoc2md.npdoc2md; print("
+            "logging.getLogger().handlers, logging.getLogger('npdoc2md').handlers)",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.stdout.strip() == "[] []"
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import npdoc2md; f = npdoc2md.npdoc2md; g = npdoc2md.iter_npdoc2md",
+        "from npdoc2md import iter_npdoc2md as g, npdoc2md as f",
+        # Internal modules import the submodule of the same name as the function.
+        "import npdoc2md.watch; from npdoc2md import iter_npdoc2md as g, npdoc2md as f",
+    ],
+)
+def test_package_exports_functions(code: str):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; {code}; module = sys.modules['npdoc2md.npdoc2md']; "
+            "print(f is module.npdoc2md, g is module.iter_npdoc2md)",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.stdout.strip() == "True True"
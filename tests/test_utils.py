@@ -1,10 +1,15 @@
+import inspect
+import types
+
 import pytest
 
 from npdoc2md import utils as npdoc2md_utils
 from npdoc2md.utils import (
     create_output_directory,
     get_cls_and_func_defined_in_module,
+    get_registered_type_replacements,
     get_target_output_file_path,
+    register_type_replacements,
     sanitize_signature,
     validate_paths,
 )
@@ -18,12 +23,47 @@ from npdoc2md.utils import (
             "(path: pathlib._local.Path) -> pathlib._local.Path",
             "(path: pathlib.Path) -> pathlib.Path",
         ),
+        ("(x: dict[str, _io.StringIO])", "(x: dict[str, io.StringIO])"),
+        # Only whole dotted names are replaced
+        (
+            "(x: my_io.BytesIO, y: _io.BytesIOLike)",
+            "(x: my_io.BytesIO, y: _io.BytesIOLike)",
+        ),
+        # The longest matching name wins
+        ("(x: builtins.method-wrapper)", "(x: types.MethodWrapperType)"),
     ],
 )
 def test_sanitize_signature(signature, expected):
     assert sanitize_signature(signature) == expected
 
 
+def test_register_type_replacements(monkeypatch):
+    monkeypatch.setattr(
+        npdoc2md_utils,
+        "_type_replacements",
+        dict(npdoc2md_utils._type_replacements),
+    )
+    monkeypatch.setattr(npdoc2md_utils, "_registered_type_replacements", {})
+    monkeypatch.setattr(
+        npdoc2md_utils,
+        "_type_replacements_pattern",
+        npdoc2md_utils._type_replacements_pattern,
+    )
+
+    signature = "(handle: _mypkg_ext.Handle, io: _io.BytesIO) -> None"
+    assert sanitize_signature(signature) == (
+        "(handle: _mypkg_ext.Handle, io: io.BytesIO) -> None"
+    )
+
+    register_type_replacements({("_mypkg_ext", "Handle"): "mypkg.Handle"})
+    assert sanitize_signature(signature) == (
+        "(handle: mypkg.Handle, io: io.BytesIO) -> None"
+    )
+    assert get_registered_type_replacements() == {
+        ("_mypkg_ext", "Handle"): "mypkg.Handle"
+    }
+
+
 def test_create_output_directory(tmp_path):
     output_dir = tmp_path / "output"
     # Test that the directory is created if it does not exist
@@ -123,3 +163,51 @@ def test_get_cls_func_defined_in_module():
     assert (
         "getLogger" not in functions
     )  # getLogger is imported from logging, not defined in utils.py
+
+
+def test_get_cls_func_defined_in_module_matches_getmembers():
+    module = types.ModuleType("members")
+    exec(
+        "import os\n"
+        "from os.path import join\n"
+        "class B: pass\n"
+        "class A(B): pass\n"
+        "def g(): pass\n"
+        "def f(): pass\n"
+        "alias = f\n",
+        module.__dict__,
+    )
+    for member in ("A", "B", "f", "g"):
+        getattr(module, member).__module__ = "members"
+    classes, functions = get_cls_and_func_defined_in_module(module)
+
+    expected_classes = {
+        name: obj
+        for name, obj in inspect.getmembers(module, inspect.isclass)
+        if obj.__module__ == "members"
+    }
+    expected_functions = {
+        name: obj
+        for name, obj in inspect.getmembers(module, inspect.isfunction)
+        if obj.__module__ == "members"
+    }
+    assert list(classes.items()) == list(expected_classes.items())
+    assert list(functions.items()) == list(expected_functions.items())
+    assert list(functions) == ["alias", "f", "g"]
+
+
+def test_get_cls_func_defined_in_lazy_module():
+    module = types.ModuleType("lazy")
+    exec(
+        "def _load(): pass\n"
+        "def __getattr__(name):\n"
+        "    if name == 'load':\n"
+        "        return _load\n"
+        "    raise AttributeError(name)\n"
+        "def __dir__():\n"
+        "    return ['load', 'missing']\n",
+        module.__dict__,
+    )
+    module._load.__module__ = "lazy"
+    # Members listed by dir() are read through getattr, missing ones are skipped
+    assert get_cls_and_func_defined_in_module(module) == ({}, {"load": module._load})
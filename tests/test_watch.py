@@ -0,0 +1,198 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from npdoc2md.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    TargetFiles,
+    Watcher,
+    create_watcher,
+    rebuild_changed,
+    wait_for_changes,
+    watch,
+)
+
+MODULE_TEMPLATE = '''"""Module docstring."""
+
+
+def func() -> int:
+    """{summary}
+
+    Returns
+    -------
+    int
+        A number.
+    """
+    return 1
+'''
+
+
+def write_module(path: Path, summary: str) -> None:
+    path.write_text(MODULE_TEMPLATE.format(summary=summary), encoding="utf-8")
+    # Make sure the polling watcher sees a new mtime even on coarse filesystems.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def package(tmp_path: Path) -> Path:
+    package_dir = tmp_path / "src" / "watchpkg"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text("")
+    write_module(package_dir / "first.py", "First summary.")
+    write_module(package_dir / "second.py", "Second summary.")
+    return package_dir
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_watcher_reports_changed_files(package: Path, use_inotify: bool):
+    if use_inotify and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is only available on Linux")
+    watcher = create_watcher(package, poll_interval=0.01, use_inotify=use_inotify)
+    assert isinstance(watcher, InotifyWatcher if use_inotify else PollingWatcher)
+    try:
+        assert watcher.wait(0.05) == set()
+
+        write_module(package / "first.py", "Updated summary.")
+        (package / "second.py").unlink()
+        (package / "notes.txt").write_text("not python")
+        changed = wait_for_changes(watcher, debounce=0.1, timeout=2)
+        assert changed == {package / "first.py", package / "second.py"}
+    finally:
+        watcher.close()
+
+
+def test_watcher_is_abstract(package: Path):
+    with pytest.raises(TypeError):
+        Watcher(package)  # type: ignore[abstract]
+
+
+def test_rebuild_changed_reuses_target_files(
+    package: Path, tmp_path: Path, monkeypatch: MonkeyPatch
+):
+    output_dir = tmp_path / "docs"
+    output_dir.mkdir()
+    targets = TargetFiles(package, exclude=["excluded.py"])
+    discoveries = []
+    discover = targets._discover
+    monkeypatch.setattr(targets, "_discover", lambda: discoveries.append(discover()))
+
+    def rebuild(*changed: Path) -> list[Path]:
+        return rebuild_changed(
+            set(changed),
+            package,
+            output_dir,
+            engine="ast",
+            exclude=["excluded.py"],
+            targets=targets,
+        )
+
+    write_module(package / "first.py", "Updated summary.")
+    assert rebuild(package / "first.py") == [output_dir / "first.md"]
+    assert discoveries == []
+
+    write_module(package / "third.py", "Third summary.")
+    write_module(package / "excluded.py", "Excluded summary.")
+    assert rebuild(package / "third.py", package / "excluded.py") == [
+        output_dir / "third.md"
+    ]
+    assert len(discoveries) == 1
+
+    # Known files, even excluded ones, do not trigger a new discovery.
+    write_module(package / "excluded.py", "Still excluded.")
+    (package / "third.py").unlink()
+    assert rebuild(package / "excluded.py", package / "third.py") == [
+        output_dir / "third.md"
+    ]
+    assert len(discoveries) == 1
+    assert targets.targets == {package / "first.py", package / "second.py"}
+
+
+def test_rebuild_changed_only_touches_affected_files(package: Path, tmp_path: Path):
+    output_dir = tmp_path / "docs"
+    output_dir.mkdir()
+    (output_dir / "second.md").write_text("stale")
+
+    write_module(package / "first.py", "Updated summary.")
+    (package / "second.py").unlink()
+    updated = rebuild_changed(
+        {package / "first.py", package / "second.py"},
+        package,
+        output_dir,
+        private_whitelist=["__init__"],
+        engine="ast",
+    )
+
+    assert updated == [output_dir / "first.md", output_dir / "second.md"]
+    assert "Updated summary." in (output_dir / "first.md").read_text()
+    assert not (output_dir / "second.md").exists()
+    assert sorted(os.listdir(output_dir)) == ["first.md"]
+
+
+def test_rebuild_changed_reloads_imported_module(
+    package: Path, tmp_path: Path, monkeypatch: MonkeyPatch
+):
+    monkeypatch.syspath_prepend(str(package.parent))
+    output_dir = tmp_path / "docs"
+    output_dir.mkdir()
+    try:
+        rebuild_changed({package / "first.py"}, package, output_dir)
+        assert "First summary." in (output_dir / "first.md").read_text()
+
+        write_module(package / "first.py", "Reloaded summary.")
+        rebuild_changed({package / "first.py"}, package, output_dir)
+        assert "Reloaded summary." in (output_dir / "first.md").read_text()
+    finally:
+        for name in [name for name in sys.modules if name.startswith("watchpkg")]:
+            del sys.modules[name]
+
+
+def test_rebuild_changed_keeps_going_on_errors(package: Path, tmp_path: Path):
+    output_dir = tmp_path / "docs"
+    output_dir.mkdir()
+    (package / "first.py").write_text("def broken(:\n")
+    updated = rebuild_changed(
+        {package / "first.py", package / "second.py"},
+        package,
+        output_dir,
+        engine="ast",
+    )
+    assert updated == [output_dir / "second.md"]
+
+
+def test_watch_until_stopped(package: Path, tmp_path: Path):
+    output_dir = tmp_path / "docs"
+    output_dir.mkdir()
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=watch,
+        args=(package, output_dir),
+        kwargs={
+            "engine": "ast",
+            "debounce": 0.05,
+            "poll_interval": 0.01,
+            "use_inotify": False,
+            "stop_event": stop_event,
+        },
+    )
+    thread.start()
+    try:
+        # Let the watcher take its initial snapshot before changing files.
+        time.sleep(0.2)
+        write_module(package / "second.py", "Watched summary.")
+        deadline = time.monotonic() + 5
+        while not (output_dir / "second.md").exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop_event.set()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert "Watched summary." in (output_dir / "second.md").read_text()
+    assert not (output_dir / "first.md").exists()
@@ -0,0 +1,153 @@
+import json
+import os
+import stat
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from npdoc2md.__main__ import main
+from npdoc2md.constants import ARCHIVE_FORMATS
+from npdoc2md.writer import ArchiveWriter, OutputWriter, write_atomic
+
+
+def test_writer_skips_unchanged_files(tmp_path: Path):
+    output_file = tmp_path / "sub" / "module.md"
+    writer = OutputWriter(tmp_path)
+
+    assert writer.write(output_file, "# Module\n")
+    mtime = output_file.stat().st_mtime_ns
+    os.utime(output_file, ns=(mtime - 10**9, mtime - 10**9))
+
+    assert not writer.write(output_file, "# Module\n")
+    assert output_file.stat().st_mtime_ns == mtime - 10**9
+
+    assert writer.write(output_file, "# Changed\n")
+    assert output_file.read_text() == "# Changed\n"
+    assert (writer.written, writer.skipped) == (2, 1)
+    assert os.listdir(output_file.parent) == ["module.md"]
+
+
+def test_write_atomic_keeps_permissions(tmp_path: Path):
+    path = tmp_path / "file.md"
+    path.write_text("old")
+    path.chmod(0o640)
+    write_atomic(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_write_atomic_cleans_up_on_error(tmp_path: Path, monkeypatch: MonkeyPatch):
+    def fail(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError, match="replace failed"):
+        write_atomic(tmp_path / "file.md", b"content")
+    assert os.listdir(tmp_path) == []
+
+
+def test_cli_output_manifest(tmp_path: Path, monkeypatch: MonkeyPatch):
+    manifest_path = tmp_path / "manifest.json"
+    argv = [
+        "npdoc2md",
+        f"--output-manifest={manifest_path}",
+        "src/npdoc2md/utils.py",
+        str(tmp_path / "docs"),
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    main()
+    manifest = json.loads(manifest_path.read_text())
+    assert list(manifest["files"]) == ["utils.md"]
+    assert manifest["files"]["utils.md"]["changed"]
+
+    main()
+    manifest = json.loads(manifest_path.read_text())
+    assert not manifest["files"]["utils.md"]["changed"]
+
+
+@pytest.mark.parametrize("name", [f"docs{suffix}" for suffix in ARCHIVE_FORMATS])
+def test_archive_writer(tmp_path: Path, name: str):
+    archive_path = tmp_path / "out" / name
+    with ArchiveWriter(archive_path) as writer:
+        assert writer.write(Path("module.md"), "# Module\n")
+        assert writer.write(Path("pkg/sub.md"), "# Sub\n")
+    assert (writer.written, writer.skipped) == (2, 0)
+    # Only the archive is written
+    assert os.listdir(archive_path.parent) == [name]
+
+    if name.endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            assert archive.namelist() == ["module.md", "pkg/sub.md"]
+            assert archive.read("pkg/sub.md") == b"# Sub\n"
+    else:
+        with tarfile.open(archive_path) as archive:
+            assert archive.getnames() == ["module.md", "pkg/sub.md"]
+            member = archive.extractfile("pkg/sub.md")
+            assert member is not None and member.read() == b"# Sub\n"
+
+
+def test_archive_writer_is_reproducible(tmp_path: Path, monkeypatch: MonkeyPatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    for name in ["a.zip", "b.zip"]:
+        with ArchiveWriter(tmp_path / name) as writer:
+            writer.write(Path("module.md"), "# Module\n")
+    assert (tmp_path / "a.zip").read_bytes() == (tmp_path / "b.zip").read_bytes()
+
+
+def test_archive_writer_discards_failed_archive(tmp_path: Path):
+    archive_path = tmp_path / "docs.zip"
+    archive_path.write_bytes(b"previous")
+    with pytest.raises(RuntimeError, match="conversion failed"):
+        with ArchiveWriter(archive_path) as writer:
+            writer.write(Path("module.md"), "# Module\n")
+            raise RuntimeError("conversion failed")
+    assert os.listdir(tmp_path) == ["docs.zip"]
+    assert archive_path.read_bytes() == b"previous"
+
+    with pytest.raises(ValueError, match="Unknown archive format"):
+        ArchiveWriter(tmp_path / "docs.rar")
+
+
+def test_cli_output_archive(tmp_path: Path, monkeypatch: MonkeyPatch):
+    archive_path = tmp_path / "docs.tar.gz"
+    manifest_path = tmp_path / "manifest.json"
+    argv = [
+        "npdoc2md",
+        f"--output-archive={archive_path}",
+        f"--output-manifest={manifest_path}",
+        "src/npdoc2md/utils.py",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    main()
+
+    assert sorted(os.listdir(tmp_path)) == ["docs.tar.gz", "manifest.json"]
+    with tarfile.open(archive_path) as archive:
+        member = archive.extractfile("utils.md")
+        assert member is not None
+        expected = Path("tests/expected_output/utils.md").read_text()
+        assert member.read().decode() == expected
+    assert list(json.loads(manifest_path.read_text())["files"]) == ["utils.md"]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        # Incremental builds skip modules, which would be missing from the archive
+        ["--incremental", "--output-archive=docs.zip", "src/npdoc2md/utils.py"],
+        # Either an output directory or an archive
+        ["--output-archive=docs.zip", "src/npdoc2md/utils.py", "docs"],
+        ["--output-archive=docs.rar", "src/npdoc2md/utils.py"],
+    ],
+)
+def test_cli_invalid_output_archive(
+    tmp_path: Path, monkeypatch: MonkeyPatch, args: list[str]
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["npdoc2md", *args])
+    with pytest.raises(SystemExit):
+        main()
+    assert os.listdir(tmp_path) == []